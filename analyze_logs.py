@@ -0,0 +1,305 @@
+import argparse
+import bz2
+import gzip
+import heapq
+import json
+import math
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_LOG_DIR = BASE_DIR / "data" / "logs"
+LOG_GLOB = "requests.jsonl*"
+BUCKET_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+_ZERO_BUCKET = -1000
+
+
+class LatencyHistogram:
+    # Log-spaced buckets give percentiles within ~1% relative error in bounded memory.
+    def __init__(self, precision: float = 0.02) -> None:
+        self._log_base = math.log1p(precision)
+        self._counts: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        value = max(value, 0.0)
+        bucket = int(math.log(value) / self._log_base) if value >= 1e-3 else _ZERO_BUCKET
+        self._counts[bucket] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        if q >= 1.0:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen > rank:
+                if bucket == _ZERO_BUCKET:
+                    return 0.0
+                # Midpoint of the bucket, clamped to the observed range.
+                estimate = math.exp((bucket + 0.5) * self._log_base)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        result = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "max": round(self.max, 2),
+        }
+        for q in PERCENTILES:
+            result[f"p{int(q * 100)}"] = round(self.quantile(q), 2)
+        return result
+
+
+class LogSummary:
+    def __init__(self, bucket_seconds: int = 3600, top: int = 10) -> None:
+        self._bucket_seconds = bucket_seconds
+        self._top = top
+        self._groups: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._cache_hits: Counter = Counter()
+        self._chunks: Counter = Counter()
+        self._buckets: Dict[int, LatencyHistogram] = {}
+        self._slowest: List[Tuple[float, str, str]] = []
+        self.overall = LatencyHistogram()
+        self.first: Optional[datetime] = None
+        self.last: Optional[datetime] = None
+        self.skipped = 0
+
+    def add(self, event: Dict[str, Any]) -> None:
+        latency = event.get("latency_ms")
+        if event.get("event") != "completion" or not isinstance(latency, (int, float)):
+            self.skipped += 1
+            return
+
+        key = (
+            str(event.get("interaction") or "-"),
+            str(event.get("provider") or "-"),
+            str(event.get("model") or "-"),
+        )
+        self._groups.setdefault(key, LatencyHistogram()).add(latency)
+        self.overall.add(latency)
+        if event.get("cache_hit"):
+            self._cache_hits[key] += 1
+        if isinstance(event.get("retrieval_chunks"), int):
+            self._chunks[event["retrieval_chunks"]] += 1
+
+        timestamp = _parse_timestamp(event.get("timestamp"))
+        if timestamp is not None:
+            self.first = timestamp if self.first is None else min(self.first, timestamp)
+            self.last = timestamp if self.last is None else max(self.last, timestamp)
+            bucket = int(timestamp.timestamp()) // self._bucket_seconds * self._bucket_seconds
+            self._buckets.setdefault(bucket, LatencyHistogram()).add(latency)
+
+        entry = (latency, str(event.get("request_id") or "-"), str(event.get("timestamp") or ""))
+        if len(self._slowest) < self._top:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def report(self) -> Dict[str, Any]:
+        span = (self.last - self.first).total_seconds() if self.first and self.last else 0.0
+        peak = max((hist.count for hist in self._buckets.values()), default=0)
+        return {
+            "requests": self.overall.count,
+            "skipped_lines": self.skipped,
+            "first": self.first.isoformat() if self.first else None,
+            "last": self.last.isoformat() if self.last else None,
+            "rates": {
+                "avg_per_second": round(self.overall.count / span, 4) if span else None,
+                "peak_per_bucket": peak,
+                "peak_per_second": round(peak / self._bucket_seconds, 4),
+            },
+            "latency_ms": self.overall.summary(),
+            "groups": [
+                {
+                    "interaction": key[0],
+                    "provider": key[1],
+                    "model": key[2],
+                    "cache_hits": self._cache_hits[key],
+                    **hist.summary(),
+                }
+                for key, hist in sorted(
+                    self._groups.items(), key=lambda item: item[1].count, reverse=True
+                )
+            ],
+            "retrieval_chunks": {str(k): v for k, v in sorted(self._chunks.items())},
+            "slowest": [
+                {"latency_ms": round(latency, 2), "request_id": request_id, "timestamp": ts}
+                for latency, request_id, ts in sorted(self._slowest, reverse=True)
+            ],
+            "trend": [
+                {
+                    "bucket": datetime.fromtimestamp(bucket, timezone.utc).isoformat(),
+                    **hist.summary(),
+                }
+                for bucket, hist in sorted(self._buckets.items())
+            ],
+        }
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _cli_timestamp(value: str) -> datetime:
+    parsed = _parse_timestamp(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"not an ISO timestamp: {value}")
+    return parsed
+
+
+def find_logs(paths: List[Path]) -> List[Path]:
+    found: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            # Rotated files are older than the live log, so read them first.
+            found.extend(sorted(path.glob(LOG_GLOB), key=lambda p: p.stat().st_mtime))
+        elif path.exists():
+            found.append(path)
+    return found
+
+
+def open_log(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_events(paths: List[Path]) -> Iterator[Optional[Dict[str, Any]]]:
+    for path in paths:
+        with open_log(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                yield event if isinstance(event, dict) else None
+
+
+def summarize(
+    paths: List[Path],
+    bucket_seconds: int = 3600,
+    top: int = 10,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    summary = LogSummary(bucket_seconds=bucket_seconds, top=top)
+    for event in iter_events(paths):
+        if event is None:
+            summary.skipped += 1
+            continue
+        if since or until:
+            timestamp = _parse_timestamp(event.get("timestamp"))
+            if timestamp is None or (since and timestamp < since) or (until and timestamp >= until):
+                continue
+        summary.add(event)
+    return summary.report()
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Requests: {report['requests']} ({report['first']} .. {report['last']}), "
+        f"skipped lines: {report['skipped_lines']}",
+        f"Rate: avg {report['rates']['avg_per_second']}/s, "
+        f"peak {report['rates']['peak_per_bucket']} per bucket "
+        f"({report['rates']['peak_per_second']}/s)",
+        "",
+        f"{'interaction':<16} {'provider':<12} {'model':<28} {'count':>8} {'cached':>7} "
+        f"{'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9}",
+    ]
+    overall = {
+        "interaction": "(all)",
+        "provider": "",
+        "model": "",
+        "cache_hits": "",
+        **report["latency_ms"],
+    }
+    for row in [*report["groups"], overall]:
+        lines.append(
+            f"{row['interaction']:<16} {row['provider']:<12} {row['model'][:28]:<28} "
+            f"{row['count']:>8} {row['cache_hits']:>7} {row['p50']:>9} {row['p90']:>9} "
+            f"{row['p95']:>9} {row['p99']:>9} {row['max']:>9}"
+        )
+
+    chunks = ", ".join(f"{k}: {v}" for k, v in report["retrieval_chunks"].items())
+    lines += ["", f"Retrieval chunks: {chunks or '-'}"]
+
+    lines += ["", f"{'latency_ms':>12}  {'request_id':<38} timestamp"]
+    for row in report["slowest"]:
+        lines.append(f"{row['latency_ms']:>12}  {row['request_id']:<38} {row['timestamp']}")
+
+    lines += ["", f"{'bucket':<26} {'count':>8} {'p50':>9} {'p95':>9} {'max':>9}"]
+    for row in report["trend"]:
+        lines.append(
+            f"{row['bucket']:<26} {row['count']:>8} {row['p50']:>9} {row['p95']:>9} {row['max']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Summarize request logs (including rotated .gz/.bz2 files) in one pass."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(DEFAULT_LOG_DIR)],
+        help="Log files or directories (default: data/logs).",
+    )
+    parser.add_argument("--bucket", choices=sorted(BUCKET_SECONDS), default="hour")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest requests to list.")
+    parser.add_argument(
+        "--since", type=_cli_timestamp, help="Only include events at or after this ISO timestamp."
+    )
+    parser.add_argument(
+        "--until", type=_cli_timestamp, help="Only include events before this ISO timestamp."
+    )
+    parser.add_argument("--format", choices=("table", "json"), default="table")
+    args = parser.parse_args()
+
+    logs = find_logs([Path(path) for path in args.paths])
+    if not logs:
+        raise ValueError("No request logs found. Enable them with ENABLE_LOCAL_LOGS=true.")
+
+    report = summarize(
+        logs,
+        bucket_seconds=BUCKET_SECONDS[args.bucket],
+        top=args.top,
+        since=args.since,
+        until=args.until,
+    )
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,41 @@
-from typing import Any, Dict
+import asyncio
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, Optional
 from uuid import uuid4
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from backend.cancellation import (
+    CancelToken,
+    DuplicateRequestId,
+    RequestCancelled,
+    bind_token,
+    cancel_request,
+    register_request,
+    unregister_request,
+)
 from backend.config import AppConfig
+from backend.embedding_batcher import embedding_batcher_stats
+from backend.profiling import PROFILE_HEADER, capture_profile, should_profile
+from backend.providers.cascade import cascade_stats
+from backend.providers.router import router_stats
+from backend.scheduler import INTERACTIVE, SchedulerBusy, generation_limit, scheduler_stats
 from backend.service import ask_emacs, explain_region
+from backend.snapshots import snapshot_stats
 
 app = FastAPI(title="Emacs Explained API", version="0.1.0")
 
+DISCONNECT_POLL_SECONDS = 0.25
+
 
 class AskRequest(BaseModel):
     question: str = Field(..., min_length=1)
     skill_level: str = Field(default="beginner")
+    request_id: Optional[str] = Field(default=None, max_length=64)
+    priority: Literal["interactive", "background"] = Field(default=INTERACTIVE)
 
 
 class ExplainRegionRequest(BaseModel):
@@ -20,6 +43,57 @@ class ExplainRegionRequest(BaseModel):
     language: str = Field(default="elisp")
     context: str = Field(default="")
     skill_level: str = Field(default="beginner")
+    request_id: Optional[str] = Field(default=None, max_length=64)
+    priority: Literal["interactive", "background"] = Field(default=INTERACTIVE)
+
+
+def _call_with_token(
+    token: CancelToken,
+    fn: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    profile_dir: Optional[Path] = None,
+) -> Any:
+    profiler = capture_profile(token.request_id, profile_dir) if profile_dir else nullcontext()
+    with bind_token(token), profiler:
+        return fn(**kwargs)
+
+
+def _profile_dir(request: Request) -> Optional[Path]:
+    config = AppConfig.from_env()
+    requested = request.headers.get(PROFILE_HEADER, "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+        "on",
+    )
+    if not should_profile(requested, config.profile_sample_rate):
+        return None
+    return Path(config.profile_dir)
+
+
+async def _run_cancellable(
+    request: Request, request_id: str, fn: Callable[..., Any], kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    try:
+        token = register_request(request_id)
+    except DuplicateRequestId as exc:
+        raise HTTPException(status_code=409, detail="request_id is already in use") from exc
+    task = asyncio.ensure_future(
+        run_in_threadpool(_call_with_token, token, fn, kwargs, _profile_dir(request))
+    )
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if not task.done() and await request.is_disconnected():
+                token.cancel()
+                break
+        return await task
+    except RequestCancelled as exc:
+        raise HTTPException(status_code=499, detail="Request cancelled") from exc
+    except SchedulerBusy as exc:
+        raise HTTPException(status_code=503, detail="Background request deferred") from exc
+    finally:
+        unregister_request(request_id, token)
 
 
 @app.get("/health")
@@ -42,35 +116,75 @@ def config() -> Dict[str, Any]:
         "embedding_model": cfg.embedding_model,
         "vector_db_dir": cfg.vector_db_dir,
         "retrieval_k": cfg.retrieval_k,
+        "index_reload_interval": cfg.index_reload_interval,
+        "embed_batch_wait_ms": cfg.embed_batch_wait_ms,
+        "embed_batch_max_size": cfg.embed_batch_max_size,
         "ollama_base_url": cfg.ollama_base_url,
         "local_small_base_url": cfg.local_small_base_url,
+        "local_small_base_urls": list(cfg.local_small_base_urls),
+        "local_small_cache_prompt": cfg.local_small_cache_prompt,
         "local_model_file": cfg.local_model_file,
         "enable_local_logs": cfg.enable_local_logs,
         "local_log_path": cfg.local_log_path,
+        "generation_concurrency": cfg.generation_concurrency,
+        "generation_limit": generation_limit(cfg),
+        "background_max_wait": cfg.background_max_wait,
+        "enable_result_store": cfg.enable_result_store,
+        "result_store_path": cfg.result_store_path,
+        "profile_sample_rate": cfg.profile_sample_rate,
+        "profile_dir": cfg.profile_dir,
         "has_openai_api_key": bool(cfg.openai_api_key),
         "openai_base_url": cfg.openai_base_url,
     }
 
 
+@app.get("/stats")
+def stats() -> Dict[str, Any]:
+    return {
+        "router": router_stats(),
+        "cascade": cascade_stats(),
+        "embedding_batches": embedding_batcher_stats(),
+        "scheduler": scheduler_stats(),
+        "index": snapshot_stats(),
+    }
+
+
 @app.post("/ask")
-def ask(payload: AskRequest) -> Dict[str, Any]:
-    request_id = str(uuid4())
-    result = ask_emacs(
-        payload.question,
-        skill_level=payload.skill_level,
-        request_id=request_id,
+async def ask(payload: AskRequest, request: Request) -> Dict[str, Any]:
+    request_id = payload.request_id or str(uuid4())
+    result = await _run_cancellable(
+        request,
+        request_id,
+        ask_emacs,
+        {
+            "query": payload.question,
+            "skill_level": payload.skill_level,
+            "request_id": request_id,
+            "priority": payload.priority,
+        },
     )
     return result
 
 
 @app.post("/explain-region")
-def explain(payload: ExplainRegionRequest) -> Dict[str, Any]:
-    request_id = str(uuid4())
-    result = explain_region(
-        code=payload.code,
-        language=payload.language,
-        context=payload.context,
-        skill_level=payload.skill_level,
-        request_id=request_id,
+async def explain(payload: ExplainRegionRequest, request: Request) -> Dict[str, Any]:
+    request_id = payload.request_id or str(uuid4())
+    result = await _run_cancellable(
+        request,
+        request_id,
+        explain_region,
+        {
+            "code": payload.code,
+            "language": payload.language,
+            "context": payload.context,
+            "skill_level": payload.skill_level,
+            "request_id": request_id,
+            "priority": payload.priority,
+        },
     )
     return result
+
+
+@app.post("/cancel/{request_id}")
+def cancel(request_id: str) -> Dict[str, Any]:
+    return {"request_id": request_id, "cancelled": cancel_request(request_id)}
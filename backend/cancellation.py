@@ -0,0 +1,104 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class DuplicateRequestId(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RequestCancelled(f"Request {self.request_id} was cancelled")
+
+
+_current: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "cancel_token", default=None
+)
+_tokens: Dict[str, CancelToken] = {}
+_tokens_lock = threading.Lock()
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current.get()
+
+
+def check_cancelled() -> None:
+    token = _current.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+@contextmanager
+def bind_token(token: Optional[CancelToken]) -> Iterator[None]:
+    reset = _current.set(token)
+    try:
+        yield
+    finally:
+        _current.reset(reset)
+
+
+def register_request(request_id: str) -> CancelToken:
+    token = CancelToken(request_id)
+    with _tokens_lock:
+        # Replacing a live token would leave /cancel pointing at the wrong request.
+        if request_id in _tokens:
+            raise DuplicateRequestId(f"Request {request_id} is already in flight")
+        _tokens[request_id] = token
+    return token
+
+
+def unregister_request(request_id: str, token: Optional[CancelToken] = None) -> None:
+    with _tokens_lock:
+        if token is None or _tokens.get(request_id) is token:
+            _tokens.pop(request_id, None)
+
+
+def cancel_request(request_id: str) -> bool:
+    with _tokens_lock:
+        token = _tokens.get(request_id)
+    if token is None:
+        return False
+    token.cancel()
+    return True
@@ -0,0 +1,136 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Lines this close to the top or bottom of a page are candidates for running headers/footers.
+EDGE_LINES = 2
+MIN_BOILERPLATE_REPEATS = 3
+
+HEADING_RE = re.compile(
+    r"^(?:(?:Appendix\s+)?[A-Z](?:\.\d+)+|Appendix\s+[A-Z]|\d+(?:\.\d+)*)\s+[A-Z][^\n]{0,80}$"
+)
+TOC_ENTRY_RE = re.compile(r"(?:\.\s*){3,}\d*$|\s\d+$")
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s+)?(?:\d+|[ivxlcdm]+)$", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def _normalize_edge_line(line: str) -> str:
+    return _DIGITS_RE.sub("#", " ".join(line.split()).lower())
+
+
+def _edge_indexes(lines: List[str]) -> List[int]:
+    content = [idx for idx, line in enumerate(lines) if line.strip()]
+    return sorted(set(content[:EDGE_LINES] + content[-EDGE_LINES:]))
+
+
+def strip_boilerplate(pages: List[str]) -> List[str]:
+    page_lines = [page.splitlines() for page in pages]
+
+    seen_on_pages: Counter = Counter()
+    for lines in page_lines:
+        seen_on_pages.update({_normalize_edge_line(lines[idx]) for idx in _edge_indexes(lines)})
+
+    # Alternating even/odd headers repeat on every other page, so short documents need fewer hits.
+    min_repeats = max(2, min(MIN_BOILERPLATE_REPEATS, len(pages) // 2))
+    cleaned = []
+    for lines in page_lines:
+        drop = set()
+        for idx in _edge_indexes(lines):
+            stripped = lines[idx].strip()
+            normalized = _normalize_edge_line(stripped)
+            if PAGE_NUMBER_RE.match(stripped) or seen_on_pages[normalized] >= min_repeats:
+                drop.add(idx)
+        cleaned.append("\n".join(line for idx, line in enumerate(lines) if idx not in drop))
+    return cleaned
+
+
+def is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not HEADING_RE.match(stripped) or stripped.endswith((".", ",", ";", ":")):
+        return False
+    # Table-of-contents entries end with a page number, often after dot leaders.
+    return not TOC_ENTRY_RE.search(stripped)
+
+
+def split_sections(pages: List[str], first_page: int = 0) -> List[Tuple[str, int, List[str]]]:
+    # Returns (section_title, start_page, lines); text flows across page breaks.
+    sections: List[Tuple[str, int, List[str]]] = []
+    title, start_page, lines = "", first_page, []
+
+    for page_no, page in enumerate(pages, start=first_page):
+        for line in page.splitlines():
+            if not line.strip():
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            if is_heading(line):
+                if any(lines):
+                    sections.append((title, start_page, lines))
+                title, start_page, lines = " ".join(line.split()), page_no, []
+            elif not any(lines):
+                start_page = page_no
+            lines.append(line.rstrip())
+
+    if any(lines):
+        sections.append((title, start_page, lines))
+    return sections
+
+
+def _split_long_line(line: str, chunk_size: int) -> List[str]:
+    if len(line) <= chunk_size:
+        return [line]
+    pieces, current = [], ""
+    for word in line.split(" "):
+        if current and len(current) + 1 + len(word) > chunk_size:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def pack_lines(lines: List[str], chunk_size: int, chunk_overlap: int) -> List[str]:
+    units = [piece for line in lines for piece in _split_long_line(line, chunk_size)]
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    for unit in units:
+        if current and size + len(unit) + 1 > chunk_size:
+            chunks.append("\n".join(current).strip())
+            # Carry whole trailing lines forward as overlap.
+            carried: List[str] = []
+            carried_size = 0
+            for previous in reversed(current):
+                if carried_size + len(previous) + 1 > chunk_overlap:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 1
+            current, size = carried, carried_size
+        current.append(unit)
+        size += len(unit) + 1
+
+    text = "\n".join(current).strip()
+    if text and (not chunks or text not in chunks[-1]):
+        chunks.append(text)
+    return [chunk for chunk in chunks if chunk]
+
+
+def chunk_pages(
+    pages: List[str],
+    chunk_size: int = 700,
+    chunk_overlap: int = 120,
+    first_page: int = 0,
+) -> List[Dict[str, object]]:
+    chunks: List[Dict[str, object]] = []
+    for title, page, lines in split_sections(strip_boilerplate(pages), first_page=first_page):
+        for text in pack_lines(lines, chunk_size, chunk_overlap):
+            chunks.append({"text": text, "section_title": title, "page": page})
+    return chunks
+
+
+def section_label(metadata: Dict[str, object]) -> Optional[str]:
+    title = metadata.get("section_title")
+    return str(title) if title else None
@@ -1,19 +1,45 @@
 import os
 from dataclasses import dataclass
+from typing import Tuple
 
 
 @dataclass(frozen=True)
 class AppConfig:
     model_provider: str = "ollama"
     chat_model: str = "deepseek-r1"
+    embedding_provider: str = "huggingface"
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_model_dir: str = "data/models/all-MiniLM-L6-v2-onnx"
+    embedding_threads: int = 0
     vector_db_dir: str = "emacs_db"
     retrieval_k: int = 4
+    index_reload_interval: float = 5.0
+    embed_batch_wait_ms: float = 5.0
+    embed_batch_max_size: int = 32
     ollama_base_url: str = "http://localhost:11434"
     local_small_base_url: str = "http://127.0.0.1:8080/v1"
+    local_small_base_urls: Tuple[str, ...] = ()
+    local_small_cache_prompt: bool = True
+    router_health_interval: float = 10.0
+    router_eject_seconds: float = 30.0
+    cascade_small_provider: str = "local_small"
+    cascade_small_model: str = "tinyllama-1.1b-chat-v1.0.Q4_K_M"
+    cascade_large_provider: str = "ollama"
+    cascade_large_model: str = "deepseek-r1"
+    cascade_max_question_chars: int = 120
+    cascade_max_code_chars: int = 400
+    cascade_min_score_spread: float = 0.05
+    cascade_escalate: bool = True
     local_model_file: str = "data/models/tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
     enable_local_logs: bool = False
     local_log_path: str = "data/logs/requests.jsonl"
+    log_questions: bool = False
+    generation_concurrency: int = 0
+    background_max_wait: float = 5.0
+    enable_result_store: bool = True
+    result_store_path: str = "data/cache/results.sqlite3"
+    profile_sample_rate: float = 0.0
+    profile_dir: str = "data/profiles"
     openai_api_key: str = ""
     openai_base_url: str = "https://api.openai.com/v1"
 
@@ -22,19 +48,60 @@ class AppConfig:
         return cls(
             model_provider=os.getenv("MODEL_PROVIDER", "ollama").strip().lower(),
             chat_model=os.getenv("CHAT_MODEL", "deepseek-r1").strip(),
+            embedding_provider=os.getenv("EMBEDDING_PROVIDER", "huggingface").strip().lower(),
             embedding_model=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2").strip(),
+            embedding_model_dir=os.getenv(
+                "EMBEDDING_MODEL_DIR", "data/models/all-MiniLM-L6-v2-onnx"
+            ).strip(),
+            embedding_threads=int(os.getenv("EMBEDDING_THREADS", "0")),
             vector_db_dir=os.getenv("VECTOR_DB_DIR", "emacs_db").strip(),
             retrieval_k=int(os.getenv("RETRIEVAL_K", "4")),
+            index_reload_interval=float(os.getenv("INDEX_RELOAD_INTERVAL", "5")),
+            embed_batch_wait_ms=float(os.getenv("EMBED_BATCH_WAIT_MS", "5")),
+            embed_batch_max_size=int(os.getenv("EMBED_BATCH_MAX_SIZE", "32")),
             ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").strip(),
             local_small_base_url=os.getenv(
                 "LOCAL_SMALL_BASE_URL", "http://127.0.0.1:8080/v1"
             ).strip(),
+            local_small_base_urls=tuple(
+                url.strip()
+                for url in os.getenv("LOCAL_SMALL_BASE_URLS", "").split(",")
+                if url.strip()
+            ),
+            local_small_cache_prompt=os.getenv("LOCAL_SMALL_CACHE_PROMPT", "true").strip().lower()
+            in ("1", "true", "yes", "on"),
+            router_health_interval=float(os.getenv("ROUTER_HEALTH_INTERVAL", "10")),
+            router_eject_seconds=float(os.getenv("ROUTER_EJECT_SECONDS", "30")),
+            cascade_small_provider=os.getenv("CASCADE_SMALL_PROVIDER", "local_small")
+            .strip()
+            .lower(),
+            cascade_small_model=os.getenv(
+                "CASCADE_SMALL_MODEL", "tinyllama-1.1b-chat-v1.0.Q4_K_M"
+            ).strip(),
+            cascade_large_provider=os.getenv("CASCADE_LARGE_PROVIDER", "ollama").strip().lower(),
+            cascade_large_model=os.getenv("CASCADE_LARGE_MODEL", "deepseek-r1").strip(),
+            cascade_max_question_chars=int(os.getenv("CASCADE_MAX_QUESTION_CHARS", "120")),
+            cascade_max_code_chars=int(os.getenv("CASCADE_MAX_CODE_CHARS", "400")),
+            cascade_min_score_spread=float(os.getenv("CASCADE_MIN_SCORE_SPREAD", "0.05")),
+            cascade_escalate=os.getenv("CASCADE_ESCALATE", "true").strip().lower()
+            in ("1", "true", "yes", "on"),
             local_model_file=os.getenv(
                 "LOCAL_MODEL_FILE", "data/models/tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
             ).strip(),
             enable_local_logs=os.getenv("ENABLE_LOCAL_LOGS", "false").strip().lower()
             in ("1", "true", "yes", "on"),
             local_log_path=os.getenv("LOCAL_LOG_PATH", "data/logs/requests.jsonl").strip(),
+            log_questions=os.getenv("LOG_QUESTIONS", "false").strip().lower()
+            in ("1", "true", "yes", "on"),
+            generation_concurrency=int(os.getenv("GENERATION_CONCURRENCY", "0")),
+            background_max_wait=float(os.getenv("BACKGROUND_MAX_WAIT_SECONDS", "5")),
+            enable_result_store=os.getenv("ENABLE_RESULT_STORE", "true").strip().lower()
+            in ("1", "true", "yes", "on"),
+            result_store_path=os.getenv(
+                "RESULT_STORE_PATH", "data/cache/results.sqlite3"
+            ).strip(),
+            profile_sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            profile_dir=os.getenv("PROFILE_DIR", "data/profiles").strip(),
             openai_api_key=os.getenv("OPENAI_API_KEY", "").strip(),
             openai_base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").strip(),
         )
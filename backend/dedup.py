@@ -0,0 +1,103 @@
+import hashlib
+import random
+import re
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Near-duplicates merged into one chunk list their other sources in its metadata.
+ALTERNATE_SOURCES_SEPARATOR = "; "
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"\w+(?:[-']\w+)*")
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[idx : idx + size]) for idx in range(len(words) - size + 1)}
+
+
+def _hash32(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        rng = random.Random(seed)
+        self.threshold = threshold
+        self._rows = num_perm // bands
+        self._bands = bands
+        self._shingle_size = shingle_size
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = [_hash32(shingle) for shingle in shingles(text, self._shingle_size)]
+        if not hashes:
+            return tuple([_MAX_HASH] * len(self._perms))
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [
+            signature[band * self._rows : (band + 1) * self._rows] for band in range(self._bands)
+        ]
+
+    def find(self, signature: Tuple[int, ...]) -> List[Hashable]:
+        # LSH narrows the search to keys sharing a band; the signature check confirms them.
+        candidates: List[Hashable] = []
+        for band, key in enumerate(self._band_keys(signature)):
+            for candidate in self._buckets[band].get(key, []):
+                if candidate not in candidates:
+                    candidates.append(candidate)
+        return [
+            candidate
+            for candidate in candidates
+            if self.similarity(signature, self._signatures[candidate]) >= self.threshold
+        ]
+
+    def add(self, key: Hashable, signature: Tuple[int, ...]) -> None:
+        self._signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+class CrossSourceDeduplicator:
+    def __init__(self, threshold: float = 0.85) -> None:
+        self._index = NearDuplicateIndex(threshold=threshold)
+        self._groups: Dict[Hashable, str] = {}
+
+    def check(self, key: Hashable, text: str, group: str) -> Optional[Hashable]:
+        # Returns the canonical key this text duplicates, or registers it as canonical.
+        # Repeats within one source are kept; they usually sit in different sections.
+        signature = self._index.signature(text)
+        for candidate in self._index.find(signature):
+            if self._groups[candidate] != group:
+                return candidate
+        self._index.add(key, signature)
+        self._groups[key] = group
+        return None
@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _Pending:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.vector: Optional[List[float]] = None
+        self.error: Optional[BaseException] = None
+
+
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        max_wait_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self._max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self._max_batch_size = max(max_batch_size, 1)
+        self._queue: "queue.Queue[_Pending]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "queries": 0,
+            "max_batch_size": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "total_embed_ms": 0.0,
+        }
+
+    def embed(self, text: str) -> List[float]:
+        pending = _Pending(text)
+        self._ensure_worker()
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.vector
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self) -> List[_Pending]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                vectors = self._embed_fn([item.text for item in batch])
+            except BaseException as exc:  # hand the failure to every waiting request
+                for item in batch:
+                    item.error = exc
+                    item.done.set()
+                continue
+
+            finished = time.perf_counter()
+            self._record(batch, started, finished)
+            for item, vector in zip(batch, vectors):
+                item.vector = list(vector)
+                item.done.set()
+
+    def _record(self, batch: List[_Pending], started: float, finished: float) -> None:
+        waits = [(started - item.enqueued_at) * 1000 for item in batch]
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["queries"] += len(batch)
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+            self._stats["total_wait_ms"] += sum(waits)
+            self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], max(waits))
+            self._stats["total_embed_ms"] += (finished - started) * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            batches = self._stats["batches"]
+            queries = self._stats["queries"]
+            return {
+                "batches": batches,
+                "queries": queries,
+                "avg_batch_size": round(queries / batches, 2) if batches else 0.0,
+                "max_batch_size": self._stats["max_batch_size"],
+                "avg_queue_wait_ms": round(self._stats["total_wait_ms"] / queries, 2)
+                if queries
+                else 0.0,
+                "max_queue_wait_ms": round(self._stats["max_wait_ms"], 2),
+                "avg_batch_embed_ms": round(self._stats["total_embed_ms"] / batches, 2)
+                if batches
+                else 0.0,
+            }
+
+
+_BATCHERS: Dict[Any, EmbeddingBatcher] = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def get_embedding_batcher(
+    key: Any,
+    embed_fn_factory: Callable[[], Callable[[List[str]], List[List[float]]]],
+    max_wait_ms: float = 5.0,
+    max_batch_size: int = 32,
+) -> EmbeddingBatcher:
+    with _BATCHERS_LOCK:
+        batcher = _BATCHERS.get(key)
+        if batcher is None:
+            batcher = EmbeddingBatcher(
+                embed_fn_factory(),
+                max_wait_ms=max_wait_ms,
+                max_batch_size=max_batch_size,
+            )
+            _BATCHERS[key] = batcher
+        return batcher
+
+
+def embedding_batcher_stats() -> Dict[str, Any]:
+    with _BATCHERS_LOCK:
+        batchers = dict(_BATCHERS)
+    return {str(key): batcher.stats() for key, batcher in batchers.items()}
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+INDEX_META_FILENAME = "index_meta.json"
+UNVERSIONED = "unversioned"
+
+
+def new_index_version() -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    return f"{stamp}-{uuid4().hex[:8]}"
+
+
+def write_index_meta(db_dir: Path, meta: Dict[str, Any]) -> Path:
+    path = Path(db_dir) / INDEX_META_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def load_index_meta(db_dir: Path) -> Dict[str, Any]:
+    path = Path(db_dir) / INDEX_META_FILENAME
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def index_version(db_dir: Path) -> str:
+    return str(load_index_meta(db_dir).get("version") or UNVERSIONED)
+
+
+def check_embedding_meta(
+    meta: Dict[str, Any], model: str, dimension: Optional[int] = None
+) -> None:
+    # Vectors from different models or sizes are not comparable; the index must be rebuilt.
+    recorded = meta.get("embedding") or {}
+    if not recorded:
+        return
+    if recorded.get("model") != model:
+        raise ValueError(
+            f"Index was built with embedding model {recorded.get('model')!r} "
+            f"but {model!r} is configured. Rebuild with `python3 prepare_data.py`."
+        )
+    if dimension is not None and recorded.get("dimension") != dimension:
+        raise ValueError(
+            f"Index vectors have dimension {recorded.get('dimension')} "
+            f"but the embedding backend produces {dimension}. "
+            "Rebuild with `python3 prepare_data.py`."
+        )
@@ -0,0 +1,46 @@
+import cProfile
+import random
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+PROFILE_SUFFIX = ".prof"
+PROFILE_HEADER = "x-profile"
+
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]")
+# Only one capture runs at a time so a burst of sampled requests cannot pile up overhead.
+_CAPTURE_LOCK = threading.Lock()
+
+
+def should_profile(requested: bool, sample_rate: float) -> bool:
+    if requested:
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def profile_path(profile_dir: Path, request_id: str) -> Path:
+    name = _UNSAFE_CHARS_RE.sub("_", request_id) or "request"
+    return Path(profile_dir) / f"{name}{PROFILE_SUFFIX}"
+
+
+@contextmanager
+def capture_profile(request_id: str, profile_dir: Path) -> Iterator[Optional[Path]]:
+    if not _CAPTURE_LOCK.acquire(blocking=False):
+        yield None
+        return
+
+    path = profile_path(profile_dir, request_id)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            # Failed and cancelled requests are saved too; they are often the slow ones.
+            profiler.disable()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
+    finally:
+        _CAPTURE_LOCK.release()
@@ -17,3 +17,11 @@ def ask_prompt_template() -> str:
 
 def explain_region_prompt_template() -> str:
     return load_prompt("explain_region.txt")
+
+
+def ask_system_prompt() -> str:
+    return load_prompt("ask_system.txt")
+
+
+def explain_region_system_prompt() -> str:
+    return load_prompt("explain_region_system.txt")
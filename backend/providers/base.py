@@ -1,5 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+
+def chat_usage_from_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    usage = data.get("usage") or {}
+    timings = data.get("timings") or {}
+    details = usage.get("prompt_tokens_details") or {}
+
+    result: Dict[str, Any] = {}
+    if "prompt_tokens" in usage:
+        result["prompt_tokens"] = usage["prompt_tokens"]
+    if "completion_tokens" in usage:
+        result["completion_tokens"] = usage["completion_tokens"]
+    if "cached_tokens" in details:
+        result["cached_prompt_tokens"] = details["cached_tokens"]
+
+    # llama.cpp server reports how much of the prompt it actually had to evaluate.
+    if "prompt_n" in timings:
+        result["prefill_tokens"] = timings["prompt_n"]
+    if "prompt_ms" in timings:
+        result["prefill_ms"] = round(float(timings["prompt_ms"]), 2)
+    if "cache_n" in timings:
+        result["cached_prompt_tokens"] = timings["cache_n"]
+    elif "prompt_n" in timings and "prompt_tokens" in usage:
+        result.setdefault(
+            "cached_prompt_tokens", max(usage["prompt_tokens"] - timings["prompt_n"], 0)
+        )
+
+    return result
 
 
 class ChatProvider(ABC):
@@ -13,6 +41,14 @@ class ChatProvider(ABC):
     def model(self) -> str:
         pass
 
+    @property
+    def last_usage(self) -> Dict[str, Any]:
+        return getattr(self, "_last_usage", {})
+
+    def route(self, features: Any) -> None:
+        # Single-model providers answer every request themselves; cascades pick a tier here.
+        return None
+
     @abstractmethod
     def generate(self, prompt: str, system: Optional[str] = None) -> str:
         pass
@@ -32,3 +68,13 @@ class EmbeddingProvider(ABC):
     @abstractmethod
     def embed(self, texts: List[str]) -> List[List[float]]:
         pass
+
+    # LangChain vector stores call these two, so providers can be passed to them directly.
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed([text])[0]
+
+    def dimension(self) -> int:
+        return len(self.embed_query("dimension probe"))
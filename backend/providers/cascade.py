@@ -0,0 +1,149 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from backend.providers.base import ChatProvider
+
+HEDGE_PHRASES = (
+    "i'm not sure",
+    "i am not sure",
+    "i'm not certain",
+    "i am not certain",
+    "i cannot answer",
+    "i can't answer",
+    "i don't know",
+    "i do not know",
+    "not enough context",
+    "no relevant context",
+    "cannot determine",
+    "can't determine",
+    "unclear from the context",
+)
+
+
+@dataclass(frozen=True)
+class RequestFeatures:
+    interaction: str
+    text_chars: int
+    score_spread: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CascadeThresholds:
+    max_question_chars: int = 120
+    max_code_chars: int = 400
+    min_score_spread: float = 0.05
+
+
+def score_spread(scores: List[float]) -> Optional[float]:
+    if len(scores) < 2:
+        return None
+    ranked = sorted(scores, reverse=True)
+    return ranked[0] - ranked[-1]
+
+
+def classify(features: RequestFeatures, thresholds: CascadeThresholds) -> str:
+    if features.interaction == "explain_region":
+        return "small" if features.text_chars <= thresholds.max_code_chars else "large"
+
+    if features.text_chars > thresholds.max_question_chars:
+        return "large"
+    # A flat score distribution means no chunk clearly answers the question.
+    if features.score_spread is not None and features.score_spread < thresholds.min_score_spread:
+        return "large"
+    return "small"
+
+
+def looks_low_confidence(answer: str) -> bool:
+    # Length alone says nothing: "C-x C-s" fully answers "What key saves a file?".
+    text = answer.strip().lower()
+    if not any(ch.isalnum() for ch in text):
+        return True
+    return any(phrase in text for phrase in HEDGE_PHRASES)
+
+
+class _TierStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+        self._escalations = 0
+
+    def record(self, tier: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._tiers.setdefault(tier, {"requests": 0, "total_ms": 0.0})
+            entry["requests"] += 1
+            entry["total_ms"] += elapsed_ms
+
+    def record_escalation(self) -> None:
+        with self._lock:
+            self._escalations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {
+                tier: {
+                    "requests": int(entry["requests"]),
+                    "avg_latency_ms": round(entry["total_ms"] / entry["requests"], 2),
+                }
+                for tier, entry in self._tiers.items()
+            }
+            return {"tiers": tiers, "escalations": self._escalations}
+
+
+_STATS = _TierStats()
+
+
+def cascade_stats() -> Dict[str, Any]:
+    return _STATS.snapshot()
+
+
+class CascadeChatProvider(ChatProvider):
+    def __init__(
+        self,
+        small: ChatProvider,
+        large: ChatProvider,
+        thresholds: Optional[CascadeThresholds] = None,
+        escalate: bool = True,
+    ) -> None:
+        self._tiers = {"small": small, "large": large}
+        self._thresholds = thresholds or CascadeThresholds()
+        self._escalate = escalate
+        self._tier = "large"
+        self._last_usage = {}
+
+    @property
+    def name(self) -> str:
+        return "cascade"
+
+    @property
+    def model(self) -> str:
+        return self._tiers[self._tier].model
+
+    @property
+    def tier(self) -> str:
+        return self._tier
+
+    def route(self, features: RequestFeatures) -> None:
+        self._tier = classify(features, self._thresholds)
+
+    def _generate_on(self, tier: str, prompt: str, system: Optional[str]) -> str:
+        provider = self._tiers[tier]
+        started = time.perf_counter()
+        answer = provider.generate(prompt, system=system)
+        _STATS.record(tier, (time.perf_counter() - started) * 1000)
+        self._tier = tier
+        self._last_usage = {
+            **provider.last_usage,
+            "tier": tier,
+            "tier_provider": provider.name,
+        }
+        return answer
+
+    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        answer = self._generate_on(self._tier, prompt, system)
+        if self._tier == "small" and self._escalate and looks_low_confidence(answer):
+            _STATS.record_escalation()
+            answer = self._generate_on("large", prompt, system)
+            self._last_usage["escalated"] = True
+        return answer
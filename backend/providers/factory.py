@@ -1,11 +1,47 @@
+from dataclasses import replace
+
 from backend.config import AppConfig
-from backend.providers.base import ChatProvider
+from backend.providers.base import ChatProvider, EmbeddingProvider
+from backend.providers.cascade import CascadeChatProvider, CascadeThresholds
+from backend.providers.huggingface_embeddings import HuggingFaceEmbeddingProvider
 from backend.providers.local_small import LocalSmallChatProvider
+from backend.providers.ollama_embeddings import OllamaEmbeddingProvider
 from backend.providers.ollama_provider import OllamaChatProvider
+from backend.providers.onnx_embeddings import OnnxEmbeddingProvider
 from backend.providers.openai_provider import OpenAIChatProvider
+from backend.providers.router import get_local_router
 
 
 def get_chat_provider(config: AppConfig) -> ChatProvider:
+    if config.model_provider == "cascade":
+        if "cascade" in (config.cascade_small_provider, config.cascade_large_provider):
+            raise ValueError("Cascade tiers must use a concrete provider, not cascade.")
+
+        small = get_chat_provider(
+            replace(
+                config,
+                model_provider=config.cascade_small_provider,
+                chat_model=config.cascade_small_model,
+            )
+        )
+        large = get_chat_provider(
+            replace(
+                config,
+                model_provider=config.cascade_large_provider,
+                chat_model=config.cascade_large_model,
+            )
+        )
+        return CascadeChatProvider(
+            small,
+            large,
+            thresholds=CascadeThresholds(
+                max_question_chars=config.cascade_max_question_chars,
+                max_code_chars=config.cascade_max_code_chars,
+                min_score_spread=config.cascade_min_score_spread,
+            ),
+            escalate=config.cascade_escalate,
+        )
+
     if config.model_provider == "ollama":
         return OllamaChatProvider(model=config.chat_model, base_url=config.ollama_base_url)
 
@@ -16,13 +52,43 @@ def get_chat_provider(config: AppConfig) -> ChatProvider:
             base_url=config.openai_base_url,
         )
 
+    if config.model_provider == "local_small" and config.local_small_base_urls:
+        return get_local_router(
+            config.local_small_base_urls,
+            model=config.chat_model,
+            cache_prompt=config.local_small_cache_prompt,
+            health_interval=config.router_health_interval,
+            eject_seconds=config.router_eject_seconds,
+        )
+
     if config.model_provider == "local_small":
         return LocalSmallChatProvider(
             model=config.chat_model,
             base_url=config.local_small_base_url,
+            cache_prompt=config.local_small_cache_prompt,
         )
 
     raise ValueError(
         "Unsupported MODEL_PROVIDER. "
-        "Use one of: local_small, ollama, openai."
+        "Use one of: local_small, ollama, openai, cascade."
+    )
+
+
+def get_embedding_provider(config: AppConfig) -> EmbeddingProvider:
+    if config.embedding_provider == "huggingface":
+        return HuggingFaceEmbeddingProvider(model=config.embedding_model)
+
+    if config.embedding_provider == "onnx":
+        return OnnxEmbeddingProvider(
+            model=config.embedding_model,
+            model_dir=config.embedding_model_dir,
+            threads=config.embedding_threads,
+        )
+
+    if config.embedding_provider == "ollama":
+        return OllamaEmbeddingProvider(model=config.embedding_model, base_url=config.ollama_base_url)
+
+    raise ValueError(
+        "Unsupported EMBEDDING_PROVIDER. "
+        "Use one of: huggingface, onnx, ollama."
     )
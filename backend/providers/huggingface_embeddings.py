@@ -0,0 +1,22 @@
+from typing import List
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from backend.providers.base import EmbeddingProvider
+
+
+class HuggingFaceEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, model: str) -> None:
+        self._model = model
+        self._client = HuggingFaceEmbeddings(model_name=model)
+
+    @property
+    def name(self) -> str:
+        return "huggingface"
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self._client.embed_documents(texts)
@@ -1,14 +1,23 @@
 import json
 from typing import Optional
-from urllib import request
+from urllib import error, request
 
-from backend.providers.base import ChatProvider
+from backend.cancellation import RequestCancelled, current_token
+from backend.providers.base import ChatProvider, chat_usage_from_response
+from backend.providers.streaming import post_chat_stream
 
 
 class LocalSmallChatProvider(ChatProvider):
-    def __init__(self, model: str, base_url: str = "http://127.0.0.1:8080/v1") -> None:
+    def __init__(
+        self,
+        model: str,
+        base_url: str = "http://127.0.0.1:8080/v1",
+        cache_prompt: bool = True,
+    ) -> None:
         self._model = model
         self._base_url = base_url.rstrip("/")
+        self._cache_prompt = cache_prompt
+        self._last_usage = {}
 
     @property
     def name(self) -> str:
@@ -18,7 +27,7 @@ class LocalSmallChatProvider(ChatProvider):
     def model(self) -> str:
         return self._model
 
-    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+    def build_payload(self, prompt: str, system: Optional[str] = None) -> dict:
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
@@ -29,17 +38,50 @@ class LocalSmallChatProvider(ChatProvider):
             "messages": messages,
             "temperature": 0.2,
         }
+        # No id_slot: the server already routes each request to the idle slot whose cached
+        # prefix matches best, and pinning would queue concurrent requests on one slot.
+        if self._cache_prompt:
+            payload["cache_prompt"] = True
+
+        return payload
+
+    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        payload = self.build_payload(prompt, system=system)
 
-        req = request.Request(
-            url=f"{self._base_url}/chat/completions",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+        url = f"{self._base_url}/chat/completions"
+        headers = {"Content-Type": "application/json"}
+
+        # Cancellable requests stream so generation can be aborted, even during prefill.
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
 
         try:
+            if token is not None:
+                answer, self._last_usage = post_chat_stream(
+                    url, payload, headers, token, timeout=90
+                )
+                return answer
+            req = request.Request(
+                url=url,
+                data=json.dumps(payload).encode("utf-8"),
+                headers=headers,
+                method="POST",
+            )
             with request.urlopen(req, timeout=90) as resp:
                 data = json.loads(resp.read().decode("utf-8"))
+        except RequestCancelled:
+            raise
+        except error.HTTPError as exc:
+            if exc.code >= 500:
+                raise RuntimeError(
+                    f"local_small inference server at {self._base_url} failed ({exc.code})."
+                ) from exc
+            raise RuntimeError(
+                f"local_small inference server rejected the request ({exc.code}): {exc.reason}"
+            ) from exc
         except Exception as exc:
             raise RuntimeError(
                 "local_small provider could not reach local inference server. "
@@ -47,4 +89,5 @@ class LocalSmallChatProvider(ChatProvider):
                 f"at {self._base_url}."
             ) from exc
 
+        self._last_usage = chat_usage_from_response(data)
         return data["choices"][0]["message"]["content"].strip()
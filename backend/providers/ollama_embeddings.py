@@ -0,0 +1,54 @@
+import json
+from typing import List
+from urllib import request
+
+from backend.providers.base import EmbeddingProvider
+
+
+class OllamaEmbeddingProvider(EmbeddingProvider):
+    def __init__(
+        self,
+        model: str,
+        base_url: str = "http://localhost:11434",
+        batch_size: int = 32,
+    ) -> None:
+        self._model = model
+        self._base_url = base_url.rstrip("/")
+        self._batch_size = max(batch_size, 1)
+
+    @property
+    def name(self) -> str:
+        return "ollama"
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        payload = {"model": self._model, "input": texts}
+        req = request.Request(
+            f"{self._base_url}/api/embed",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with request.urlopen(req, timeout=120) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+        except Exception as exc:
+            raise RuntimeError(
+                f"Failed to call Ollama embeddings at {self._base_url}/api/embed: {exc}"
+            ) from exc
+
+        embeddings = data.get("embeddings") or []
+        if len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs."
+            )
+        return embeddings
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self._batch_size):
+            vectors.extend(self._embed_batch(texts[start : start + self._batch_size]))
+        return vectors
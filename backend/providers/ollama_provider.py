@@ -2,6 +2,7 @@ from typing import Optional
 
 from langchain_community.llms import Ollama
 
+from backend.cancellation import current_token
 from backend.providers.base import ChatProvider
 
 
@@ -24,6 +25,16 @@ class OllamaChatProvider(ChatProvider):
         if system:
             full_prompt = f"System:\n{system}\n\nUser:\n{prompt}"
 
+        # Cancellable requests stream so generation stops once the token is cancelled.
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            parts = []
+            for chunk in self._client.stream(full_prompt):
+                token.raise_if_cancelled()
+                parts.append(chunk)
+            return "".join(parts)
+
         try:
             return self._client.invoke(full_prompt)
         except AttributeError:
@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from backend.providers.base import EmbeddingProvider
+
+ONNX_MODEL_FILENAMES = ("model_quantized.onnx", "model.onnx")
+TOKENIZER_FILENAME = "tokenizer.json"
+
+
+def find_onnx_model(model_dir: Path) -> Path:
+    for filename in ONNX_MODEL_FILENAMES:
+        path = Path(model_dir) / filename
+        if path.exists():
+            return path
+    raise FileNotFoundError(
+        f"No ONNX embedding model found in {model_dir}. "
+        "Run `python3 sync_models.py --all` to download the int8 export."
+    )
+
+
+def mean_pool(hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    weights = mask[:, :, None].astype(hidden.dtype)
+    summed = (hidden * weights).sum(axis=1)
+    counts = np.clip(weights.sum(axis=1), 1e-9, None)
+    pooled = summed / counts
+    norms = np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled / norms
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    def __init__(
+        self,
+        model: str,
+        model_dir: str,
+        max_length: int = 256,
+        batch_size: int = 32,
+        threads: int = 0,
+    ) -> None:
+        # Optional dependencies: only needed when EMBEDDING_PROVIDER=onnx.
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self._model = model
+        self._batch_size = max(batch_size, 1)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self._session = onnxruntime.InferenceSession(
+            str(find_onnx_model(Path(model_dir))),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {item.name for item in self._session.get_inputs()}
+
+        self._tokenizer = Tokenizer.from_file(str(Path(model_dir) / TOKENIZER_FILENAME))
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self._tokenizer.enable_padding()
+
+    @property
+    def name(self) -> str:
+        return "onnx"
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([enc.ids for enc in encodings], dtype=np.int64),
+            "attention_mask": np.array([enc.attention_mask for enc in encodings], dtype=np.int64),
+            "token_type_ids": np.array([enc.type_ids for enc in encodings], dtype=np.int64),
+        }
+        feed = {name: value for name, value in inputs.items() if name in self._input_names}
+        hidden = self._session.run(None, feed)[0]
+        return mean_pool(hidden, inputs["attention_mask"])
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        # Batching texts of similar length keeps padding, and wasted compute, small.
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
+        vectors: List[List[float]] = [[] for _ in texts]
+        for start in range(0, len(order), self._batch_size):
+            batch = order[start : start + self._batch_size]
+            pooled = self._embed_batch([texts[idx] for idx in batch])
+            for idx, vector in zip(batch, pooled):
+                vectors[idx] = vector.tolist()
+        return vectors
@@ -2,7 +2,9 @@ import json
 from typing import Optional
 from urllib import request
 
-from backend.providers.base import ChatProvider
+from backend.cancellation import current_token
+from backend.providers.base import ChatProvider, chat_usage_from_response
+from backend.providers.streaming import post_chat_stream
 
 
 class OpenAIChatProvider(ChatProvider):
@@ -18,6 +20,7 @@ class OpenAIChatProvider(ChatProvider):
         self._model = model
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
+        self._last_usage = {}
 
     @property
     def name(self) -> str:
@@ -39,17 +42,30 @@ class OpenAIChatProvider(ChatProvider):
             "temperature": 0.2,
         }
 
+        url = f"{self._base_url}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+
+        # Cancellable requests stream so generation can be aborted, even before the first token.
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+            answer, self._last_usage = post_chat_stream(url, payload, headers, token)
+            return answer
+
         req = request.Request(
-            url=f"{self._base_url}/chat/completions",
+            url=url,
             data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-            },
+            headers=headers,
             method="POST",
         )
 
         with request.urlopen(req) as resp:
             data = json.loads(resp.read().decode("utf-8"))
 
+        self._last_usage = chat_usage_from_response(data)
         return data["choices"][0]["message"]["content"].strip()
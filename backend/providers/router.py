@@ -0,0 +1,243 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib import error, request
+
+from backend.cancellation import RequestCancelled
+from backend.providers.base import ChatProvider
+from backend.providers.local_small import LocalSmallChatProvider
+
+
+class _Endpoint:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.in_flight = 0
+        self.ewma_ms: Optional[float] = None
+        self.healthy = True
+        self.ejected_at = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def score(self) -> Tuple[float, int]:
+        # Unmeasured endpoints score zero so every endpoint gets sampled early on;
+        # in-flight count breaks ties between them.
+        return (self.ewma_ms or 0.0) * (self.in_flight + 1), self.in_flight
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "ewma_ms": round(self.ewma_ms, 2) if self.ewma_ms is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def _default_probe(base_url: str, timeout: float) -> bool:
+    try:
+        with request.urlopen(f"{base_url}/models", timeout=timeout) as resp:
+            return resp.status < 500
+    except Exception:
+        return False
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    # Providers wrap transport errors, so look through the whole cause chain.
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, error.HTTPError):
+            return exc.code >= 500
+        if isinstance(exc, (error.URLError, ConnectionError, TimeoutError)):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class EndpointPool:
+    def __init__(
+        self,
+        base_urls: List[str],
+        provider_factory: Callable[[str], ChatProvider],
+        health_interval: float = 10.0,
+        eject_seconds: float = 30.0,
+        ewma_alpha: float = 0.3,
+        probe: Optional[Callable[[str, float], bool]] = None,
+        probe_timeout: float = 2.0,
+    ) -> None:
+        if not base_urls:
+            raise ValueError("EndpointPool requires at least one endpoint")
+
+        self._endpoints = [_Endpoint(url.rstrip("/")) for url in base_urls]
+        self._provider_factory = provider_factory
+        self._lock = threading.Lock()
+        self._health_interval = health_interval
+        self._eject_seconds = eject_seconds
+        self._alpha = ewma_alpha
+        self._probe = probe or _default_probe
+        self._probe_timeout = probe_timeout
+        self._checker: Optional[threading.Thread] = None
+
+    def acquire(self, exclude: Optional[_Endpoint] = None) -> Optional[_Endpoint]:
+        self._ensure_health_checker()
+        with self._lock:
+            candidates = [ep for ep in self._endpoints if ep is not exclude]
+            if not candidates:
+                return None
+
+            healthy = [ep for ep in candidates if ep.healthy]
+            if healthy:
+                best = min(ep.score() for ep in healthy)
+                chosen = random.choice([ep for ep in healthy if ep.score() == best])
+            else:
+                # Everything is ejected: try the endpoint that has been out the longest.
+                chosen = min(candidates, key=lambda ep: ep.ejected_at)
+
+            chosen.in_flight += 1
+            chosen.requests += 1
+            return chosen
+
+    def release(self, endpoint: _Endpoint, elapsed_ms: Optional[float]) -> None:
+        with self._lock:
+            endpoint.in_flight -= 1
+            if elapsed_ms is None:
+                endpoint.failures += 1
+                self._eject(endpoint)
+                return
+
+            if endpoint.ewma_ms is None:
+                endpoint.ewma_ms = elapsed_ms
+            else:
+                endpoint.ewma_ms = self._alpha * elapsed_ms + (1 - self._alpha) * endpoint.ewma_ms
+            endpoint.healthy = True
+
+    def abandon(self, endpoint: _Endpoint) -> None:
+        # Cancelled or rejected requests say nothing about endpoint health or latency.
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def provider_for(self, endpoint: _Endpoint) -> ChatProvider:
+        return self._provider_factory(endpoint.base_url)
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        endpoint.healthy = False
+        endpoint.ejected_at = time.monotonic()
+
+    def check_health(self) -> None:
+        now = time.monotonic()
+        for endpoint in list(self._endpoints):
+            if not endpoint.healthy and now - endpoint.ejected_at < self._eject_seconds:
+                continue
+            ok = self._probe(endpoint.base_url, self._probe_timeout)
+            with self._lock:
+                if ok:
+                    endpoint.healthy = True
+                elif endpoint.healthy:
+                    self._eject(endpoint)
+
+    def _ensure_health_checker(self) -> None:
+        if self._health_interval <= 0 or self._checker is not None:
+            return
+        with self._lock:
+            if self._checker is not None:
+                return
+            self._checker = threading.Thread(
+                target=self._health_loop, name="endpoint-health", daemon=True
+            )
+            self._checker.start()
+
+    def _health_loop(self) -> None:
+        while True:
+            time.sleep(self._health_interval)
+            self.check_health()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [ep.snapshot() for ep in self._endpoints]
+
+
+class RoutedChatProvider(ChatProvider):
+    def __init__(self, pool: EndpointPool, name: str, model: str) -> None:
+        self._pool = pool
+        self._name = name
+        self._model = model
+        self._last_usage = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        tried: Optional[_Endpoint] = None
+        last_error: Optional[Exception] = None
+
+        # One attempt plus a single retry on a different endpoint, for transport errors only.
+        for _ in range(2):
+            endpoint = self._pool.acquire(exclude=tried)
+            if endpoint is None:
+                break
+
+            provider = self._pool.provider_for(endpoint)
+            started = time.perf_counter()
+            try:
+                answer = provider.generate(prompt, system=system)
+            except RequestCancelled:
+                self._pool.abandon(endpoint)
+                raise
+            except Exception as exc:
+                # A bad request (4xx, unparseable answer) would fail on any endpoint.
+                if not is_endpoint_failure(exc):
+                    self._pool.abandon(endpoint)
+                    raise
+                self._pool.release(endpoint, None)
+                tried = endpoint
+                last_error = exc
+                continue
+
+            self._pool.release(endpoint, (time.perf_counter() - started) * 1000)
+            self._last_usage = {**provider.last_usage, "endpoint": endpoint.base_url}
+            return answer
+
+        raise RuntimeError("All routed inference endpoints failed.") from last_error
+
+
+_POOLS: Dict[Tuple[Any, ...], EndpointPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_local_router(
+    base_urls: Tuple[str, ...],
+    model: str,
+    cache_prompt: bool = True,
+    health_interval: float = 10.0,
+    eject_seconds: float = 30.0,
+) -> RoutedChatProvider:
+    key = (base_urls, model, cache_prompt, health_interval, eject_seconds)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = EndpointPool(
+                list(base_urls),
+                lambda url: LocalSmallChatProvider(
+                    model=model,
+                    base_url=url,
+                    cache_prompt=cache_prompt,
+                ),
+                health_interval=health_interval,
+                eject_seconds=eject_seconds,
+            )
+            _POOLS[key] = pool
+
+    return RoutedChatProvider(pool, name="local_small", model=model)
+
+
+def router_stats() -> List[Dict[str, Any]]:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [endpoint for pool in pools for endpoint in pool.stats()]
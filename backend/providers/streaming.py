@@ -0,0 +1,88 @@
+import http.client
+import json
+import socket
+from typing import Any, Dict, Optional, Tuple
+from urllib import error
+from urllib.parse import urlsplit
+
+from backend.cancellation import CancelToken, RequestCancelled
+from backend.providers.base import chat_usage_from_response
+
+
+def read_chat_stream(resp: Any, token: CancelToken) -> Tuple[str, Dict[str, Any]]:
+    # Closing the socket from the cancelling thread unblocks the read and tells the
+    # server to stop generating.
+    unregister = token.on_cancel(resp.close)
+    parts = []
+    usage: Dict[str, Any] = {}
+    try:
+        for raw in resp:
+            token.raise_if_cancelled()
+            line = raw.decode("utf-8").strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+
+            chunk = json.loads(data)
+            usage.update(chat_usage_from_response(chunk))
+            for choice in chunk.get("choices") or []:
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    parts.append(content)
+    except RequestCancelled:
+        raise
+    except Exception:
+        if token.cancelled:
+            raise RequestCancelled(f"Request {token.request_id} was cancelled")
+        raise
+    finally:
+        unregister()
+
+    token.raise_if_cancelled()
+    return "".join(parts).strip(), usage
+
+
+def post_chat_stream(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    token: CancelToken,
+    timeout: Optional[float] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    # urlopen cannot be interrupted while the server is still on prefill, so a preempted
+    # request would hold its slot until the first token. Owning the socket lets a cancel
+    # shut it down at any point, and the server stops generating once the client is gone.
+    parts = urlsplit(url)
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(parts.netloc, timeout=timeout)
+
+    def abort() -> None:
+        if conn.sock is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    unregister = token.on_cancel(abort)
+    try:
+        conn.connect()
+        token.raise_if_cancelled()
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        conn.request("POST", path, body=json.dumps(payload).encode("utf-8"), headers=headers)
+        resp = conn.getresponse()
+        if resp.status >= 400:
+            raise error.HTTPError(url, resp.status, resp.reason, resp.headers, resp)
+        return read_chat_stream(resp, token)
+    except RequestCancelled:
+        raise
+    except Exception:
+        if token.cancelled:
+            raise RequestCancelled(f"Request {token.request_id} was cancelled")
+        raise
+    finally:
+        unregister()
+        conn.close()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import re
+import sqlite3
+import textwrap
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_LISP_HINTS = ("lisp", "elisp", "scheme", "clojure", "racket")
+_OPENERS = {"(", "[", "'", "`", ",", ",@", "#'"}
+_CLOSERS = {")", "]"}
+_SEXP_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>;[^\n]*)
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<char>\?\\?.)
+    |(?P<open>[(\[])
+    |(?P<close>[)\]])
+    |(?P<prefix>,@|\#'|[',`])
+    |(?P<atom>[^\s()\[\]"';`,]+)
+    |(?P<space>\s+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def is_lisp(language: str) -> bool:
+    lang = language.lower()
+    return any(hint in lang for hint in _LISP_HINTS)
+
+
+def _sexp_tokens(code: str) -> List[str]:
+    tokens = []
+    for match in _SEXP_TOKEN_RE.finditer(code):
+        kind = match.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        tokens.append(match.group(kind))
+    return tokens
+
+
+def canonicalize_sexp(code: str) -> str:
+    parts: List[str] = []
+    previous = None
+    for token in _sexp_tokens(code):
+        if previous is not None and previous not in _OPENERS and token not in _CLOSERS:
+            parts.append(" ")
+        parts.append(token)
+        previous = token
+    return "".join(parts)
+
+
+def normalize_code(code: str, language: str) -> str:
+    if is_lisp(language):
+        return canonicalize_sexp(code)
+
+    # Outside Lisp, indentation can be meaningful, so only trim what never is.
+    lines = [line.rstrip() for line in textwrap.dedent(code).splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def explain_region_key(
+    code: str,
+    language: str,
+    context: str,
+    skill_level: str,
+    provider: str,
+    model: str,
+    settings: str = "",
+) -> str:
+    parts = [
+        "explain_region",
+        normalize_code(code, language),
+        language.strip().lower(),
+        " ".join(context.split()),
+        skill_level.strip().lower(),
+        provider,
+        model,
+        settings,
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def ask_key(
+    question: str, skill_level: str, provider: str, model: str, settings: str = ""
+) -> str:
+    parts = [
+        "ask",
+        " ".join(question.split()).lower(),
+        skill_level.strip().lower(),
+        provider,
+        model,
+        settings,
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._local = threading.local()
+        self._purged_versions = set()
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._path), timeout=10)
+        # WAL lets several uvicorn workers read while one of them writes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                index_version TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        self._local.conn = conn
+        return conn
+
+    def _purge_stale(self, conn: sqlite3.Connection, index_version: str) -> None:
+        with self._lock:
+            if index_version in self._purged_versions:
+                return
+            self._purged_versions.add(index_version)
+        with conn:
+            conn.execute("DELETE FROM results WHERE index_version != ?", (index_version,))
+
+    def get(self, key: str, index_version: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        self._purge_stale(conn, index_version)
+        row = conn.execute(
+            "SELECT payload FROM results WHERE key = ? AND index_version = ?",
+            (key, index_version),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, kind: str, index_version: str, payload: Dict[str, Any]) -> None:
+        conn = self._connect()
+        self._purge_stale(conn, index_version)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, kind, index_version, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, kind, index_version, json.dumps(payload, ensure_ascii=True), time.time()),
+            )
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+_STORES: Dict[str, ResultStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_result_store(path: str) -> ResultStore:
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = ResultStore(Path(path))
+            _STORES[path] = store
+        return store
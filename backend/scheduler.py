@@ -0,0 +1,126 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.cancellation import CancelToken
+from backend.config import AppConfig
+
+# Generations one local llama.cpp server runs at once before requests only queue on it.
+GENERATIONS_PER_LOCAL_ENDPOINT = 2
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+
+class SchedulerBusy(Exception):
+    pass
+
+
+class PriorityScheduler:
+    def __init__(self, max_concurrency: int = 2, background_max_wait: float = 5.0) -> None:
+        self._max = max(max_concurrency, 1)
+        self._background_max_wait = max(background_max_wait, 0.0)
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting_interactive = 0
+        self._background: List[Optional[CancelToken]] = []
+        self._stats = {"interactive": 0, "background": 0, "deferred": 0, "preempted": 0}
+
+    def _preempt_background(self) -> None:
+        # One preempted job at a time; it frees its slot once its provider call aborts.
+        if any(token is not None and token.cancelled for token in self._background):
+            return
+        for token in self._background:
+            if token is not None and not token.cancelled:
+                token.cancel()
+                self._stats["preempted"] += 1
+                return
+
+    def acquire(self, priority: str, token: Optional[CancelToken] = None) -> None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        with self._cond:
+            if priority == INTERACTIVE:
+                self._waiting_interactive += 1
+                try:
+                    while self._running >= self._max:
+                        self._preempt_background()
+                        self._cond.wait()
+                finally:
+                    self._waiting_interactive -= 1
+            else:
+                # Background work only uses spare capacity nobody interactive is waiting for.
+                deadline = time.monotonic() + self._background_max_wait
+                while self._running >= self._max or self._waiting_interactive:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["deferred"] += 1
+                        raise SchedulerBusy("No spare capacity for background work")
+                    self._cond.wait(remaining)
+                self._background.append(token)
+
+            self._running += 1
+            self._stats[priority] += 1
+
+    def release(self, priority: str, token: Optional[CancelToken] = None) -> None:
+        with self._cond:
+            self._running -= 1
+            if priority == BACKGROUND:
+                self._background.remove(token)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str, token: Optional[CancelToken] = None) -> Iterator[None]:
+        self.acquire(priority, token)
+        try:
+            yield
+        finally:
+            self.release(priority, token)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "max_concurrency": self._max,
+                "running": self._running,
+                "running_background": len(self._background),
+                "waiting_interactive": self._waiting_interactive,
+                **self._stats,
+            }
+
+
+def generation_limit(config: AppConfig) -> Optional[int]:
+    # Only local inference servers are capped by default, per endpoint so that routed
+    # endpoints add capacity; ollama and openai queue requests themselves.
+    if config.generation_concurrency > 0:
+        return config.generation_concurrency
+    if config.model_provider == "local_small":
+        return GENERATIONS_PER_LOCAL_ENDPOINT * max(len(config.local_small_base_urls), 1)
+    if config.model_provider == "cascade" and "local_small" in (
+        config.cascade_small_provider,
+        config.cascade_large_provider,
+    ):
+        return GENERATIONS_PER_LOCAL_ENDPOINT
+    return None
+
+
+_SCHEDULERS: Dict[Any, PriorityScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(max_concurrency: int, background_max_wait: float) -> PriorityScheduler:
+    key = (max_concurrency, background_max_wait)
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(key)
+        if scheduler is None:
+            scheduler = PriorityScheduler(max_concurrency, background_max_wait)
+            _SCHEDULERS[key] = scheduler
+        return scheduler
+
+
+def scheduler_stats() -> List[Dict[str, Any]]:
+    with _SCHEDULERS_LOCK:
+        schedulers = list(_SCHEDULERS.values())
+    return [scheduler.stats() for scheduler in schedulers]
@@ -1,40 +1,148 @@
-from typing import Dict, List, Optional
+import hashlib
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
 
+from backend.cancellation import check_cancelled, current_token
+from backend.chunking import section_label
 from backend.config import AppConfig
+from backend.dedup import ALTERNATE_SOURCES_SEPARATOR
+from backend.embedding_batcher import get_embedding_batcher
 from backend.health import check_local_small_prereqs
-from backend.prompts import ask_prompt_template, explain_region_prompt_template
-from backend.providers.factory import get_chat_provider
+from backend.index_meta import (
+    UNVERSIONED,
+    check_embedding_meta,
+    index_version,
+    load_index_meta,
+)
+from backend.prompts import (
+    ask_prompt_template,
+    ask_system_prompt,
+    explain_region_prompt_template,
+    explain_region_system_prompt,
+)
+from backend.providers.cascade import RequestFeatures, score_spread
+from backend.providers.factory import get_chat_provider, get_embedding_provider
+from backend.result_store import ask_key, explain_region_key, get_result_store
+from backend.scheduler import INTERACTIVE, generation_limit, get_scheduler
+from backend.snapshots import get_snapshot_reloader, resolve_index_dir
+from backend.symbols import load_symbol_index, lookup_chunk_ids
 from backend.telemetry import log_event
 
 
-def _build_retriever(config: AppConfig):
-    embeddings = HuggingFaceEmbeddings(model_name=config.embedding_model)
-    vectorstore = Chroma(
-        persist_directory=config.vector_db_dir,
-        embedding_function=embeddings,
+def _query_batcher(config: AppConfig):
+    # One shared model per process; concurrent queries are embedded in a single forward pass.
+    return get_embedding_batcher(
+        f"{config.embedding_provider}:{config.embedding_model}",
+        lambda: get_embedding_provider(config).embed,
+        max_wait_ms=config.embed_batch_wait_ms,
+        max_batch_size=config.embed_batch_max_size,
     )
-    return vectorstore.as_retriever(search_kwargs={"k": config.retrieval_k})
 
 
-def _retrieve_docs(query: str, config: AppConfig) -> List:
-    retriever = _build_retriever(config)
-    try:
-        return retriever.invoke(query)
-    except AttributeError:
-        return retriever.get_relevant_documents(query)
+@dataclass(frozen=True)
+class _LoadedIndex:
+    path: Path
+    version: str
+    meta: Dict[str, Any]
+    vectorstore: Any
+    symbol_index: Dict[str, List[str]]
+
+
+def _load_index(path: Path) -> _LoadedIndex:
+    # Queries are embedded through the shared batcher, so the store needs no embedding model.
+    meta = load_index_meta(path)
+    return _LoadedIndex(
+        path=path,
+        version=str(meta.get("version") or UNVERSIONED),
+        meta=meta,
+        vectorstore=Chroma(persist_directory=str(path)),
+        symbol_index=load_symbol_index(path),
+    )
+
+
+def _active_index(config: AppConfig) -> _LoadedIndex:
+    # Rebuilds publish a new snapshot; it is loaded in the background and swapped in when ready.
+    return get_snapshot_reloader(
+        config.vector_db_dir, _load_index, check_interval=config.index_reload_interval
+    ).current()
+
+
+def _published_version(config: AppConfig) -> str:
+    # Reads two small files, so cached answers are served without loading the index.
+    return index_version(resolve_index_dir(Path(config.vector_db_dir)))
+
+
+def _lookup_symbol_docs(query: str, index: _LoadedIndex, limit: int) -> List:
+    chunk_ids = lookup_chunk_ids(query, index.symbol_index, limit=limit)
+    if not chunk_ids:
+        return []
+
+    found = index.vectorstore.get(ids=chunk_ids)
+    by_id = {
+        cid: Document(page_content=text, metadata=metadata or {})
+        for cid, text, metadata in zip(found["ids"], found["documents"], found["metadatas"])
+    }
+    return [by_id[cid] for cid in chunk_ids if cid in by_id]
+
+
+def _retrieve_docs(
+    query: str, config: AppConfig, index: _LoadedIndex
+) -> Tuple[List, List[float]]:
+    # Chunks defining a named symbol or key sequence answer without embedding the query.
+    symbol_docs = _lookup_symbol_docs(query, index, limit=max(config.retrieval_k // 2, 1))
+    if symbol_docs and not searches_on_symbol_hit(config):
+        return symbol_docs, []
+
+    query_vector = _query_batcher(config).embed(query)
+    check_embedding_meta(index.meta, config.embedding_model, len(query_vector))
+    vectorstore = index.vectorstore
+    scored = vectorstore.similarity_search_by_vector_with_relevance_scores(
+        query_vector, k=config.retrieval_k
+    )
+    docs = merge_retrieved(symbol_docs, [doc for doc, _ in scored], config.retrieval_k)
+    return docs, [relevance_score(distance) for _, distance in scored]
+
+
+def searches_on_symbol_hit(config: AppConfig) -> bool:
+    # The cascade routes on similarity scores, so it still searches and fills the other slots.
+    return config.model_provider == "cascade"
+
 
+def relevance_score(distance: float) -> float:
+    # Chroma returns L2 distances (the default space every index here is built with);
+    # for unit-length embeddings this maps them onto [0, 1] like its relevance search does.
+    return 1.0 - distance / math.sqrt(2)
 
-def _format_context(docs: List) -> str:
+
+def merge_retrieved(symbol_docs: List, similar_docs: List, k: int) -> List:
+    docs = list(symbol_docs[:k])
+    seen = {doc.page_content for doc in docs}
+    for doc in similar_docs:
+        if len(docs) >= k:
+            break
+        if doc.page_content not in seen:
+            seen.add(doc.page_content)
+            docs.append(doc)
+    return docs
+
+
+def format_context(docs: List) -> str:
     if not docs:
         return "No relevant context found in indexed resources."
 
     sections = []
     for idx, doc in enumerate(docs, start=1):
         source = doc.metadata.get("resource_path") or doc.metadata.get("source", "unknown")
-        sections.append(f"[Source {idx}: {source}]\\n{doc.page_content}")
+        title = section_label(doc.metadata)
+        label = f"{source} - {title}" if title else source
+        sections.append(f"[Source {idx}: {label}]\\n{doc.page_content}")
 
     return "\\n\\n".join(sections)
 
@@ -43,17 +151,72 @@ def _extract_sources(docs: List) -> List[str]:
     sources: List[str] = []
     for doc in docs:
         source = doc.metadata.get("resource_path") or doc.metadata.get("source")
-        if source and source not in sources:
-            sources.append(source)
+        # Near-duplicate chunks merged at index time keep their other sources here.
+        alternates = doc.metadata.get("alternate_sources") or ""
+        for candidate in [source, *alternates.split(ALTERNATE_SOURCES_SEPARATOR)]:
+            if candidate and candidate not in sources:
+                sources.append(candidate)
     return sources
 
 
+def _uses_local_server(config: AppConfig) -> bool:
+    # Routed endpoints may live on other hosts, so only check the single local server setup.
+    if config.local_small_base_urls:
+        return False
+    if config.model_provider == "cascade":
+        return "local_small" in (config.cascade_small_provider, config.cascade_large_provider)
+    return config.model_provider == "local_small"
+
+
 def _prepare_provider(config: AppConfig):
-    if config.model_provider == "local_small":
+    if _uses_local_server(config):
         check_local_small_prereqs(config)
     return get_chat_provider(config)
 
 
+def _configured_model(config: AppConfig) -> str:
+    if config.model_provider == "cascade":
+        return f"{config.cascade_small_model}|{config.cascade_large_model}"
+    return config.chat_model
+
+
+def _generation_settings(config: AppConfig, template: str, system: str) -> str:
+    # Editing a prompt file or RETRIEVAL_K changes answers, so stored ones must not match.
+    parts = [template, system, str(config.retrieval_k)]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _ask_store_key(config: AppConfig, query: str, skill_level: str) -> str:
+    return ask_key(
+        query,
+        skill_level,
+        config.model_provider,
+        _configured_model(config),
+        _generation_settings(config, ask_prompt_template(), ask_system_prompt()),
+    )
+
+
+def _cached_result(config: AppConfig, key: str, version: str) -> Optional[Dict[str, Any]]:
+    if not config.enable_result_store:
+        return None
+    try:
+        return get_result_store(config.result_store_path).get(key, version)
+    except sqlite3.Error:
+        return None
+
+
+def _store_result(
+    config: AppConfig, key: str, kind: str, version: str, result: Dict[str, Any]
+) -> None:
+    if not config.enable_result_store:
+        return
+    payload = {k: v for k, v in result.items() if k not in ("request_id", "cached")}
+    try:
+        get_result_store(config.result_store_path).put(key, kind, version, payload)
+    except sqlite3.Error:
+        pass
+
+
 def _log_response(
     *,
     config: AppConfig,
@@ -63,7 +226,13 @@ def _log_response(
     model_name: str,
     skill_level: str,
     docs_count: int,
+    latency_ms: float,
+    usage: Optional[Dict[str, Any]] = None,
+    cache_hit: bool = False,
+    question: Optional[str] = None,
 ) -> None:
+    # Question text is only logged on request; it is what warm_answers.py mines.
+    extra = {"question": question} if question and config.log_questions else {}
     log_event(
         {
             "event": "completion",
@@ -73,28 +242,101 @@ def _log_response(
             "model": model_name,
             "skill_level": skill_level,
             "retrieval_chunks": docs_count,
+            "latency_ms": round(latency_ms, 2),
+            "cache_hit": cache_hit,
+            **(usage or {}),
+            **extra,
         },
         config,
     )
 
 
+def _serve_cached(
+    *,
+    config: AppConfig,
+    key: str,
+    version: str,
+    interaction: str,
+    skill_level: str,
+    request_id: Optional[str],
+    started: float,
+    question: Optional[str] = None,
+) -> Optional[Dict[str, object]]:
+    cached = _cached_result(config, key, version)
+    if cached is None:
+        return None
+
+    _log_response(
+        config=config,
+        request_id=request_id,
+        interaction=interaction,
+        provider_name=cached.get("provider", ""),
+        model_name=cached.get("model", ""),
+        skill_level=skill_level,
+        docs_count=0,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache_hit=True,
+        question=question,
+    )
+    return {**cached, "cached": True, "request_id": request_id}
+
+
+def _generate(config: AppConfig, provider, prompt: str, system: str, priority: str) -> str:
+    limit = generation_limit(config)
+    if limit is None:
+        check_cancelled()
+        return provider.generate(prompt, system=system)
+
+    # Background work only runs on spare capacity and is preempted by interactive requests.
+    scheduler = get_scheduler(limit, config.background_max_wait)
+    with scheduler.slot(priority, current_token()):
+        check_cancelled()
+        return provider.generate(prompt, system=system)
+
+
 def ask_emacs(
     query: str,
     skill_level: str = "beginner",
     request_id: Optional[str] = None,
+    priority: str = INTERACTIVE,
 ) -> Dict[str, object]:
+    started = time.perf_counter()
     config = AppConfig.from_env()
+
+    store_key = _ask_store_key(config, query, skill_level)
+    cached = _serve_cached(
+        config=config,
+        key=store_key,
+        version=_published_version(config),
+        interaction="ask",
+        skill_level=skill_level,
+        request_id=request_id,
+        started=started,
+        question=query,
+    )
+    if cached is not None:
+        return cached
+
     provider = _prepare_provider(config)
+    index = _active_index(config)
 
-    docs = _retrieve_docs(query, config)
-    context = _format_context(docs)
+    docs, scores = _retrieve_docs(query, config, index)
+    provider.route(
+        RequestFeatures(
+            interaction="ask",
+            text_chars=len(query),
+            score_spread=score_spread(scores),
+        )
+    )
+    check_cancelled()
+    context = format_context(docs)
     prompt = ask_prompt_template().format(
         question=query,
         skill_level=skill_level,
         context=context,
     )
 
-    answer = provider.generate(prompt)
+    answer = _generate(config, provider, prompt, ask_system_prompt(), priority)
     _log_response(
         config=config,
         request_id=request_id,
@@ -103,15 +345,22 @@ def ask_emacs(
         model_name=provider.model,
         skill_level=skill_level,
         docs_count=len(docs),
+        latency_ms=(time.perf_counter() - started) * 1000,
+        usage=provider.last_usage,
+        question=query,
     )
 
-    return {
+    result = {
         "answer": answer,
         "sources": _extract_sources(docs),
         "provider": provider.name,
         "model": provider.model,
+        "usage": provider.last_usage,
+        "cached": False,
         "request_id": request_id,
     }
+    _store_result(config, store_key, "ask", index.version, result)
+    return result
 
 
 def explain_region(
@@ -120,22 +369,58 @@ def explain_region(
     context: str = "",
     skill_level: str = "beginner",
     request_id: Optional[str] = None,
+    priority: str = INTERACTIVE,
 ) -> Dict[str, object]:
+    started = time.perf_counter()
     config = AppConfig.from_env()
+
+    # Popular snippets are served from the shared store, keyed on a normalized form of the code.
+    store_key = explain_region_key(
+        code,
+        language,
+        context,
+        skill_level,
+        config.model_provider,
+        _configured_model(config),
+        _generation_settings(
+            config, explain_region_prompt_template(), explain_region_system_prompt()
+        ),
+    )
+    cached = _serve_cached(
+        config=config,
+        key=store_key,
+        version=_published_version(config),
+        interaction="explain_region",
+        skill_level=skill_level,
+        request_id=request_id,
+        started=started,
+    )
+    if cached is not None:
+        return cached
+
     provider = _prepare_provider(config)
+    index = _active_index(config)
 
     retrieval_query = f"{language} {context} {code[:1200]}"
-    docs = _retrieve_docs(retrieval_query, config)
+    docs, scores = _retrieve_docs(retrieval_query, config, index)
+    provider.route(
+        RequestFeatures(
+            interaction="explain_region",
+            text_chars=len(code),
+            score_spread=score_spread(scores),
+        )
+    )
+    check_cancelled()
 
     prompt = explain_region_prompt_template().format(
         skill_level=skill_level,
         language=language,
         extra_context=context or "(none)",
-        docs_context=_format_context(docs),
+        docs_context=format_context(docs),
         code=code,
     )
 
-    answer = provider.generate(prompt)
+    answer = _generate(config, provider, prompt, explain_region_system_prompt(), priority)
     _log_response(
         config=config,
         request_id=request_id,
@@ -144,12 +429,18 @@ def explain_region(
         model_name=provider.model,
         skill_level=skill_level,
         docs_count=len(docs),
+        latency_ms=(time.perf_counter() - started) * 1000,
+        usage=provider.last_usage,
     )
 
-    return {
+    result = {
         "answer": answer,
         "sources": _extract_sources(docs),
         "provider": provider.name,
         "model": provider.model,
+        "usage": provider.last_usage,
+        "cached": False,
         "request_id": request_id,
     }
+    _store_result(config, store_key, "explain_region", index.version, result)
+    return result
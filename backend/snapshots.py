@@ -0,0 +1,167 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SNAPSHOTS_DIRNAME = "snapshots"
+CURRENT_FILENAME = "CURRENT"
+DEFAULT_KEEP_SNAPSHOTS = 3
+
+
+def snapshots_dir(db_root: Path) -> Path:
+    return Path(db_root) / SNAPSHOTS_DIRNAME
+
+
+def snapshot_path(db_root: Path, version: str) -> Path:
+    return snapshots_dir(db_root) / version
+
+
+def current_snapshot(db_root: Path) -> Optional[str]:
+    pointer = Path(db_root) / CURRENT_FILENAME
+    try:
+        name = pointer.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    if not name or not snapshot_path(db_root, name).is_dir():
+        return None
+    return name
+
+
+def resolve_index_dir(db_root: Path) -> Path:
+    # Indexes built before snapshots existed live directly in the root directory.
+    name = current_snapshot(db_root)
+    if name is None:
+        return Path(db_root)
+    return snapshot_path(db_root, name)
+
+
+def list_snapshots(db_root: Path) -> List[str]:
+    root = snapshots_dir(db_root)
+    if not root.is_dir():
+        return []
+    # Versions start with a UTC timestamp, so name order is build order.
+    return sorted(path.name for path in root.iterdir() if path.is_dir())
+
+
+def publish_snapshot(db_root: Path, version: str) -> None:
+    if not snapshot_path(db_root, version).is_dir():
+        raise FileNotFoundError(f"Snapshot not found: {version}")
+
+    pointer = Path(db_root) / CURRENT_FILENAME
+    staging = pointer.with_name(f"{CURRENT_FILENAME}.{os.getpid()}.tmp")
+    with staging.open("w", encoding="utf-8") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, pointer)
+
+
+def prune_snapshots(db_root: Path, keep: int = DEFAULT_KEEP_SNAPSHOTS) -> List[str]:
+    current = current_snapshot(db_root)
+    names = list_snapshots(db_root)
+    # The newest `keep` snapshots stay for rollback; the published one is never removed.
+    removable = [name for name in names[: max(len(names) - keep, 0)] if name != current]
+    for name in removable:
+        shutil.rmtree(snapshot_path(db_root, name), ignore_errors=True)
+    return removable
+
+
+def rollback_snapshot(db_root: Path, version: Optional[str] = None) -> str:
+    names = list_snapshots(db_root)
+    if version is None:
+        current = current_snapshot(db_root)
+        older = [name for name in names if current is None or name < current]
+        if not older:
+            raise ValueError("No older snapshot to roll back to.")
+        version = older[-1]
+    elif version not in names:
+        raise ValueError(f"Unknown snapshot: {version}")
+
+    publish_snapshot(db_root, version)
+    return version
+
+
+class SnapshotReloader:
+    def __init__(
+        self,
+        db_root: Path,
+        loader: Callable[[Path], Any],
+        check_interval: float = 5.0,
+    ) -> None:
+        self._db_root = Path(db_root)
+        self._loader = loader
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._active_dir: Optional[Path] = None
+        self._active: Any = None
+        self._loading: Optional[Path] = None
+        self._last_check = 0.0
+        self._stats: Dict[str, Any] = {"reloads": 0, "failed_reloads": 0, "last_error": ""}
+
+    def current(self) -> Any:
+        with self._lock:
+            if self._active is None:
+                target = resolve_index_dir(self._db_root)
+                self._active = self._loader(target)
+                self._active_dir = target
+                self._last_check = time.monotonic()
+                return self._active
+
+            now = time.monotonic()
+            if self._loading is None and now - self._last_check >= self._check_interval:
+                self._last_check = now
+                target = resolve_index_dir(self._db_root)
+                if target != self._active_dir:
+                    self._loading = target
+                    threading.Thread(target=self._load, args=(target,), daemon=True).start()
+            # In-flight requests keep whatever index they already hold; new ones see the swap.
+            return self._active
+
+    def _load(self, target: Path) -> None:
+        try:
+            loaded = self._loader(target)
+        except Exception as exc:
+            with self._lock:
+                self._loading = None
+                self._stats["failed_reloads"] += 1
+                self._stats["last_error"] = str(exc)
+            return
+
+        with self._lock:
+            self._active = loaded
+            self._active_dir = target
+            self._loading = None
+            self._stats["reloads"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active_dir": str(self._active_dir) if self._active_dir else None,
+                "loading": str(self._loading) if self._loading else None,
+                **self._stats,
+            }
+
+
+_RELOADERS: Dict[str, SnapshotReloader] = {}
+_RELOADERS_LOCK = threading.Lock()
+
+
+def get_snapshot_reloader(
+    db_root: str,
+    loader: Callable[[Path], Any],
+    check_interval: float = 5.0,
+) -> SnapshotReloader:
+    with _RELOADERS_LOCK:
+        reloader = _RELOADERS.get(db_root)
+        if reloader is None:
+            reloader = SnapshotReloader(Path(db_root), loader, check_interval=check_interval)
+            _RELOADERS[db_root] = reloader
+        return reloader
+
+
+def snapshot_stats() -> Dict[str, Any]:
+    with _RELOADERS_LOCK:
+        reloaders = dict(_RELOADERS)
+    return {root: reloader.stats() for root, reloader in reloaders.items()}
@@ -0,0 +1,156 @@
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+SYMBOL_INDEX_FILENAME = "symbol_index.json"
+
+_KEY_NAMES = r"(?:SPC|RET|TAB|DEL|ESC|<[A-Za-z0-9-]+>|[^\s])"
+# A stroke must end its token, so "s-expression" or "C-language" is not read as a key.
+_KEY_STROKE = rf"(?:[CMsHSA]-)+{_KEY_NAMES}(?![\w-])"
+KEY_SEQUENCE_RE = re.compile(
+    rf"(?<![\w-])({_KEY_STROKE}(?:\s+(?:{_KEY_STROKE}|[^\s](?=[\s.,;:)?!]|$)))*)"
+)
+QUOTED_SYMBOL_RE = re.compile(r"[`‘']([A-Za-z][\w*+!?<>/:=-]*)['’`]")
+# Emacs names are nearly always hyphenated (find-file, inhibit-startup-message).
+ELISP_SYMBOL_RE = re.compile(r"(?<![\w-])([a-z][a-z0-9+*!?]*(?:-[a-z0-9+*!?]+)+)(?![\w-])")
+
+# Hyphenated English words that would otherwise look like Emacs symbols.
+COMMON_WORDS = {
+    "built-in",
+    "so-called",
+    "non-commercial",
+    "read-only",
+    "e-mail",
+    "right-hand",
+    "left-hand",
+    "up-to-date",
+    "well-known",
+    "first-time",
+    "plain-language",
+    "step-by-step",
+    "line-by-line",
+    "block-by-block",
+}
+
+# Terms appearing in more chunks than this are too generic to act as an exact lookup.
+MAX_CHUNKS_PER_TERM = 25
+
+# How the manuals and Lisp sources introduce a name: "C-x C-f ... (find-file)",
+# "M-x find-file", "Command: find-file", "(defun find-file".
+_DEFINITION_PATTERNS = (
+    "({term})",
+    "M-x {term}",
+    "Command: {term}",
+    "Function: {term}",
+    "Special Form: {term}",
+    "Macro: {term}",
+    "Variable: {term}",
+    "User Option: {term}",
+    "(defun {term} ",
+    "(defmacro {term} ",
+    "(defvar {term} ",
+    "(defcustom {term} ",
+)
+
+
+def normalize_key_sequence(keys: str) -> str:
+    return " ".join(keys.split())
+
+
+def extract_terms(text: str) -> List[str]:
+    found: List[Tuple[int, str]] = []
+    for match in KEY_SEQUENCE_RE.finditer(text):
+        found.append((match.start(1), normalize_key_sequence(match.group(1))))
+    for match in QUOTED_SYMBOL_RE.finditer(text):
+        found.append((match.start(1), match.group(1)))
+    for match in ELISP_SYMBOL_RE.finditer(text):
+        # Predicates may end in "?" or "!", but in prose that is usually sentence punctuation.
+        term = match.group(1).rstrip("?!")
+        if term not in COMMON_WORDS:
+            found.append((match.start(1), term))
+
+    seen = set()
+    unique = []
+    for _, term in sorted(found, key=lambda item: item[0]):
+        if term not in seen:
+            seen.add(term)
+            unique.append(term)
+    return unique
+
+
+def defines_term(term: str, text: str) -> bool:
+    # Key sequences cannot be mistaken for English, so any mention counts.
+    if KEY_SEQUENCE_RE.fullmatch(term):
+        return True
+    return any(pattern.format(term=term) in text for pattern in _DEFINITION_PATTERNS)
+
+
+def _term_weight(term: str, text: str) -> int:
+    weight = text.count(term)
+    if defines_term(term, text):
+        weight += 10
+    return weight
+
+
+def build_symbol_index(chunks: Iterable[Tuple[str, str]]) -> Dict[str, List[str]]:
+    # chunks yields (chunk_id, text); ids are ordered with defining chunks first.
+    occurrences: Dict[str, Counter] = {}
+    defined = set()
+    for chunk_id, text in chunks:
+        for term in extract_terms(text):
+            occurrences.setdefault(term, Counter())[chunk_id] += _term_weight(term, text)
+            if term not in defined and defines_term(term, text):
+                defined.add(term)
+
+    # Only names some chunk actually defines are exact lookups; a word like
+    # "case-insensitive" is left to similarity search.
+    index: Dict[str, List[str]] = {}
+    for term, counts in occurrences.items():
+        if term not in defined or len(counts) > MAX_CHUNKS_PER_TERM:
+            continue
+        index[term] = [chunk_id for chunk_id, _ in counts.most_common()]
+    return index
+
+
+def write_symbol_index(index: Dict[str, List[str]], db_dir: Path) -> Path:
+    path = Path(db_dir) / SYMBOL_INDEX_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_symbol_index(db_dir: Path) -> Dict[str, List[str]]:
+    path = Path(db_dir) / SYMBOL_INDEX_FILENAME
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def lookup_chunk_ids(query: str, index: Dict[str, List[str]], limit: int) -> List[str]:
+    if not index:
+        return []
+
+    matched = [term for term in extract_terms(query) if term in index]
+    if not matched:
+        return []
+
+    # Interleave terms so a multi-symbol question gets each term's best chunk first.
+    chunk_ids: List[str] = []
+    depth = 0
+    while len(chunk_ids) < limit:
+        progressed = False
+        for term in matched:
+            ids = index[term]
+            if depth < len(ids):
+                progressed = True
+                if ids[depth] not in chunk_ids:
+                    chunk_ids.append(ids[depth])
+                    if len(chunk_ids) >= limit:
+                        break
+        if not progressed:
+            break
+        depth += 1
+    return chunk_ids
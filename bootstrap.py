@@ -1,6 +1,22 @@
 import argparse
+import json
+import queue
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import sync_models
+import sync_sources
+
+STAGES = ("models", "download", "parse", "embed")
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_PARSE_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+_DONE = object()
 
 
 def run_step(cmd: list[str]) -> None:
@@ -8,6 +24,231 @@ def run_step(cmd: list[str]) -> None:
     subprocess.run(cmd, check=True)
 
 
+class StageStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, items: int = 1) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.items += items
+                self.busy += finished - started
+                self.started = started if self.started is None else min(self.started, started)
+                self.finished = finished if self.finished is None else max(self.finished, finished)
+
+
+def format_stage_report(stages: Dict[str, StageStats], origin: float, total: float) -> str:
+    lines = [f"{'stage':<10} {'items':>7} {'busy_s':>8} {'start_s':>8} {'end_s':>8}"]
+    for stats in stages.values():
+        if stats.started is None:
+            lines.append(f"{stats.name:<10} {stats.items:>7} {'-':>8} {'-':>8} {'-':>8}")
+            continue
+        lines.append(
+            f"{stats.name:<10} {stats.items:>7} {stats.busy:>8.1f} "
+            f"{stats.started - origin:>8.1f} {stats.finished - origin:>8.1f}"
+        )
+    busy = sum(stats.busy for stats in stages.values())
+    lines.append(f"Wall clock {total:.1f}s (stages busy for {busy:.1f}s in total).")
+    return "\n".join(lines)
+
+
+def run_pipeline(
+    sources: List[dict],
+    models: List[dict],
+    fetch_source: Callable[[dict], None],
+    fetch_model: Callable[[dict], str],
+    parse: Optional[Callable[[dict], List[list]]] = None,
+    open_embedder: Optional[Callable[[], Callable[[list], None]]] = None,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Dict[str, StageStats]:
+    stages = {name: StageStats(name) for name in STAGES}
+    # Bounded queues keep a fast stage from holding every parsed source in memory.
+    parse_queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+    embed_queue: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+    errors: List[BaseException] = []
+    parse_workers = max(parse_workers, 1) if parse else 0
+
+    def models_stage() -> None:
+        try:
+            for entry in models:
+                with stages["models"].track():
+                    message = fetch_model(entry)
+                print(f"[models] {message}")
+        except Exception as exc:
+            errors.append(exc)
+
+    def download_one(entry: dict) -> dict:
+        with stages["download"].track():
+            fetch_source(entry)
+        return entry
+
+    def download_stage() -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=max(download_workers, 1)) as pool:
+                futures = [pool.submit(download_one, entry) for entry in sources]
+                # Each source moves on to parsing as soon as its own download finishes.
+                for future in as_completed(futures):
+                    entry = future.result()
+                    print(f"[download] Ready: {entry['filename']}")
+                    if parse_workers:
+                        parse_queue.put(entry)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            for _ in range(parse_workers):
+                parse_queue.put(_DONE)
+
+    def parse_stage() -> None:
+        try:
+            while True:
+                entry = parse_queue.get()
+                if entry is _DONE:
+                    return
+                with stages["parse"].track():
+                    batches = parse(entry)
+                print(f"[parse] {entry['id']}: {sum(len(batch) for batch in batches)} chunks")
+                for batch in batches:
+                    embed_queue.put(batch)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            embed_queue.put(_DONE)
+
+    threads = [
+        threading.Thread(target=models_stage, daemon=True),
+        threading.Thread(target=download_stage, daemon=True),
+    ]
+    threads += [threading.Thread(target=parse_stage, daemon=True) for _ in range(parse_workers)]
+    for thread in threads:
+        thread.start()
+
+    # Embedding stays on the calling thread; loading its model overlaps the first downloads.
+    if parse_workers:
+        with stages["embed"].track(items=0):
+            embed = open_embedder()
+    remaining = parse_workers
+    while remaining and not errors:
+        batch = embed_queue.get()
+        if batch is _DONE:
+            remaining -= 1
+            continue
+        with stages["embed"].track(items=len(batch)):
+            embed(batch)
+        print(f"[embed] {stages['embed'].items} chunks embedded")
+
+    for thread in threads:
+        while thread.is_alive() and not errors:
+            thread.join(0.1)
+    if errors:
+        raise errors[0]
+    return stages
+
+
+def _selected(catalog: list, include: Callable[[dict], bool], validate) -> list:
+    selected = []
+    for entry in catalog:
+        validate(entry)
+        if include(entry):
+            selected.append(entry)
+    return selected
+
+
+class _IndexingStages:
+    def __init__(self, resources: Dict[str, dict]) -> None:
+        # prepare_data pulls in langchain, so it is only imported when the index is rebuilt.
+        import prepare_data
+
+        self._prepare_data = prepare_data
+        self._resources = resources
+        self._builder = None
+
+    def parse(self, entry: dict) -> List[list]:
+        docs = self._prepare_data.load_resource(self._resources[entry["id"]])
+        chunks = self._prepare_data.chunk_documents(docs)
+        return list(self._prepare_data.batched(chunks, self._prepare_data.ADD_BATCH_SIZE))
+
+    def open_embedder(self) -> Callable[[list], None]:
+        self._builder = self._prepare_data.SnapshotBuilder(self._prepare_data.DEFAULT_DB_DIR)
+        return self._builder.add_chunks
+
+    def publish(self, manifest: List[dict]) -> None:
+        published = self._builder.publish(manifest)
+        self._prepare_data.report_build(self._builder, published, len(manifest), dedup=True)
+
+
+def run_pipelined(args: argparse.Namespace) -> None:
+    origin = time.perf_counter()
+    sources = _selected(
+        sync_sources.load_catalog(sync_sources.DEFAULT_CATALOG),
+        lambda entry: sync_sources.should_include(entry, args.include_noncommercial, False),
+        sync_sources.validate_entry,
+    )
+    if not sources:
+        raise ValueError("No sources selected. Adjust flags or catalog settings.")
+    models = []
+    if not args.skip_models:
+        models = _selected(
+            sync_models.load_catalog(sync_models.DEFAULT_CATALOG),
+            lambda entry: sync_models.should_include(entry, False),
+            sync_models.validate_entry,
+        )
+
+    source_dir = sync_sources.DEFAULT_SOURCE_DIR
+    manifest = sync_sources.build_manifest_entries(sources, source_dir)
+    resources = {resource["id"]: resource for resource in manifest}
+    indexing = None if args.skip_index else _IndexingStages(resources)
+
+    stages = run_pipeline(
+        sources,
+        models,
+        fetch_source=lambda entry: sync_sources.download(
+            entry["url"], source_dir / entry["filename"]
+        ),
+        fetch_model=lambda entry: sync_models.sync_model(entry, sync_models.DEFAULT_MODEL_DIR),
+        parse=indexing.parse if indexing else None,
+        open_embedder=indexing.open_embedder if indexing else None,
+        download_workers=args.download_workers,
+        parse_workers=args.parse_workers,
+        queue_size=args.queue_size,
+    )
+
+    sync_sources.DEFAULT_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    sync_sources.DEFAULT_MANIFEST.write_text(
+        json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+    )
+    print(f"Wrote manifest with {len(manifest)} sources to {sync_sources.DEFAULT_MANIFEST}")
+    if indexing is not None:
+        indexing.publish(manifest)
+
+    print(format_stage_report(stages, origin, time.perf_counter() - origin))
+
+
+def run_sequential(args: argparse.Namespace) -> None:
+    sync_sources_cmd = [sys.executable, "sync_sources.py"]
+    if args.include_noncommercial:
+        sync_sources_cmd.append("--include-noncommercial")
+
+    run_step(sync_sources_cmd)
+
+    if not args.skip_models:
+        run_step([sys.executable, "sync_models.py"])
+
+    if not args.skip_index:
+        run_step([sys.executable, "prepare_data.py"])
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Bootstrap local Emacs assistant setup.")
     parser.add_argument(
@@ -25,19 +266,43 @@ def main() -> None:
         action="store_true",
         help="Skip vector index rebuild step.",
     )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run sync_sources.py, sync_models.py and prepare_data.py one after another.",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help="Sources downloaded in parallel.",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="Sources parsed and chunked in parallel.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Items buffered between pipeline stages.",
+    )
+    parser.add_argument(
+        "--warm-answers",
+        action="store_true",
+        help="Precompute answers for frequent questions (needs the model provider running).",
+    )
     args = parser.parse_args()
 
-    sync_sources_cmd = [sys.executable, "sync_sources.py"]
-    if args.include_noncommercial:
-        sync_sources_cmd.append("--include-noncommercial")
-
-    run_step(sync_sources_cmd)
-
-    if not args.skip_models:
-        run_step([sys.executable, "sync_models.py"])
+    if args.sequential:
+        run_sequential(args)
+    else:
+        run_pipelined(args)
 
-    if not args.skip_index:
-        run_step([sys.executable, "prepare_data.py"])
+    if args.warm_answers:
+        run_step([sys.executable, "warm_answers.py", "resources/warm_questions.json", "--from-log"])
 
     print("Bootstrap complete.")
 
@@ -33,6 +33,15 @@
       (string-to-number (match-string 1))
     0))
 
+(defun emacs-explained-http--parse-response (buffer)
+  "Return parsed JSON body from response BUFFER, signaling on HTTP errors."
+  (with-current-buffer buffer
+    (let ((status (emacs-explained-http--status-code))
+          (body (emacs-explained-http--decode-json-body)))
+      (when (>= status 400)
+        (error "Emacs Explained API error (HTTP %d): %S" status body))
+      body)))
+
 (defun emacs-explained-http-post (endpoint payload)
   "POST PAYLOAD JSON to ENDPOINT and return parsed response object."
   (let* ((url-request-method "POST")
@@ -46,14 +55,38 @@
     (unless buffer
       (error "No response from Emacs Explained API"))
     (unwind-protect
-        (with-current-buffer buffer
-          (let ((status (emacs-explained-http--status-code))
-                (body (emacs-explained-http--decode-json-body)))
-            (when (>= status 400)
-              (error "Emacs Explained API error (HTTP %d): %S" status body))
-            body))
+        (emacs-explained-http--parse-response buffer)
       (kill-buffer buffer))))
 
+(defun emacs-explained-http-post-async (endpoint payload callback &optional errback)
+  "POST PAYLOAD JSON to ENDPOINT without blocking Emacs.
+CALLBACK is called with the parsed response object.  ERRBACK, when
+non-nil, is called with an error message string instead of reporting
+the error in the echo area.  Return the response buffer; deleting its
+process aborts the request."
+  (let ((url-request-method "POST")
+        (url-request-extra-headers '(("Content-Type" . "application/json")))
+        (url-request-data (encode-coding-string (json-encode payload) 'utf-8)))
+    (url-retrieve
+     (emacs-explained-http--endpoint-url endpoint)
+     (lambda (_status)
+       (let ((buffer (current-buffer))
+             (result nil)
+             (failure nil))
+         (condition-case err
+             (setq result (emacs-explained-http--parse-response buffer))
+           (error (setq failure (error-message-string err))))
+         (kill-buffer buffer)
+         (cond
+          (failure
+           (if errback
+               (funcall errback failure)
+             (message "Emacs Explained: %s" failure)))
+          (t (funcall callback result)))))
+     nil
+     t
+     t)))
+
 (defun emacs-explained-http-get (endpoint)
   "GET ENDPOINT and return parsed response object."
   (let* ((url-request-method "GET")
@@ -67,12 +100,7 @@
     (unless buffer
       (error "No response from Emacs Explained API"))
     (unwind-protect
-        (with-current-buffer buffer
-          (let ((status (emacs-explained-http--status-code))
-                (body (emacs-explained-http--decode-json-body)))
-            (when (>= status 400)
-              (error "Emacs Explained API error (HTTP %d): %S" status body))
-            body))
+        (emacs-explained-http--parse-response buffer)
       (kill-buffer buffer))))
 
 (provide 'emacs-explained-http)
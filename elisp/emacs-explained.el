@@ -10,6 +10,7 @@
 
 ;;; Code:
 
+(require 'seq)
 (require 'subr-x)
 (require 'thingatpt)
 (require 'emacs-explained-http)
@@ -45,6 +46,90 @@
   :type 'integer
   :group 'emacs-explained)
 
+;;;###autoload
+(defcustom emacs-explained-async t
+  "When non-nil, send requests in the background instead of blocking Emacs.
+Use `emacs-explained-cancel' to abandon a request that is taking too long."
+  :type 'boolean
+  :group 'emacs-explained)
+
+;;;###autoload
+(defcustom emacs-explained-prefetch-idle-delay 2.0
+  "Idle seconds before `emacs-explained-prefetch-mode' prefetches at point."
+  :type 'number
+  :group 'emacs-explained)
+
+(defvar emacs-explained--pending nil
+  "In-flight requests as (REQUEST-ID BUFFER PROGRESS-TIMER TIMEOUT-TIMER).")
+
+(defun emacs-explained--new-request-id ()
+  "Return a fresh id the backend can use to cancel a request."
+  (md5 (format "%s-%s-%s" (emacs-pid) (float-time) (random))))
+
+(defun emacs-explained--finish (request-id)
+  "Forget REQUEST-ID and stop its progress indicator and timeout."
+  (let ((entry (assoc request-id emacs-explained--pending)))
+    (when entry
+      (cancel-timer (nth 2 entry))
+      (cancel-timer (nth 3 entry))
+      (setq emacs-explained--pending (delq entry emacs-explained--pending)))
+    entry))
+
+(defun emacs-explained--cancel-request (request-id &optional reason)
+  "Abort REQUEST-ID locally and ask the backend to stop it.
+REASON is shown in the echo area and defaults to \"cancelled\"."
+  (let ((entry (emacs-explained--finish request-id)))
+    (when entry
+      (let* ((buffer (nth 1 entry))
+             (process (and (buffer-live-p buffer) (get-buffer-process buffer))))
+        (when process
+          (delete-process process))
+        (when (buffer-live-p buffer)
+          (kill-buffer buffer)))
+      (emacs-explained-http-post-async
+       (concat "/cancel/" (url-hexify-string request-id)) nil #'ignore #'ignore)
+      (message "Emacs Explained: request %s" (or reason "cancelled")))))
+
+(defun emacs-explained--request (endpoint payload title)
+  "Send PAYLOAD to ENDPOINT and show the result under TITLE.
+Return the request id when the request is sent asynchronously."
+  (if (not emacs-explained-async)
+      (emacs-explained-ui-show-result title (emacs-explained-http-post endpoint payload))
+    (let* ((request-id (emacs-explained--new-request-id))
+           (reporter (make-progress-reporter (format "Emacs Explained: %s " title)))
+           (buffer (emacs-explained-http-post-async
+                    endpoint
+                    (cons (cons 'request_id request-id) payload)
+                    (lambda (result)
+                      (when (emacs-explained--finish request-id)
+                        (progress-reporter-done reporter)
+                        (emacs-explained-ui-show-result title result)))
+                    (lambda (error-message)
+                      (when (emacs-explained--finish request-id)
+                        (message "Emacs Explained: %s" error-message))))))
+      (push (list request-id
+                  buffer
+                  (run-with-timer 0.2 0.2 #'progress-reporter-update reporter)
+                  (run-with-timer emacs-explained-http-timeout nil
+                                  #'emacs-explained--cancel-request
+                                  request-id
+                                  "timed out"))
+            emacs-explained--pending)
+      request-id)))
+
+;;;###autoload
+(defun emacs-explained-cancel ()
+  "Cancel all in-flight Emacs Explained requests."
+  (interactive)
+  (if (null emacs-explained--pending)
+      (message "Emacs Explained: nothing to cancel")
+    (dolist (entry (copy-sequence emacs-explained--pending))
+      (emacs-explained--cancel-request (car entry)))))
+
+(defun emacs-explained--symbol-question (symbol-name)
+  "Return the question asked about SYMBOL-NAME."
+  (format "Explain what `%s` does in Emacs Lisp and when to use it." symbol-name))
+
 (defun emacs-explained--read-skill-level ()
   "Prompt for skill level using current default as initial input."
   (completing-read
@@ -64,13 +149,11 @@
     (read-string "Ask Emacs Explained: ")
     (emacs-explained--read-skill-level)))
   (unless (string-empty-p question)
-    (let ((result (emacs-explained-http-post
-                   "/ask"
-                   `((question . ,question)
-                     (skill_level . ,skill-level)))))
-      (emacs-explained-ui-show-result
-       (format "Question: %s" question)
-       result))))
+    (emacs-explained--request
+     "/ask"
+     `((question . ,question)
+       (skill_level . ,skill-level))
+     (format "Question: %s" question))))
 
 ;;;###autoload
 (defun emacs-explained-explain-region (start end skill-level)
@@ -79,15 +162,15 @@
    (if (use-region-p)
        (list (region-beginning) (region-end) (emacs-explained--read-skill-level))
      (user-error "Select a region first")))
-  (let* ((code (buffer-substring-no-properties start end))
-         (mode (symbol-name major-mode))
-         (result (emacs-explained-http-post
-                  "/explain-region"
-                  `((code . ,code)
-                    (language . ,mode)
-                    (context . "")
-                    (skill_level . ,skill-level)))))
-    (emacs-explained-ui-show-result "Explain Region" result)))
+  (let ((code (buffer-substring-no-properties start end))
+        (mode (symbol-name major-mode)))
+    (emacs-explained--request
+     "/explain-region"
+     `((code . ,code)
+       (language . ,mode)
+       (context . "")
+       (skill_level . ,skill-level))
+     "Explain Region")))
 
 ;;;###autoload
 (defun emacs-explained-explain-defun (skill-level)
@@ -105,9 +188,77 @@
   (let ((symbol-name (thing-at-point 'symbol t)))
     (unless symbol-name
       (user-error "No symbol at point"))
-    (emacs-explained-ask
-     (format "Explain what `%s` does in Emacs Lisp and when to use it." symbol-name)
-     skill-level)))
+    (emacs-explained-ask (emacs-explained--symbol-question symbol-name) skill-level)))
+
+(defvar emacs-explained--prefetch-timer nil
+  "Idle timer driving `emacs-explained-prefetch-mode'.")
+
+(defvar emacs-explained--prefetch-in-flight nil
+  "Non-nil while a background prefetch request is outstanding.")
+
+(defvar emacs-explained--prefetched (make-hash-table :test 'equal)
+  "Payloads already prefetched during this session.")
+
+(defun emacs-explained--prefetch (candidates)
+  "Ask the backend to compute the first of CANDIDATES in the background.
+Each candidate is (ENDPOINT . PAYLOAD).  The answer lands in the backend
+cache, so the explicit command returns instantly.  The backend defers or
+drops this work under interactive load; a candidate is only remembered
+once it succeeds, so a declined (503) or preempted (499) prefetch is
+tried again on a later idle tick."
+  (let ((key (seq-find (lambda (candidate)
+                         (not (gethash candidate emacs-explained--prefetched)))
+                       candidates)))
+    (when (and key (not emacs-explained--prefetch-in-flight))
+      (setq emacs-explained--prefetch-in-flight t)
+      (emacs-explained-http-post-async
+       (car key)
+       (cons '(priority . "background") (cdr key))
+       (lambda (_result)
+         (setq emacs-explained--prefetch-in-flight nil)
+         (when (> (hash-table-count emacs-explained--prefetched) 500)
+           (clrhash emacs-explained--prefetched))
+         (puthash key t emacs-explained--prefetched))
+       (lambda (&rest _)
+         (setq emacs-explained--prefetch-in-flight nil))))))
+
+(defun emacs-explained--prefetch-at-point ()
+  "Prefetch explanations for the defun and symbol at point.
+The defun goes first; the symbol follows on the next idle tick."
+  (when (and (derived-mode-p 'emacs-lisp-mode 'lisp-interaction-mode)
+             (not (use-region-p)))
+    (let ((symbol-name (thing-at-point 'symbol t))
+          (bounds (bounds-of-thing-at-point 'defun))
+          (candidates nil))
+      (when symbol-name
+        (push (cons "/ask"
+                    `((question . ,(emacs-explained--symbol-question symbol-name))
+                      (skill_level . ,emacs-explained-skill-level)))
+              candidates))
+      (when bounds
+        (push (cons "/explain-region"
+                    `((code . ,(buffer-substring-no-properties (car bounds) (cdr bounds)))
+                      (language . ,(symbol-name major-mode))
+                      (context . "")
+                      (skill_level . ,emacs-explained-skill-level)))
+              candidates))
+      (emacs-explained--prefetch candidates))))
+
+;;;###autoload
+(define-minor-mode emacs-explained-prefetch-mode
+  "Prefetch explanations for the symbol or defun at point while Emacs is idle.
+Prefetches are sent at background priority, so they never slow down
+interactive questions."
+  :global t
+  :group 'emacs-explained
+  (when emacs-explained--prefetch-timer
+    (cancel-timer emacs-explained--prefetch-timer)
+    (setq emacs-explained--prefetch-timer nil))
+  (when emacs-explained-prefetch-mode
+    (setq emacs-explained--prefetch-timer
+          (run-with-idle-timer emacs-explained-prefetch-idle-delay
+                               t
+                               #'emacs-explained--prefetch-at-point))))
 
 (provide 'emacs-explained)
 ;;; emacs-explained.el ends here
@@ -1,16 +1,44 @@
 import argparse
+import hashlib
 import json
 import shutil
 from pathlib import Path
+from typing import Iterator, List, Optional
 
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from backend.chunking import chunk_pages
+from backend.config import AppConfig
+from backend.dedup import ALTERNATE_SOURCES_SEPARATOR, CrossSourceDeduplicator
+from backend.index_meta import (
+    check_embedding_meta,
+    load_index_meta,
+    new_index_version,
+    write_index_meta,
+)
+from backend.providers.factory import get_embedding_provider
+from backend.snapshots import (
+    CURRENT_FILENAME,
+    DEFAULT_KEEP_SNAPSHOTS,
+    SNAPSHOTS_DIRNAME,
+    prune_snapshots,
+    publish_snapshot,
+    resolve_index_dir,
+    rollback_snapshot,
+    snapshot_path,
+)
+from backend.symbols import build_symbol_index, write_symbol_index
+
 BASE_DIR = Path(__file__).parent
 DEFAULT_MANIFEST = BASE_DIR / "resources" / "resource_manifest.json"
 DEFAULT_DB_DIR = BASE_DIR / "emacs_db"
+DEFAULT_CHUNK_SIZE = 700
+DEFAULT_CHUNK_OVERLAP = 120
+DEFAULT_DEDUP_THRESHOLD = 0.85
+ADD_BATCH_SIZE = 256
 
 
 def load_manifest(manifest_path: Path) -> list:
@@ -43,13 +71,15 @@ def load_resource(resource: dict) -> list:
             "If this is a cataloged source, run `python3 sync_sources.py` first."
         )
 
-    if resource_type == "pdf" or full_path.suffix.lower() == ".pdf":
+    is_pdf = resource_type == "pdf" or full_path.suffix.lower() == ".pdf"
+    if is_pdf:
         loader = PyPDFLoader(str(full_path))
     else:
         loader = TextLoader(str(full_path), encoding="utf-8")
 
     docs = loader.load()
     for doc in docs:
+        doc.metadata["resource_type"] = "pdf" if is_pdf else "text"
         doc.metadata["resource_id"] = resource_id
         doc.metadata["resource_path"] = str(raw_path)
         doc.metadata["resource_description"] = resource.get("description", "")
@@ -57,7 +87,226 @@ def load_resource(resource: dict) -> list:
     return docs
 
 
-def build_index(manifest_path: Path, db_dir: Path, reset: bool = True) -> None:
+def chunk_documents(
+    docs: list,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+) -> list:
+    pdf_pages: dict = {}
+    text_docs = []
+    for doc in docs:
+        if doc.metadata.get("resource_type") == "pdf":
+            pdf_pages.setdefault(doc.metadata["resource_id"], []).append(doc)
+        else:
+            text_docs.append(doc)
+
+    chunks = []
+    # PDFs are chunked per resource so sections can flow across page breaks.
+    for pages in pdf_pages.values():
+        pages.sort(key=lambda page: page.metadata.get("page", 0))
+        base_metadata = {k: v for k, v in pages[0].metadata.items() if k != "page"}
+        for piece in chunk_pages(
+            [page.page_content for page in pages],
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            first_page=pages[0].metadata.get("page", 0),
+        ):
+            chunks.append(
+                Document(
+                    page_content=piece["text"],
+                    metadata={
+                        **base_metadata,
+                        "page": piece["page"],
+                        "section_title": piece["section_title"],
+                    },
+                )
+            )
+
+    if text_docs:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+        chunks.extend(splitter.split_documents(text_docs))
+
+    return chunks
+
+
+def _source_of(chunk) -> str:
+    return chunk.metadata.get("resource_path") or chunk.metadata.get("source", "")
+
+
+def _add_alternate_source(metadata: dict, source: str) -> None:
+    # Chroma metadata must be scalar, so alternates are stored as one joined string.
+    alternates = [
+        alt for alt in metadata.get("alternate_sources", "").split(ALTERNATE_SOURCES_SEPARATOR)
+        if alt
+    ]
+    if source not in alternates:
+        alternates.append(source)
+    metadata["alternate_sources"] = ALTERNATE_SOURCES_SEPARATOR.join(alternates)
+
+
+def chunk_id(chunk) -> str:
+    key = "\0".join(
+        [
+            str(chunk.metadata.get("resource_id", "")),
+            str(chunk.metadata.get("page", "")),
+            chunk.page_content,
+        ]
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class ChunkFilter:
+    def __init__(self, dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD) -> None:
+        self._dedup = (
+            CrossSourceDeduplicator(threshold=dedup_threshold)
+            if dedup_threshold is not None
+            else None
+        )
+        self._seen_ids: set = set()
+        self.kept: list = []
+        self.ids: List[str] = []
+        # Positions in `kept` whose chunk gained an alternate source.
+        self.touched: set = set()
+        self.seen = 0
+        self.removed = 0
+
+    def add(self, chunk, cid: Optional[str] = None) -> bool:
+        self.seen += 1
+        cid = cid or chunk_id(chunk)
+        # Identical chunks share an id, so keep only the first occurrence.
+        if cid in self._seen_ids:
+            return False
+
+        source = _source_of(chunk)
+        canonical = None
+        if self._dedup is not None:
+            canonical = self._dedup.check(len(self.kept), chunk.page_content, source)
+        if canonical is not None:
+            self.removed += 1
+            _add_alternate_source(self.kept[canonical].metadata, source)
+            self.touched.add(canonical)
+            return False
+
+        self._seen_ids.add(cid)
+        self.kept.append(chunk)
+        self.ids.append(cid)
+        return True
+
+
+class SnapshotBuilder:
+    def __init__(
+        self,
+        db_dir: Path,
+        reset: bool = True,
+        dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+    ) -> None:
+        # Each build writes a fresh snapshot so a running API never sees a half-written index.
+        self.db_dir = Path(db_dir)
+        self.version = new_index_version()
+        self.snapshot_dir = snapshot_path(self.db_dir, self.version)
+        self._base_dir = resolve_index_dir(self.db_dir)
+
+        config = AppConfig.from_env()
+        if not reset and self._base_dir.is_dir():
+            check_embedding_meta(load_index_meta(self._base_dir), config.embedding_model)
+            shutil.copytree(
+                self._base_dir,
+                self.snapshot_dir,
+                ignore=shutil.ignore_patterns(SNAPSHOTS_DIRNAME, CURRENT_FILENAME),
+            )
+
+        # Indexing and serving share one factory so query vectors match the stored ones.
+        self.embeddings = get_embedding_provider(config)
+        self._vectorstore = Chroma(
+            persist_directory=str(self.snapshot_dir), embedding_function=self.embeddings
+        )
+        self._filter = ChunkFilter(dedup_threshold)
+        if not reset:
+            # Chunks copied from the current snapshot take part in dedup like new ones.
+            existing = self._vectorstore.get(include=["documents", "metadatas"])
+            for cid, text, metadata in zip(
+                existing["ids"], existing["documents"], existing["metadatas"]
+            ):
+                self._filter.add(Document(page_content=text, metadata=metadata or {}), cid)
+        self._stored = len(self._filter.kept)
+        self._updated: set = set()
+
+    @property
+    def seen(self) -> int:
+        return self._filter.seen
+
+    @property
+    def removed(self) -> int:
+        return self._filter.removed
+
+    def add_chunks(self, chunks: list) -> int:
+        stored = self._stored
+        self._filter.touched.clear()
+        for chunk in chunks:
+            self._filter.add(chunk)
+
+        new_docs = self._filter.kept[stored:]
+        if new_docs:
+            self._vectorstore.add_documents(new_docs, ids=self._filter.ids[stored:])
+        self._stored = len(self._filter.kept)
+        # Already-stored chunks that gained an alternate source are rewritten once, at publish.
+        self._updated.update(idx for idx in self._filter.touched if idx < stored)
+        return len(new_docs)
+
+    def publish(self, resources: list, keep_snapshots: int = DEFAULT_KEEP_SNAPSHOTS) -> dict:
+        if self._updated:
+            indexes = sorted(self._updated)
+            self._vectorstore.update_documents(
+                [self._filter.ids[idx] for idx in indexes],
+                [self._filter.kept[idx] for idx in indexes],
+            )
+            self._updated.clear()
+
+        # Copied chunks are in the filter too, so this covers the whole snapshot.
+        symbol_index = build_symbol_index(
+            (cid, chunk.page_content) for cid, chunk in zip(self._filter.ids, self._filter.kept)
+        )
+        write_symbol_index(symbol_index, self.snapshot_dir)
+        write_index_meta(
+            self.snapshot_dir,
+            {
+                "version": self.version,
+                "chunks": len(self._filter.kept),
+                "near_duplicates_removed": self.removed,
+                "embedding": {
+                    "provider": self.embeddings.name,
+                    "model": self.embeddings.model,
+                    "dimension": self.embeddings.dimension(),
+                },
+                "resources": [resource.get("id") for resource in resources],
+            },
+        )
+
+        publish_snapshot(self.db_dir, self.version)
+        return {
+            "version": self.version,
+            "chunks": len(self._filter.kept),
+            "symbols": len(symbol_index),
+            "pruned": prune_snapshots(self.db_dir, keep=keep_snapshots),
+        }
+
+
+def batched(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def build_index(
+    manifest_path: Path,
+    db_dir: Path,
+    reset: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+    keep_snapshots: int = DEFAULT_KEEP_SNAPSHOTS,
+) -> None:
     resources = load_manifest(manifest_path)
 
     all_docs = []
@@ -67,20 +316,27 @@ def build_index(manifest_path: Path, db_dir: Path, reset: bool = True) -> None:
     if not all_docs:
         raise ValueError("No documents were loaded from the manifest.")
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=700, chunk_overlap=120)
-    chunks = splitter.split_documents(all_docs)
+    chunks = chunk_documents(all_docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    builder = SnapshotBuilder(db_dir, reset=reset, dedup_threshold=dedup_threshold)
+    for batch in batched(chunks, ADD_BATCH_SIZE):
+        builder.add_chunks(batch)
+    published = builder.publish(resources, keep_snapshots=keep_snapshots)
+    report_build(builder, published, len(resources), dedup_threshold is not None)
 
-    if reset and db_dir.exists():
-        shutil.rmtree(db_dir)
 
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        persist_directory=str(db_dir),
+def report_build(builder: SnapshotBuilder, published: dict, resources: int, dedup: bool) -> None:
+    print(
+        f"Indexed {published['chunks']} chunks from {resources} resources into "
+        f"{builder.snapshot_dir} (version {published['version']})."
     )
-
-    print(f"Indexed {len(chunks)} chunks from {len(resources)} resources into {db_dir}.")
+    if published["pruned"]:
+        print(f"Pruned {len(published['pruned'])} old snapshots.")
+    if dedup:
+        print(
+            f"Removed {builder.removed} near-duplicate chunks "
+            f"({builder.removed / max(builder.seen, 1):.1%} of {builder.seen})."
+        )
+    print(f"Indexed {published['symbols']} exact-match symbols and key sequences.")
 
 
 def main() -> None:
@@ -95,19 +351,64 @@ def main() -> None:
     parser.add_argument(
         "--db-dir",
         default=str(DEFAULT_DB_DIR),
-        help="Path to Chroma persist directory.",
+        help="Index root directory; snapshots are written under it.",
     )
     parser.add_argument(
         "--no-reset",
         action="store_true",
-        help="Do not delete the existing index before adding documents.",
+        help="Start from a copy of the current snapshot instead of an empty index.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Maximum characters per chunk.",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_CHUNK_OVERLAP,
+        help="Characters of trailing context repeated at the start of the next chunk.",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=DEFAULT_DEDUP_THRESHOLD,
+        help="Estimated Jaccard similarity at which chunks from different sources are merged.",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Keep near-duplicate chunks from different sources.",
+    )
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=DEFAULT_KEEP_SNAPSHOTS,
+        help="Number of index snapshots to keep for rollback.",
+    )
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="",
+        metavar="VERSION",
+        help="Point the index back at VERSION (default: the previous snapshot) and exit.",
     )
     args = parser.parse_args()
 
+    if args.rollback is not None:
+        version = rollback_snapshot(Path(args.db_dir), args.rollback or None)
+        print(f"Current index snapshot is now {version}.")
+        return
+
     build_index(
         manifest_path=Path(args.manifest),
         db_dir=Path(args.db_dir),
         reset=not args.no_reset,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+        keep_snapshots=max(args.keep_snapshots, 1),
     )
 
 
@@ -0,0 +1,95 @@
+import argparse
+import pstats
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from backend.profiling import PROFILE_SUFFIX
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_PROFILE_DIR = BASE_DIR / "data" / "profiles"
+SORT_KEYS = ("cumtime", "tottime", "calls", "profiles")
+
+
+def find_profiles(paths: List[Path]) -> List[Path]:
+    found: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found.extend(sorted(path.glob(f"*{PROFILE_SUFFIX}")))
+        elif path.exists():
+            found.append(path)
+    return found
+
+
+def function_label(key: Tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == "~":
+        # Built-ins have no source location.
+        return name
+    parts = Path(filename).parts
+    short = "/".join(parts[-2:]) if len(parts) > 1 else filename
+    return f"{short}:{line}({name})"
+
+
+def summarize_profiles(profile_paths: List[Path]) -> List[Dict[str, object]]:
+    totals: Dict[Tuple[str, int, str], Dict[str, object]] = {}
+    for path in profile_paths:
+        stats = pstats.Stats(str(path)).stats
+        for key, (_, calls, tottime, cumtime, _) in stats.items():
+            entry = totals.setdefault(
+                key,
+                {
+                    "function": function_label(key),
+                    "calls": 0,
+                    "tottime": 0.0,
+                    "cumtime": 0.0,
+                    "profiles": 0,
+                },
+            )
+            entry["calls"] += calls
+            entry["tottime"] += tottime
+            entry["cumtime"] += cumtime
+            entry["profiles"] += 1
+    return list(totals.values())
+
+
+def format_table(rows: List[Dict[str, object]]) -> str:
+    lines = [f"{'cumtime':>10} {'tottime':>10} {'calls':>10} {'profiles':>8}  function"]
+    for row in rows:
+        lines.append(
+            f"{row['cumtime']:>10.4f} {row['tottime']:>10.4f} {row['calls']:>10} "
+            f"{row['profiles']:>8}  {row['function']}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Summarize the hottest functions across captured request profiles."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(DEFAULT_PROFILE_DIR)],
+        help="Profile files or directories (default: data/profiles).",
+    )
+    parser.add_argument("--top", type=int, default=25, help="Number of functions to show.")
+    parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        default="cumtime",
+        help="Column to rank functions by.",
+    )
+    args = parser.parse_args()
+
+    profiles = find_profiles([Path(path) for path in args.paths])
+    if not profiles:
+        raise ValueError("No profiles found. Enable profiling with X-Profile or PROFILE_SAMPLE_RATE.")
+
+    rows = summarize_profiles(profiles)
+    rows.sort(key=lambda row: row[args.sort], reverse=True)
+    print(f"{len(profiles)} profiles, {len(rows)} functions")
+    print(format_table(rows[: args.top]))
+
+
+if __name__ == "__main__":
+    main()
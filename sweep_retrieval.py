@@ -0,0 +1,370 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_community.vectorstores import Chroma
+
+from backend.config import AppConfig
+from backend.dedup import ALTERNATE_SOURCES_SEPARATOR
+from backend.providers.base import EmbeddingProvider
+from backend.providers.factory import get_embedding_provider
+from backend.service import format_context, merge_retrieved, searches_on_symbol_hit
+from backend.symbols import build_symbol_index, lookup_chunk_ids
+from prepare_data import (
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_MANIFEST,
+    ChunkFilter,
+    chunk_documents,
+    load_manifest,
+    load_resource,
+)
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_EMBEDDING_CACHE = BASE_DIR / "data" / "cache" / "sweep_embeddings.sqlite3"
+# Rough chars-per-token ratio for English prose; good enough to compare settings.
+CHARS_PER_TOKEN = 4
+
+
+class CachedEmbeddings(EmbeddingProvider):
+    # Chunks that survive unchanged across grid points, and repeated runs, are embedded once.
+    def __init__(self, provider: EmbeddingProvider, path: Optional[Path]) -> None:
+        self._provider = provider
+        self._memory: Dict[str, List[float]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector TEXT)"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self._provider.name
+
+    @property
+    def model(self) -> str:
+        return self._provider.model
+
+    def _key(self, text: str) -> str:
+        raw = f"{self._provider.name}\0{self._provider.model}\0{text}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        if key in self._memory:
+            return self._memory[key]
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        vector = json.loads(row[0])
+        self._memory[key] = vector
+        return vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors = [self._lookup(key) for key in keys]
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            fresh = self._provider.embed([texts[idx] for idx in missing])
+            for idx, vector in zip(missing, fresh):
+                vectors[idx] = vector
+                self._memory[keys[idx]] = vector
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(keys[idx], json.dumps(vectors[idx])) for idx in missing],
+                )
+                self._conn.commit()
+        return vectors
+
+
+def load_golden_set(path: Path) -> List[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            items = [json.loads(line) for line in f if line.strip()]
+        else:
+            items = json.load(f)
+
+    golden = []
+    for item in items:
+        question = str(item.get("question", "")).strip()
+        expected = item.get("expected") or []
+        if not question or not expected:
+            raise ValueError(f"Golden entry needs a question and expected sources: {item}")
+        # A bare string is shorthand for a resource id or path.
+        golden.append(
+            {
+                "question": question,
+                "expected": [{"source": e} if isinstance(e, str) else e for e in expected],
+            }
+        )
+    return golden
+
+
+def matches(expected: Dict[str, Any], metadata: Dict[str, Any], text: str) -> bool:
+    if "source" in expected:
+        sources = {
+            metadata.get("resource_id"),
+            metadata.get("resource_path"),
+            metadata.get("source"),
+            *(metadata.get("alternate_sources") or "").split(ALTERNATE_SOURCES_SEPARATOR),
+        }
+        if expected["source"] not in sources:
+            return False
+    if "section" in expected:
+        if expected["section"].lower() not in str(metadata.get("section_title", "")).lower():
+            return False
+    if "contains" in expected:
+        if expected["contains"].lower() not in text.lower():
+            return False
+    return True
+
+
+def score_ranking(expected: List[Dict[str, Any]], docs: Sequence) -> Tuple[float, float]:
+    found = [False] * len(expected)
+    first_rank = 0
+    for rank, doc in enumerate(docs, start=1):
+        for idx, item in enumerate(expected):
+            if matches(item, doc.metadata, doc.page_content):
+                found[idx] = True
+                first_rank = first_rank or rank
+    recall = sum(found) / len(expected)
+    return recall, (1.0 / first_rank if first_rank else 0.0)
+
+
+def directory_bytes(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+def evaluate_setting(
+    docs: list,
+    golden: List[Dict[str, Any]],
+    embeddings: CachedEmbeddings,
+    chunk_size: int,
+    chunk_overlap: int,
+    ks: List[int],
+    dedup_threshold: Optional[float],
+    use_symbols: bool,
+    search_on_symbol_hit: bool = False,
+) -> List[Dict[str, Any]]:
+    # Same filtering as an index build, so the sweep measures what would be served.
+    chunk_filter = ChunkFilter(dedup_threshold)
+    for chunk in chunk_documents(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap):
+        chunk_filter.add(chunk)
+    ids, chunks = chunk_filter.ids, chunk_filter.kept
+    by_id = dict(zip(ids, chunks))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_started = time.perf_counter()
+        vectorstore = Chroma.from_documents(
+            documents=chunks,
+            embedding=embeddings,
+            ids=ids,
+            persist_directory=tmp,
+            collection_name=f"sweep_{chunk_size}_{chunk_overlap}",
+        )
+        build_seconds = time.perf_counter() - build_started
+        index_bytes = directory_bytes(Path(tmp))
+        symbol_index = build_symbol_index(
+            (cid, chunk.page_content) for cid, chunk in zip(ids, chunks)
+        )
+        query_vectors = embeddings.embed([item["question"] for item in golden])
+
+        rows = []
+        for k in ks:
+            recalls, reciprocal_ranks, latencies, tokens = [], [], [], []
+            for item, vector in zip(golden, query_vectors):
+                # Mirror the service: exact symbol hits skip similarity search unless the
+                # configured provider routes on its scores, in which case it fills the rest.
+                started = time.perf_counter()
+                symbol_ids = []
+                if use_symbols:
+                    symbol_ids = lookup_chunk_ids(
+                        item["question"], symbol_index, limit=max(k // 2, 1)
+                    )
+                retrieved = [by_id[cid] for cid in symbol_ids]
+                if not retrieved or search_on_symbol_hit:
+                    retrieved = merge_retrieved(
+                        retrieved, vectorstore.similarity_search_by_vector(vector, k=k), k
+                    )
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                recall, reciprocal_rank = score_ranking(item["expected"], retrieved)
+                recalls.append(recall)
+                reciprocal_ranks.append(reciprocal_rank)
+                tokens.append(len(format_context(retrieved)) / CHARS_PER_TOKEN)
+
+            rows.append(
+                {
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": chunk_overlap,
+                    "k": k,
+                    "chunks": len(chunks),
+                    "index_bytes": index_bytes,
+                    "build_seconds": round(build_seconds, 2),
+                    "recall_at_k": round(statistics.mean(recalls), 4),
+                    "mrr": round(statistics.mean(reciprocal_ranks), 4),
+                    "retrieval_ms_p50": round(statistics.median(latencies), 2),
+                    "retrieval_ms_max": round(max(latencies), 2),
+                    "context_tokens": round(statistics.mean(tokens), 1),
+                }
+            )
+        vectorstore.delete_collection()
+    return rows
+
+
+def pareto_front(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # A setting is dominated if another finds at least as much for no more context.
+    front = []
+    for row in rows:
+        dominated = any(
+            other["recall_at_k"] >= row["recall_at_k"]
+            and other["mrr"] >= row["mrr"]
+            and other["context_tokens"] <= row["context_tokens"]
+            and (
+                other["recall_at_k"] > row["recall_at_k"]
+                or other["mrr"] > row["mrr"]
+                or other["context_tokens"] < row["context_tokens"]
+            )
+            for other in rows
+        )
+        if not dominated:
+            front.append(row)
+    return sorted(front, key=lambda row: row["context_tokens"])
+
+
+def recommend(rows: List[Dict[str, Any]], min_recall: float) -> Optional[Dict[str, Any]]:
+    eligible = [row for row in rows if row["recall_at_k"] >= min_recall]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda row: (row["context_tokens"], row["retrieval_ms_p50"]))
+
+
+def format_table(rows: List[Dict[str, Any]], front: List[Dict[str, Any]]) -> str:
+    on_front = {id(row) for row in front}
+    lines = [
+        f"{'size':>5} {'overlap':>7} {'k':>3} {'chunks':>7} {'index_mb':>9} "
+        f"{'recall@k':>9} {'mrr':>6} {'ret_ms':>7} {'ctx_tok':>8}  pareto"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['chunk_size']:>5} {row['chunk_overlap']:>7} {row['k']:>3} {row['chunks']:>7} "
+            f"{row['index_bytes'] / 1e6:>9.2f} {row['recall_at_k']:>9.3f} {row['mrr']:>6.3f} "
+            f"{row['retrieval_ms_p50']:>7.2f} {row['context_tokens']:>8.0f}  "
+            f"{'*' if id(row) in on_front else ''}"
+        )
+    return "\n".join(lines)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure recall vs cost of chunking and retrieval_k settings on a golden set."
+    )
+    parser.add_argument("golden", help="Golden set JSON/JSONL of questions and expected sources.")
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST))
+    parser.add_argument("--chunk-sizes", type=_int_list, default=[400, 700, 1000])
+    parser.add_argument("--chunk-overlaps", type=_int_list, default=[60, 120])
+    parser.add_argument("--ks", type=_int_list, default=[2, 4, 6, 8])
+    parser.add_argument(
+        "--min-recall",
+        type=float,
+        default=0.9,
+        help="Recall@k the recommended setting must reach.",
+    )
+    parser.add_argument("--no-dedup", action="store_true", help="Skip near-duplicate removal.")
+    parser.add_argument(
+        "--no-symbols",
+        action="store_true",
+        help="Measure similarity search only, without the exact symbol lookup.",
+    )
+    parser.add_argument(
+        "--embedding-cache",
+        default=str(DEFAULT_EMBEDDING_CACHE),
+        help="SQLite file reused across runs; pass an empty string to disable.",
+    )
+    parser.add_argument("--format", choices=("table", "json"), default="table")
+    args = parser.parse_args()
+
+    golden = load_golden_set(Path(args.golden))
+    docs = []
+    # Sources are parsed once and re-chunked for every grid point.
+    for resource in load_manifest(Path(args.manifest)):
+        docs.extend(load_resource(resource))
+
+    config = AppConfig.from_env()
+    embeddings = CachedEmbeddings(
+        get_embedding_provider(config),
+        Path(args.embedding_cache) if args.embedding_cache else None,
+    )
+
+    rows: List[Dict[str, Any]] = []
+    for chunk_size in args.chunk_sizes:
+        for chunk_overlap in args.chunk_overlaps:
+            if chunk_overlap >= chunk_size:
+                continue
+            rows.extend(
+                evaluate_setting(
+                    docs,
+                    golden,
+                    embeddings,
+                    chunk_size,
+                    chunk_overlap,
+                    args.ks,
+                    None if args.no_dedup else DEFAULT_DEDUP_THRESHOLD,
+                    not args.no_symbols,
+                    searches_on_symbol_hit(config),
+                )
+            )
+            print(
+                f"Evaluated chunk_size={chunk_size} chunk_overlap={chunk_overlap}",
+                file=sys.stderr,
+            )
+
+    front = pareto_front(rows)
+    best = recommend(rows, args.min_recall)
+    if args.format == "json":
+        json.dump(
+            {
+                "questions": len(golden),
+                "embedding_cache": {"hits": embeddings.hits, "misses": embeddings.misses},
+                "results": rows,
+                "pareto": front,
+                "recommended": best,
+            },
+            sys.stdout,
+            indent=2,
+        )
+        print()
+        return
+
+    print(format_table(rows, front))
+    print(f"\nEmbedding cache: {embeddings.hits} hits, {embeddings.misses} misses")
+    if best is None:
+        print(f"No setting reached recall@k >= {args.min_recall}.")
+    else:
+        print(
+            f"Cheapest setting with recall@k >= {args.min_recall}: "
+            f"chunk_size={best['chunk_size']} chunk_overlap={best['chunk_overlap']} k={best['k']} "
+            f"(~{best['context_tokens']:.0f} context tokens, MRR {best['mrr']:.3f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import argparse
 import hashlib
 import json
+import os
+import shutil
 import urllib.request
 from pathlib import Path
 
@@ -43,8 +45,32 @@ def download(url: str, destination: Path, force: bool = False) -> None:
     if destination.exists() and not force:
         return
 
-    with urllib.request.urlopen(url) as response:
-        destination.write_bytes(response.read())
+    # Stream multi-gigabyte models to disk; the rename keeps a partial file from looking complete.
+    partial = destination.with_name(destination.name + ".part")
+    with urllib.request.urlopen(url) as response, partial.open("wb") as f:
+        shutil.copyfileobj(response, f, length=1024 * 1024)
+    os.replace(partial, destination)
+
+
+def sync_model(
+    entry: dict, model_dir: Path, force: bool = False, skip_checksum: bool = False
+) -> str:
+    filename = entry["filename"]
+    expected_sha = str(entry.get("sha256", "")).strip().lower()
+    file_path = model_dir / filename
+
+    download(entry["url"], file_path, force=force)
+
+    if expected_sha and not skip_checksum:
+        actual_sha = sha256_file(file_path)
+        if actual_sha != expected_sha:
+            raise ValueError(
+                f"Checksum mismatch for {filename}: expected {expected_sha}, got {actual_sha}"
+            )
+
+    if not expected_sha:
+        return f"Ready: {filename} (no sha256 configured)"
+    return f"Ready: {filename} (sha256 verified)"
 
 
 def main() -> None:
@@ -75,24 +101,7 @@ def main() -> None:
         raise ValueError("No models selected. Adjust flags or catalog settings.")
 
     for entry in selected:
-        filename = entry["filename"]
-        url = entry["url"]
-        expected_sha = str(entry.get("sha256", "")).strip().lower()
-        file_path = model_dir / filename
-
-        download(url, file_path, force=args.force)
-
-        if expected_sha and not args.skip_checksum:
-            actual_sha = sha256_file(file_path)
-            if actual_sha != expected_sha:
-                raise ValueError(
-                    f"Checksum mismatch for {filename}: expected {expected_sha}, got {actual_sha}"
-                )
-
-        if not expected_sha:
-            print(f"Ready: {filename} (no sha256 configured)")
-        else:
-            print(f"Ready: {filename} (sha256 verified)")
+        print(sync_model(entry, model_dir, force=args.force, skip_checksum=args.skip_checksum))
 
     print(f"Model sync complete. Files available in {model_dir}")
 
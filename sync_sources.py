@@ -1,5 +1,7 @@
 import argparse
 import json
+import os
+import shutil
 import urllib.request
 from pathlib import Path
 
@@ -36,8 +38,11 @@ def download(url: str, destination: Path, force: bool = False) -> None:
     if destination.exists() and not force:
         return
 
-    with urllib.request.urlopen(url) as response:
-        destination.write_bytes(response.read())
+    # Write under a temporary name so a partial download never looks ready to the indexer.
+    partial = destination.with_name(destination.name + ".part")
+    with urllib.request.urlopen(url) as response, partial.open("wb") as f:
+        shutil.copyfileobj(response, f, length=1024 * 1024)
+    os.replace(partial, destination)
 
 
 def build_manifest_entries(selected: list, source_dir: Path) -> list:
@@ -0,0 +1,84 @@
+import bz2
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import analyze_logs
+
+
+def _event(idx: int, latency: float, interaction: str = "ask") -> dict:
+    return {
+        "timestamp": f"2026-10-01T00:{idx // 60:02d}:{idx % 60:02d}+00:00",
+        "event": "completion",
+        "request_id": f"r{idx}",
+        "interaction": interaction,
+        "provider": "ollama",
+        "model": "deepseek-r1",
+        "retrieval_chunks": 4,
+        "latency_ms": latency,
+        "cache_hit": idx % 2 == 0,
+    }
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_are_close_to_exact(self):
+        hist = analyze_logs.LatencyHistogram()
+        for value in range(1, 1001):
+            hist.add(float(value))
+
+        self.assertAlmostEqual(hist.quantile(0.5), 500, delta=500 * 0.02)
+        self.assertAlmostEqual(hist.quantile(0.99), 990, delta=990 * 0.02)
+        self.assertEqual(hist.quantile(1.0), 1000)
+
+    def test_zero_latency(self):
+        hist = analyze_logs.LatencyHistogram()
+        hist.add(0.0)
+        self.assertEqual(hist.quantile(0.5), 0.0)
+
+
+class SummarizeTests(unittest.TestCase):
+    def test_reads_rotated_and_compressed_logs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            with gzip.open(root / "requests.jsonl.2.gz", "wt", encoding="utf-8") as f:
+                f.write(json.dumps(_event(0, 100.0)) + "\n")
+            with bz2.open(root / "requests.jsonl.1.bz2", "wt", encoding="utf-8") as f:
+                f.write(json.dumps(_event(1, 900.0, "explain_region")) + "\n")
+            with (root / "requests.jsonl").open("w", encoding="utf-8") as f:
+                f.write(json.dumps(_event(2, 300.0)) + "\n")
+                f.write("not json\n")
+                f.write(json.dumps({"event": "other"}) + "\n")
+
+            report = analyze_logs.summarize(
+                analyze_logs.find_logs([root]), bucket_seconds=60, top=2
+            )
+
+        self.assertEqual(report["requests"], 3)
+        self.assertEqual(report["skipped_lines"], 2)
+        self.assertEqual([row["request_id"] for row in report["slowest"]], ["r1", "r2"])
+        self.assertEqual(report["retrieval_chunks"], {"4": 3})
+        groups = {row["interaction"]: row for row in report["groups"]}
+        self.assertEqual(groups["ask"]["count"], 2)
+        self.assertEqual(groups["ask"]["cache_hits"], 2)
+        self.assertEqual(len(report["trend"]), 1)
+        self.assertIn("explain_region", analyze_logs.format_report(report))
+
+    def test_since_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "requests.jsonl"
+            with path.open("w", encoding="utf-8") as f:
+                for idx in range(120):
+                    f.write(json.dumps(_event(idx, float(idx + 1))) + "\n")
+
+            report = analyze_logs.summarize(
+                [path],
+                since=analyze_logs._parse_timestamp("2026-10-01T00:01:00+00:00"),
+            )
+
+        self.assertEqual(report["requests"], 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
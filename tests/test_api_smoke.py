@@ -1,3 +1,4 @@
+import asyncio
 import importlib.util
 import unittest
 from unittest.mock import patch
@@ -6,6 +7,20 @@ FASTAPI_READY = importlib.util.find_spec("fastapi") is not None
 LANGCHAIN_READY = importlib.util.find_spec("langchain") is not None
 
 
+class ConnectedRequest:
+    headers: dict = {}
+
+    async def is_disconnected(self):
+        return False
+
+
+class DisconnectedRequest:
+    headers: dict = {}
+
+    async def is_disconnected(self):
+        return True
+
+
 @unittest.skipUnless(FASTAPI_READY and LANGCHAIN_READY, "fastapi/langchain not installed")
 class ApiSmokeTests(unittest.TestCase):
     def test_health_and_config(self):
@@ -22,7 +37,7 @@ class ApiSmokeTests(unittest.TestCase):
 
         payload = api.AskRequest(question="How do buffers work?", skill_level="beginner")
         with patch("backend.api.ask_emacs", return_value={"answer": "x", "sources": []}):
-            result = api.ask(payload)
+            result = asyncio.run(api.ask(payload, ConnectedRequest()))
 
         self.assertIn("answer", result)
 
@@ -36,10 +51,65 @@ class ApiSmokeTests(unittest.TestCase):
             skill_level="beginner",
         )
         with patch("backend.api.explain_region", return_value={"answer": "x", "sources": []}):
-            result = api.explain(payload)
+            result = asyncio.run(api.explain(payload, ConnectedRequest()))
 
         self.assertIn("answer", result)
 
+    def test_disconnect_cancels_in_flight_request(self):
+        import threading
+
+        import backend.api as api
+        from backend.cancellation import check_cancelled
+
+        def slow_ask(**kwargs):
+            while True:
+                check_cancelled()
+                threading.Event().wait(0.01)
+
+        payload = api.AskRequest(question="How do buffers work?", request_id="abc")
+        with patch("backend.api.ask_emacs", side_effect=slow_ask):
+            with self.assertRaises(api.HTTPException) as ctx:
+                asyncio.run(api.ask(payload, DisconnectedRequest()))
+
+        self.assertEqual(ctx.exception.status_code, 499)
+        self.assertFalse(api.cancel("abc")["cancelled"])
+
+    def test_duplicate_request_id_is_a_conflict(self):
+        import backend.api as api
+        from backend.cancellation import register_request, unregister_request
+
+        first = register_request("dup-1")
+        try:
+            payload = api.AskRequest(question="How do buffers work?", request_id="dup-1")
+            with patch("backend.api.ask_emacs", return_value={"answer": "x", "sources": []}):
+                with self.assertRaises(api.HTTPException) as ctx:
+                    asyncio.run(api.ask(payload, ConnectedRequest()))
+
+            self.assertEqual(ctx.exception.status_code, 409)
+            self.assertTrue(api.cancel("dup-1")["cancelled"])
+            self.assertTrue(first.cancelled)
+        finally:
+            unregister_request("dup-1", first)
+
+    def test_profile_header_saves_profile_for_request(self):
+        import os
+        import tempfile
+        from pathlib import Path
+
+        import backend.api as api
+
+        class ProfiledRequest(ConnectedRequest):
+            headers = {"x-profile": "1"}
+
+        payload = api.AskRequest(question="How do buffers work?", request_id="prof-1")
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(os.environ, {"PROFILE_DIR": tmp}), patch(
+                "backend.api.ask_emacs", return_value={"answer": "x", "sources": []}
+            ):
+                asyncio.run(api.ask(payload, ProfiledRequest()))
+
+            self.assertTrue((Path(tmp) / "prof-1.prof").exists())
+
 
 if __name__ == "__main__":
     unittest.main()
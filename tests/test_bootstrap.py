@@ -0,0 +1,109 @@
+import threading
+import unittest
+
+from bootstrap import run_pipeline
+
+
+def _sources(*ids):
+    return [{"id": source_id, "filename": f"{source_id}.pdf"} for source_id in ids]
+
+
+class PipelineTests(unittest.TestCase):
+    def test_fast_source_is_parsed_while_slow_one_downloads(self):
+        slow_started = threading.Event()
+        release_slow = threading.Event()
+        parsed = []
+
+        def fetch_source(entry):
+            if entry["id"] == "slow":
+                slow_started.set()
+                self.assertTrue(release_slow.wait(5))
+
+        def parse(entry):
+            parsed.append(entry["id"])
+            if entry["id"] == "fast":
+                release_slow.set()
+            return [[f"{entry['id']}-1", f"{entry['id']}-2"], [f"{entry['id']}-3"]]
+
+        embedded = []
+        stages = run_pipeline(
+            _sources("slow", "fast"),
+            [],
+            fetch_source=fetch_source,
+            fetch_model=lambda entry: "",
+            parse=parse,
+            open_embedder=lambda: embedded.extend,
+            download_workers=2,
+        )
+
+        self.assertTrue(slow_started.is_set())
+        self.assertEqual(parsed, ["fast", "slow"])
+        self.assertEqual(len(embedded), 6)
+        self.assertEqual(stages["download"].items, 2)
+        self.assertEqual(stages["parse"].items, 2)
+        self.assertEqual(stages["embed"].items, 6)
+
+    def test_models_download_alongside_sources(self):
+        model_started = threading.Event()
+        sources_done = threading.Event()
+
+        def fetch_model(entry):
+            model_started.set()
+            self.assertTrue(sources_done.wait(5))
+            return "Ready"
+
+        def fetch_source(entry):
+            self.assertTrue(model_started.wait(5))
+
+        stages = run_pipeline(
+            _sources("a", "b"),
+            [{"filename": "model.gguf"}],
+            fetch_source=fetch_source,
+            fetch_model=fetch_model,
+            parse=lambda entry: [[entry["id"]]],
+            open_embedder=lambda: lambda batch: sources_done.set(),
+        )
+
+        self.assertEqual(stages["models"].items, 1)
+        self.assertEqual(stages["embed"].items, 2)
+
+    def test_downloads_only_without_parse(self):
+        fetched = []
+        stages = run_pipeline(
+            _sources("a", "b", "c"),
+            [],
+            fetch_source=lambda entry: fetched.append(entry["id"]),
+            fetch_model=lambda entry: "",
+        )
+
+        self.assertEqual(sorted(fetched), ["a", "b", "c"])
+        self.assertIsNone(stages["parse"].started)
+
+    def test_stage_errors_are_raised(self):
+        def parse(entry):
+            raise ValueError(f"bad source {entry['id']}")
+
+        with self.assertRaisesRegex(ValueError, "bad source"):
+            run_pipeline(
+                _sources("a", "b"),
+                [],
+                fetch_source=lambda entry: None,
+                fetch_model=lambda entry: "",
+                parse=parse,
+                open_embedder=lambda: lambda batch: None,
+            )
+
+        def fetch_model(entry):
+            raise RuntimeError("checksum mismatch")
+
+        with self.assertRaisesRegex(RuntimeError, "checksum mismatch"):
+            run_pipeline(
+                _sources("a"),
+                [{"filename": "model.gguf"}],
+                fetch_source=lambda entry: None,
+                fetch_model=fetch_model,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
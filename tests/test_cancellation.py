@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.cancellation import (
+    CancelToken,
+    DuplicateRequestId,
+    RequestCancelled,
+    bind_token,
+    cancel_request,
+    check_cancelled,
+    register_request,
+    unregister_request,
+)
+from backend.providers.streaming import post_chat_stream, read_chat_stream
+
+
+class FakeStream:
+    def __init__(self, lines, token=None, cancel_after=None):
+        self._lines = lines
+        self._token = token
+        self._cancel_after = cancel_after
+        self.closed = False
+
+    def __iter__(self):
+        for idx, line in enumerate(self._lines):
+            if self.closed:
+                raise ValueError("I/O operation on closed file")
+            if self._cancel_after is not None and idx == self._cancel_after:
+                self._token.cancel()
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+def sse(payload):
+    return f"data: {json.dumps(payload)}\n".encode("utf-8")
+
+
+class CancelTokenTests(unittest.TestCase):
+    def test_registry_cancels_by_request_id(self):
+        token = register_request("req-1")
+        try:
+            self.assertTrue(cancel_request("req-1"))
+            self.assertTrue(token.cancelled)
+        finally:
+            unregister_request("req-1")
+        self.assertFalse(cancel_request("req-1"))
+
+    def test_duplicate_request_id_is_rejected(self):
+        token = register_request("req-dup")
+        try:
+            with self.assertRaises(DuplicateRequestId):
+                register_request("req-dup")
+            unregister_request("req-dup", CancelToken("req-dup"))
+            self.assertTrue(cancel_request("req-dup"))
+            self.assertTrue(token.cancelled)
+        finally:
+            unregister_request("req-dup", token)
+        self.assertFalse(cancel_request("req-dup"))
+
+    def test_check_cancelled_uses_bound_token(self):
+        token = CancelToken("req-2")
+        check_cancelled()
+        with bind_token(token):
+            token.cancel()
+            with self.assertRaises(RequestCancelled):
+                check_cancelled()
+        check_cancelled()
+
+    def test_bound_token_is_thread_local(self):
+        token = CancelToken("req-3")
+        token.cancel()
+        errors = []
+
+        def worker():
+            try:
+                check_cancelled()
+            except RequestCancelled as exc:
+                errors.append(exc)
+
+        with bind_token(token):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+class ReadChatStreamTests(unittest.TestCase):
+    def test_collects_deltas_and_usage(self):
+        lines = [
+            sse({"choices": [{"delta": {"content": "Hello"}}]}),
+            b"\n",
+            sse({"choices": [{"delta": {"content": " there"}}]}),
+            sse({"choices": [], "usage": {"prompt_tokens": 12}, "timings": {"prompt_n": 2}}),
+            b"data: [DONE]\n",
+        ]
+        answer, usage = read_chat_stream(FakeStream(lines), CancelToken("r"))
+        self.assertEqual(answer, "Hello there")
+        self.assertEqual(usage["prefill_tokens"], 2)
+
+    def test_cancel_closes_stream(self):
+        token = CancelToken("r")
+        lines = [sse({"choices": [{"delta": {"content": "x"}}]})] * 5
+        stream = FakeStream(lines, token=token, cancel_after=2)
+
+        with self.assertRaises(RequestCancelled):
+            read_chat_stream(stream, token)
+        self.assertTrue(stream.closed)
+
+
+class SlowChatServer:
+    # Holds each request for `prefill` seconds before streaming, like a long prompt on llama.cpp.
+    def __init__(self, prefill: float) -> None:
+        release = threading.Event()
+        self.release = release
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                release.wait(prefill)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                self.wfile.write(sse({"choices": [{"delta": {"content": "done"}}]}))
+                self.wfile.write(b"data: [DONE]\n")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/chat/completions"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class PostChatStreamTests(unittest.TestCase):
+    def test_streams_answer(self):
+        server = SlowChatServer(prefill=0)
+        self.addCleanup(server.close)
+        answer, _ = post_chat_stream(server.url, {"stream": True}, {}, CancelToken("r"))
+        self.assertEqual(answer, "done")
+
+    def test_cancel_during_prefill_aborts_at_once(self):
+        server = SlowChatServer(prefill=5)
+        self.addCleanup(server.close)
+        token = CancelToken("r")
+        threading.Timer(0.2, token.cancel).start()
+
+        started = time.monotonic()
+        with self.assertRaises(RequestCancelled):
+            post_chat_stream(server.url, {"stream": True}, {}, token, timeout=10)
+        self.assertLess(time.monotonic() - started, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from typing import Optional
+
+from backend.providers.base import ChatProvider
+from backend.providers.cascade import (
+    CascadeChatProvider,
+    CascadeThresholds,
+    RequestFeatures,
+    cascade_stats,
+    classify,
+    looks_low_confidence,
+    score_spread,
+)
+
+
+class StaticProvider(ChatProvider):
+    def __init__(self, name: str, answer: str) -> None:
+        self._name = name
+        self._answer = answer
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def model(self) -> str:
+        return f"{self._name}-model"
+
+    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        self.calls += 1
+        return self._answer
+
+
+CONFIDENT = "Press C-x C-s to save the current buffer to its file on disk."
+
+
+class ClassifierTests(unittest.TestCase):
+    def test_short_question_with_clear_top_hit_goes_small(self):
+        features = RequestFeatures("ask", text_chars=25, score_spread=0.3)
+        self.assertEqual(classify(features, CascadeThresholds()), "small")
+
+    def test_long_question_goes_large(self):
+        features = RequestFeatures("ask", text_chars=500, score_spread=0.3)
+        self.assertEqual(classify(features, CascadeThresholds()), "large")
+
+    def test_flat_scores_go_large(self):
+        features = RequestFeatures("ask", text_chars=25, score_spread=0.01)
+        self.assertEqual(classify(features, CascadeThresholds()), "large")
+
+    def test_explain_region_uses_code_size(self):
+        thresholds = CascadeThresholds(max_code_chars=50)
+        self.assertEqual(classify(RequestFeatures("explain_region", 30), thresholds), "small")
+        self.assertEqual(classify(RequestFeatures("explain_region", 300), thresholds), "large")
+
+    def test_score_spread(self):
+        self.assertIsNone(score_spread([0.5]))
+        self.assertAlmostEqual(score_spread([0.2, 0.9, 0.5]), 0.7)
+
+    def test_low_confidence_detection(self):
+        self.assertTrue(looks_low_confidence("I'm not sure, but maybe try M-x."))
+        self.assertTrue(looks_low_confidence(""))
+        self.assertTrue(looks_low_confidence(" ... "))
+        self.assertFalse(looks_low_confidence("C-x C-s"))
+        self.assertFalse(looks_low_confidence(CONFIDENT))
+
+
+class CascadeProviderTests(unittest.TestCase):
+    def test_small_tier_answers_confident_questions(self):
+        small = StaticProvider("small", CONFIDENT)
+        large = StaticProvider("large", "large answer")
+        cascade = CascadeChatProvider(small, large)
+
+        cascade.route(RequestFeatures("ask", text_chars=20, score_spread=0.5))
+        answer = cascade.generate("q")
+
+        self.assertEqual(answer, CONFIDENT)
+        self.assertEqual(cascade.model, "small-model")
+        self.assertEqual(large.calls, 0)
+        self.assertEqual(cascade.last_usage["tier"], "small")
+
+    def test_escalates_low_confidence_answers(self):
+        small = StaticProvider("small", "I don't know.")
+        large = StaticProvider("large", "large answer")
+        cascade = CascadeChatProvider(small, large)
+        before = cascade_stats()["escalations"]
+
+        cascade.route(RequestFeatures("ask", text_chars=20, score_spread=0.5))
+        answer = cascade.generate("q")
+
+        self.assertEqual(answer, "large answer")
+        self.assertTrue(cascade.last_usage["escalated"])
+        self.assertEqual(cascade_stats()["escalations"], before + 1)
+        self.assertIn("large", cascade_stats()["tiers"])
+
+    def test_escalation_can_be_disabled(self):
+        small = StaticProvider("small", "I don't know.")
+        large = StaticProvider("large", "large answer")
+        cascade = CascadeChatProvider(small, large, escalate=False)
+
+        cascade.route(RequestFeatures("ask", text_chars=20, score_spread=0.5))
+        self.assertEqual(cascade.generate("q"), "I don't know.")
+        self.assertEqual(large.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import importlib.util
+import unittest
+
+from backend.chunking import chunk_pages, is_heading, pack_lines, strip_boilerplate
+
+
+def manual_pages():
+    bodies = {
+        1: "Notes about buffers.\nMore about buffers here.",
+        2: "7 The Mark and the Region\nMany Emacs commands operate on an arbitrary part\n"
+        "of the current buffer. To specify the text for such a command,",
+        3: "you set the mark at one end of it, and move point to the other end.\n"
+        "7.1 Setting the Mark\nC-SPC Set the mark at point (set-mark-command).",
+        4: "Notes about files.",
+        5: "Notes about modes.",
+    }
+    pages = []
+    for n, body in bodies.items():
+        header = f"Chapter 7: The Mark and the Region {50 + n}" if n % 2 else f"{50 + n} GNU Emacs Manual"
+        pages.append(f"{header}\n{body}\n{50 + n}")
+    return pages
+
+
+class BoilerplateTests(unittest.TestCase):
+    def test_running_headers_and_page_numbers_are_removed(self):
+        cleaned = "\n".join(strip_boilerplate(manual_pages()))
+        self.assertNotIn("GNU Emacs Manual", cleaned)
+        self.assertNotIn("Chapter 7:", cleaned)
+        self.assertNotIn("53", cleaned)
+        self.assertIn("Notes about files.", cleaned)
+
+
+class HeadingTests(unittest.TestCase):
+    def test_detects_manual_headings(self):
+        self.assertTrue(is_heading("8 Killing and Moving Text"))
+        self.assertTrue(is_heading("8.1.2 Deletion"))
+        self.assertTrue(is_heading("Appendix A GNU General Public License"))
+
+    def test_ignores_lists_and_toc_entries(self):
+        self.assertFalse(is_heading("1. Open the file"))
+        self.assertFalse(is_heading("3 files changed"))
+        self.assertFalse(is_heading("8.1 Deletion . . . . . . 51"))
+
+
+class ChunkPagesTests(unittest.TestCase):
+    def test_sections_flow_across_page_breaks(self):
+        chunks = chunk_pages(manual_pages(), chunk_size=400, chunk_overlap=40)
+        mark = next(c for c in chunks if c["section_title"] == "7 The Mark and the Region")
+
+        self.assertIn("To specify the text for such a command,\nyou set the mark", mark["text"])
+        self.assertEqual(mark["page"], 1)
+        self.assertTrue(any(c["section_title"] == "7.1 Setting the Mark" for c in chunks))
+
+    def test_pack_lines_respects_size_and_overlap(self):
+        lines = [f"line {n} " + "x" * 40 for n in range(10)]
+        chunks = pack_lines(lines, chunk_size=120, chunk_overlap=60)
+
+        self.assertTrue(all(len(chunk) <= 120 for chunk in chunks))
+        self.assertEqual(chunks[0].splitlines()[-1], chunks[1].splitlines()[0])
+
+
+@unittest.skipUnless(importlib.util.find_spec("langchain") is not None, "langchain not installed")
+class ChunkDocumentsTests(unittest.TestCase):
+    def test_pdf_pages_get_section_metadata(self):
+        from langchain_core.documents import Document
+
+        import prepare_data
+
+        docs = [
+            Document(
+                page_content=text,
+                metadata={"resource_type": "pdf", "resource_id": "manual", "page": idx},
+            )
+            for idx, text in enumerate(manual_pages())
+        ]
+        chunks = prepare_data.chunk_documents(docs, chunk_size=400, chunk_overlap=40)
+
+        titles = {chunk.metadata["section_title"] for chunk in chunks}
+        self.assertIn("7.1 Setting the Mark", titles)
+        self.assertTrue(all(chunk.metadata["resource_id"] == "manual" for chunk in chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
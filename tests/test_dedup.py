@@ -0,0 +1,145 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.dedup import CrossSourceDeduplicator, NearDuplicateIndex, shingles
+
+LANGCHAIN_READY = all(
+    importlib.util.find_spec(name) is not None for name in ("langchain", "chromadb")
+)
+PASSAGE = (
+    "To save the current buffer to its file press C-x C-s. To visit a file press "
+    "C-x C-f and type its name in the minibuffer. To switch between open buffers "
+    "press C-x b and choose one from the completion list shown below the prompt."
+)
+
+
+class ShingleTests(unittest.TestCase):
+    def test_short_text_is_one_shingle(self):
+        self.assertEqual(shingles("Save Buffer", size=5), {"save buffer"})
+
+    def test_empty_text_has_no_shingles(self):
+        self.assertEqual(shingles("  ...  "), set())
+
+
+class NearDuplicateIndexTests(unittest.TestCase):
+    def test_near_copy_is_found(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add("a", index.signature(PASSAGE))
+        near_copy = PASSAGE.replace("completion list", "completions list")
+
+        self.assertEqual(index.find(index.signature(near_copy)), ["a"])
+
+    def test_unrelated_text_is_not_found(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add("a", index.signature(PASSAGE))
+        other = "Org mode tables are edited with TAB to move between fields and C-c C-c to align."
+
+        self.assertEqual(index.find(index.signature(other)), [])
+
+
+class CrossSourceDeduplicatorTests(unittest.TestCase):
+    def test_copy_from_other_source_maps_to_canonical(self):
+        dedup = CrossSourceDeduplicator(threshold=0.85)
+
+        self.assertIsNone(dedup.check(0, PASSAGE, "guide-a.txt"))
+        self.assertEqual(dedup.check(1, PASSAGE + " ", "guide-b.txt"), 0)
+
+    def test_repeat_within_one_source_is_kept(self):
+        dedup = CrossSourceDeduplicator(threshold=0.85)
+
+        self.assertIsNone(dedup.check(0, PASSAGE, "guide-a.txt"))
+        self.assertIsNone(dedup.check(1, PASSAGE, "guide-a.txt"))
+
+
+@unittest.skipUnless(LANGCHAIN_READY, "langchain/chromadb not installed")
+class ChunkFilterTests(unittest.TestCase):
+    def test_exact_and_cross_source_duplicates_are_dropped(self):
+        from langchain_core.documents import Document
+
+        from prepare_data import ChunkFilter
+
+        def chunk(text, path):
+            metadata = {"resource_id": path, "resource_path": path}
+            return Document(page_content=text, metadata=metadata)
+
+        chunk_filter = ChunkFilter()
+        kept = [
+            chunk_filter.add(chunk(PASSAGE, "manual.pdf")),
+            chunk_filter.add(chunk(PASSAGE, "manual.pdf")),
+            chunk_filter.add(chunk(PASSAGE + " Done.", "guide.pdf")),
+        ]
+
+        self.assertEqual(kept, [True, False, False])
+        self.assertEqual(chunk_filter.removed, 1)
+        self.assertEqual(chunk_filter.touched, {0})
+        self.assertEqual(chunk_filter.kept[0].metadata["alternate_sources"], "guide.pdf")
+
+
+@unittest.skipUnless(LANGCHAIN_READY, "langchain/chromadb not installed")
+class SnapshotBuilderTests(unittest.TestCase):
+    def setUp(self):
+        from langchain_core.documents import Document
+
+        from backend.providers.base import EmbeddingProvider
+
+        class ConstantEmbeddings(EmbeddingProvider):
+            name = "fake"
+            model = "constant"
+
+            def embed(self, texts):
+                return [[1.0, 0.0] for _ in texts]
+
+        def chunk(text, path):
+            metadata = {"resource_id": path, "resource_path": path}
+            return Document(page_content=text, metadata=metadata)
+
+        self.chunk = chunk
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for patcher in (
+            patch("prepare_data.get_embedding_provider", return_value=ConstantEmbeddings()),
+            patch.dict(os.environ, {"EMBEDDING_MODEL": "constant"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_duplicate_in_later_batch_updates_stored_canonical(self):
+        import prepare_data
+
+        builder = prepare_data.SnapshotBuilder(Path(self.tmp.name))
+        self.assertEqual(builder.add_chunks([self.chunk(PASSAGE, "manual.pdf")]), 1)
+        self.assertEqual(builder.add_chunks([self.chunk(PASSAGE + " Done.", "guide.pdf")]), 0)
+        published = builder.publish([{"id": "manual.pdf"}, {"id": "guide.pdf"}])
+        stored = builder._vectorstore.get()
+
+        self.assertEqual(published["chunks"], 1)
+        self.assertEqual(builder.removed, 1)
+        self.assertEqual(stored["metadatas"][0]["alternate_sources"], "guide.pdf")
+
+    def test_no_reset_dedups_against_copied_snapshot(self):
+        import prepare_data
+        from backend.index_meta import load_index_meta
+        from backend.snapshots import resolve_index_dir
+
+        first = prepare_data.SnapshotBuilder(Path(self.tmp.name))
+        first.add_chunks([self.chunk(PASSAGE, "manual.pdf"), self.chunk("C-x b", "keys.txt")])
+        first.publish([{"id": "manual.pdf"}, {"id": "keys.txt"}])
+
+        second = prepare_data.SnapshotBuilder(Path(self.tmp.name), reset=False)
+        added = second.add_chunks([self.chunk(PASSAGE + " Done.", "guide.pdf")])
+        published = second.publish([{"id": "guide.pdf"}])
+        meta = load_index_meta(resolve_index_dir(Path(self.tmp.name)))
+        stored = second._vectorstore.get()
+
+        self.assertEqual(added, 0)
+        self.assertEqual(published["chunks"], 2)
+        self.assertEqual(meta["chunks"], 2)
+        alternates = [m.get("alternate_sources") for m in stored["metadatas"]]
+        self.assertIn("guide.pdf", alternates)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import threading
+import unittest
+
+from backend.embedding_batcher import EmbeddingBatcher
+
+
+class EmbeddingBatcherTests(unittest.TestCase):
+    def test_concurrent_queries_share_a_batch(self):
+        batches = []
+
+        def embed(texts):
+            batches.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        batcher = EmbeddingBatcher(embed, max_wait_ms=100, max_batch_size=8)
+        results = {}
+        barrier = threading.Barrier(4)
+
+        def worker(text):
+            barrier.wait()
+            results[text] = batcher.embed(text)
+
+        threads = [threading.Thread(target=worker, args=("x" * n,)) for n in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results["xxx"], [3.0])
+        self.assertLess(len(batches), 4)
+        stats = batcher.stats()
+        self.assertEqual(stats["queries"], 4)
+        self.assertGreater(stats["avg_batch_size"], 1)
+
+    def test_respects_max_batch_size(self):
+        sizes = []
+
+        def embed(texts):
+            sizes.append(len(texts))
+            return [[0.0] for _ in texts]
+
+        batcher = EmbeddingBatcher(embed, max_wait_ms=50, max_batch_size=2)
+        threads = [threading.Thread(target=batcher.embed, args=(str(n),)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(size <= 2 for size in sizes))
+        self.assertEqual(sum(sizes), 5)
+
+    def test_errors_reach_every_waiter(self):
+        def embed(texts):
+            raise RuntimeError("model failed")
+
+        batcher = EmbeddingBatcher(embed, max_wait_ms=0)
+        with self.assertRaises(RuntimeError):
+            batcher.embed("q")
+
+
+if __name__ == "__main__":
+    unittest.main()
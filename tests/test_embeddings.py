@@ -0,0 +1,150 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.index_meta import check_embedding_meta
+from backend.providers.ollama_embeddings import OllamaEmbeddingProvider
+
+NUMPY_READY = importlib.util.find_spec("numpy") is not None
+ONNX_READY = all(
+    importlib.util.find_spec(name) is not None for name in ("onnx", "onnxruntime", "tokenizers")
+)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._body = json.dumps(data).encode("utf-8")
+
+    def read(self):
+        return self._body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class EmbeddingMetaTests(unittest.TestCase):
+    def test_unrecorded_index_is_accepted(self):
+        check_embedding_meta({"version": "v1"}, "all-MiniLM-L6-v2", 384)
+
+    def test_model_mismatch_is_rejected(self):
+        meta = {"embedding": {"model": "all-MiniLM-L6-v2", "dimension": 384}}
+        with self.assertRaises(ValueError):
+            check_embedding_meta(meta, "nomic-embed-text")
+
+    def test_dimension_mismatch_is_rejected(self):
+        meta = {"embedding": {"model": "all-MiniLM-L6-v2", "dimension": 384}}
+        check_embedding_meta(meta, "all-MiniLM-L6-v2", 384)
+        with self.assertRaises(ValueError):
+            check_embedding_meta(meta, "all-MiniLM-L6-v2", 768)
+
+
+class OllamaEmbeddingTests(unittest.TestCase):
+    def test_inputs_are_sent_in_batches(self):
+        calls = []
+
+        def fake_urlopen(req, timeout=None):
+            payload = json.loads(req.data.decode("utf-8"))
+            calls.append(payload)
+            return FakeResponse({"embeddings": [[float(len(text))] for text in payload["input"]]})
+
+        provider = OllamaEmbeddingProvider(model="nomic-embed-text", batch_size=2)
+        with patch("backend.providers.ollama_embeddings.request.urlopen", fake_urlopen):
+            vectors = provider.embed_documents(["a", "bb", "ccc"])
+
+        self.assertEqual(vectors, [[1.0], [2.0], [3.0]])
+        self.assertEqual([call["input"] for call in calls], [["a", "bb"], ["ccc"]])
+        self.assertEqual(calls[0]["model"], "nomic-embed-text")
+
+    def test_short_response_is_an_error(self):
+        provider = OllamaEmbeddingProvider(model="nomic-embed-text")
+        with patch(
+            "backend.providers.ollama_embeddings.request.urlopen",
+            return_value=FakeResponse({"embeddings": []}),
+        ):
+            with self.assertRaises(RuntimeError):
+                provider.embed_query("hello")
+
+
+@unittest.skipUnless(NUMPY_READY, "numpy not installed")
+class MeanPoolTests(unittest.TestCase):
+    def test_padding_is_ignored_and_vectors_are_normalized(self):
+        import numpy as np
+
+        from backend.providers.onnx_embeddings import mean_pool
+
+        hidden = np.array([[[3.0, 0.0], [0.0, 4.0], [100.0, 100.0]]], dtype=np.float32)
+        mask = np.array([[1, 1, 0]], dtype=np.int64)
+        pooled = mean_pool(hidden, mask)
+
+        np.testing.assert_allclose(pooled, [[0.6, 0.8]], rtol=1e-6)
+
+
+def _write_tiny_model(model_dir: Path) -> None:
+    import numpy as np
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "buffer": 2, "window": 3, "frame": 4}
+    tokenizer = Tokenizer(WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.save(str(model_dir / "tokenizer.json"))
+
+    # A lookup table stands in for the transformer: each token id maps to a fixed vector.
+    table = np.array(
+        [[0, 0, 0], [1, 1, 1], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32
+    )
+    graph = helper.make_graph(
+        [helper.make_node("Gather", ["table", "input_ids"], ["last_hidden_state"])],
+        "tiny",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "seq"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "seq"]),
+        ],
+        [
+            helper.make_tensor_value_info(
+                "last_hidden_state", TensorProto.FLOAT, ["batch", "seq", 3]
+            )
+        ],
+        initializer=[numpy_helper.from_array(table, name="table")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(model_dir / "model_quantized.onnx"))
+
+
+@unittest.skipUnless(ONNX_READY, "onnx/onnxruntime/tokenizers not installed")
+class OnnxEmbeddingTests(unittest.TestCase):
+    def test_embeddings_keep_input_order(self):
+        from backend.providers.onnx_embeddings import OnnxEmbeddingProvider
+
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_tiny_model(Path(tmp))
+            provider = OnnxEmbeddingProvider(model="tiny", model_dir=tmp, batch_size=2)
+            vectors = provider.embed_documents(["buffer window", "frame", "buffer"])
+
+        self.assertEqual(provider.name, "onnx")
+        self.assertEqual(len(vectors), 3)
+        self.assertAlmostEqual(vectors[0][0], 2 ** -0.5, places=5)
+        self.assertAlmostEqual(vectors[0][1], 2 ** -0.5, places=5)
+        self.assertEqual([round(v, 5) for v in vectors[1]], [0.0, 0.0, 1.0])
+        self.assertEqual([round(v, 5) for v in vectors[2]], [1.0, 0.0, 0.0])
+
+    def test_missing_model_is_reported(self):
+        from backend.providers.onnx_embeddings import OnnxEmbeddingProvider
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(FileNotFoundError):
+                OnnxEmbeddingProvider(model="tiny", model_dir=tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
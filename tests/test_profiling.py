@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import profile_report
+from backend.profiling import capture_profile, profile_path, should_profile
+
+
+def _busy_work() -> int:
+    return sum(i * i for i in range(2000))
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_should_profile(self):
+        self.assertTrue(should_profile(True, 0.0))
+        self.assertFalse(should_profile(False, 0.0))
+        self.assertTrue(should_profile(False, 1.0))
+
+    def test_profile_path_is_safe_for_request_ids(self):
+        path = profile_path(Path("data/profiles"), "../abc/def")
+        self.assertEqual(path, Path("data/profiles/.._abc_def.prof"))
+
+    def test_capture_writes_profile_tagged_with_request_id(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with capture_profile("req-1", Path(tmp)) as path:
+                _busy_work()
+
+            self.assertEqual(path, Path(tmp) / "req-1.prof")
+            self.assertTrue(path.exists())
+
+    def test_nested_capture_is_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with capture_profile("outer", Path(tmp)):
+                with capture_profile("inner", Path(tmp)) as inner:
+                    self.assertIsNone(inner)
+
+    def test_report_aggregates_functions_across_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for request_id in ("a", "b"):
+                with capture_profile(request_id, Path(tmp)):
+                    _busy_work()
+
+            profiles = profile_report.find_profiles([Path(tmp)])
+            rows = profile_report.summarize_profiles(profiles)
+
+            self.assertEqual(len(profiles), 2)
+            busy = [row for row in rows if row["function"].endswith("(_busy_work)")]
+            self.assertEqual(len(busy), 1)
+            self.assertEqual(busy[0]["profiles"], 2)
+            self.assertEqual(busy[0]["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
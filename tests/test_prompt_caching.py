@@ -0,0 +1,67 @@
+import unittest
+
+from backend.prompts import (
+    ask_prompt_template,
+    ask_system_prompt,
+    explain_region_prompt_template,
+    explain_region_system_prompt,
+)
+from backend.providers.base import chat_usage_from_response
+from backend.providers.local_small import LocalSmallChatProvider
+
+
+class PromptSplitTests(unittest.TestCase):
+    def test_system_prompts_are_static(self):
+        for system in (ask_system_prompt(), explain_region_system_prompt()):
+            self.assertNotIn("{", system)
+            self.assertNotIn("}", system)
+
+    def test_user_templates_format(self):
+        ask = ask_prompt_template().format(question="q", skill_level="beginner", context="c")
+        self.assertIn("Question:\nq", ask)
+
+        explain = explain_region_prompt_template().format(
+            skill_level="beginner",
+            language="elisp",
+            extra_context="(none)",
+            docs_context="docs",
+            code="(setq x 1)",
+        )
+        self.assertIn("(setq x 1)", explain)
+
+
+class LocalSmallPayloadTests(unittest.TestCase):
+    def test_payload_requests_prompt_cache(self):
+        provider = LocalSmallChatProvider(model="tiny")
+        payload = provider.build_payload("hello", system="rules")
+
+        self.assertTrue(payload["cache_prompt"])
+        self.assertNotIn("id_slot", payload)
+        self.assertEqual(payload["messages"][0], {"role": "system", "content": "rules"})
+
+    def test_cache_prompt_can_be_disabled(self):
+        provider = LocalSmallChatProvider(model="tiny", cache_prompt=False)
+        self.assertNotIn("cache_prompt", provider.build_payload("hello"))
+
+
+class UsageParsingTests(unittest.TestCase):
+    def test_llama_cpp_timings(self):
+        usage = chat_usage_from_response(
+            {
+                "usage": {"prompt_tokens": 300, "completion_tokens": 40},
+                "timings": {"prompt_n": 20, "prompt_ms": 51.234},
+            }
+        )
+        self.assertEqual(usage["prefill_tokens"], 20)
+        self.assertEqual(usage["cached_prompt_tokens"], 280)
+        self.assertEqual(usage["prefill_ms"], 51.23)
+
+    def test_openai_cached_tokens(self):
+        usage = chat_usage_from_response(
+            {"usage": {"prompt_tokens": 100, "prompt_tokens_details": {"cached_tokens": 64}}}
+        )
+        self.assertEqual(usage["cached_prompt_tokens"], 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,37 @@ class ProviderFactoryTests(unittest.TestCase):
         self.assertEqual(provider.name, "openai")
         self.assertEqual(provider.model, "gpt-4o-mini")
 
+    @unittest.skipUnless(importlib.util.find_spec("langchain") is not None, "langchain not installed")
+    def test_factory_cascade_provider(self):
+        from backend.config import AppConfig
+        from backend.providers.factory import get_chat_provider
+
+        config = AppConfig(
+            model_provider="cascade",
+            cascade_small_provider="local_small",
+            cascade_small_model="tiny",
+            cascade_large_provider="openai",
+            cascade_large_model="gpt-4o-mini",
+            openai_api_key="test-key",
+        )
+        provider = get_chat_provider(config)
+        self.assertEqual(provider.name, "cascade")
+        self.assertEqual(provider.model, "gpt-4o-mini")
+
+    @unittest.skipUnless(importlib.util.find_spec("langchain") is not None, "langchain not installed")
+    def test_embedding_factory(self):
+        from backend.config import AppConfig
+        from backend.providers.factory import get_embedding_provider
+
+        provider = get_embedding_provider(
+            AppConfig(embedding_provider="ollama", embedding_model="nomic-embed-text")
+        )
+        self.assertEqual(provider.name, "ollama")
+        self.assertEqual(provider.model, "nomic-embed-text")
+
+        with self.assertRaises(ValueError):
+            get_embedding_provider(AppConfig(embedding_provider="unknown"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from backend.result_store import (
+    ResultStore,
+    ask_key,
+    canonicalize_sexp,
+    explain_region_key,
+    normalize_code,
+)
+
+
+class NormalizationTests(unittest.TestCase):
+    def test_sexp_whitespace_and_comments_collapse(self):
+        a = "(use-package magit   ; git UI\n  :ensure t)"
+        b = "(use-package magit :ensure t)"
+        self.assertEqual(canonicalize_sexp(a), canonicalize_sexp(b))
+
+    def test_strings_keep_their_contents(self):
+        code = '(global-set-key (kbd "C-c ;")  #\'comment-line)'
+        self.assertEqual(canonicalize_sexp(code), '(global-set-key (kbd "C-c ;") #\'comment-line)')
+
+    def test_non_lisp_keeps_indentation(self):
+        code = "    if x:\n        y()\n\n"
+        self.assertEqual(normalize_code(code, "python-mode"), "if x:\n    y()")
+
+    def test_key_depends_on_skill_level_and_model(self):
+        base = explain_region_key("(setq x 1)", "emacs-lisp-mode", "", "beginner", "ollama", "m")
+        same = explain_region_key("(setq  x 1) ; c", "emacs-lisp-mode", "", "beginner", "ollama", "m")
+        other_level = explain_region_key("(setq x 1)", "emacs-lisp-mode", "", "advanced", "ollama", "m")
+        other_model = explain_region_key("(setq x 1)", "emacs-lisp-mode", "", "beginner", "ollama", "n")
+        other_prompt = explain_region_key(
+            "(setq x 1)", "emacs-lisp-mode", "", "beginner", "ollama", "m", settings="p2"
+        )
+
+        self.assertEqual(base, same)
+        self.assertNotEqual(base, other_level)
+        self.assertNotEqual(base, other_model)
+        self.assertNotEqual(base, other_prompt)
+
+    def test_ask_key_depends_on_generation_settings(self):
+        base = ask_key("How do I save?", "beginner", "ollama", "m", settings="p1")
+        same = ask_key("how do  I save?", "beginner", "ollama", "m", settings="p1")
+        other = ask_key("How do I save?", "beginner", "ollama", "m", settings="p2")
+
+        self.assertEqual(base, same)
+        self.assertNotEqual(base, other)
+
+
+class ResultStoreTests(unittest.TestCase):
+    def test_round_trip_and_index_version_invalidation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "results.sqlite3"
+            ResultStore(path).put("k", "explain_region", "v1", {"answer": "a"})
+
+            self.assertEqual(ResultStore(path).get("k", "v1"), {"answer": "a"})
+
+            fresh = ResultStore(path)
+            self.assertIsNone(fresh.get("k", "v2"))
+            self.assertEqual(fresh.count(), 0)
+
+    def test_concurrent_writers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "results.sqlite3"
+            stores = [ResultStore(path) for _ in range(4)]
+
+            def write(idx):
+                for n in range(20):
+                    stores[idx].put(f"{idx}-{n}", "explain_region", "v1", {"n": n})
+
+            threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(ResultStore(path).count(), 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from typing import Optional
+from urllib import error
+
+from backend.providers.base import ChatProvider
+from backend.providers.router import EndpointPool, RoutedChatProvider, is_endpoint_failure
+
+
+class FakeProvider(ChatProvider):
+    def __init__(self, base_url: str, failing: set, calls: list, rejecting: set) -> None:
+        self._base_url = base_url
+        self._failing = failing
+        self._rejecting = rejecting
+        self._calls = calls
+        self._last_usage = {"prompt_tokens": 1}
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    @property
+    def model(self) -> str:
+        return "fake-model"
+
+    def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        self._calls.append(self._base_url)
+        if self._base_url in self._failing:
+            raise RuntimeError("down") from ConnectionError("refused")
+        if self._base_url in self._rejecting:
+            rejected = error.HTTPError(self._base_url, 400, "context length exceeded", {}, None)
+            raise RuntimeError("rejected") from rejected
+        return f"answer from {self._base_url}"
+
+
+def make_pool(urls, failing=(), probe=None, rejecting=()):
+    calls = []
+    failing = set(failing)
+    rejecting = set(rejecting)
+    pool = EndpointPool(
+        urls,
+        lambda url: FakeProvider(url, failing, calls, rejecting),
+        health_interval=0,
+        eject_seconds=0,
+        probe=probe,
+    )
+    return pool, calls, failing
+
+
+class EndpointPoolTests(unittest.TestCase):
+    def test_prefers_lower_latency_endpoint(self):
+        pool, _, _ = make_pool(["http://a", "http://b"])
+        a, b = pool.acquire(), pool.acquire()
+        pool.release(a, 500.0)
+        pool.release(b, 50.0)
+
+        chosen = pool.acquire()
+        self.assertEqual(chosen.base_url, b.base_url)
+
+    def test_in_flight_spreads_load(self):
+        pool, _, _ = make_pool(["http://a", "http://b"])
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first.base_url, second.base_url)
+
+    def test_retries_once_on_other_endpoint_and_ejects(self):
+        pool, calls, _ = make_pool(["http://a", "http://b"], failing={"http://a"})
+        provider = RoutedChatProvider(pool, name="local_small", model="tiny")
+
+        answers = {provider.generate("q") for _ in range(3)}
+
+        self.assertEqual(answers, {"answer from http://b"})
+        self.assertLessEqual(calls.count("http://a"), 1)
+        self.assertEqual(provider.last_usage["endpoint"], "http://b")
+        stats = {ep["base_url"]: ep for ep in pool.stats()}
+        self.assertFalse(stats["http://a"]["healthy"])
+
+    def test_client_error_is_raised_without_ejecting(self):
+        pool, calls, _ = make_pool(["http://a", "http://b"], rejecting={"http://a", "http://b"})
+        provider = RoutedChatProvider(pool, name="local_small", model="tiny")
+
+        with self.assertRaisesRegex(RuntimeError, "rejected"):
+            provider.generate("q")
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(ep["healthy"] for ep in pool.stats()))
+        self.assertTrue(all(ep["in_flight"] == 0 for ep in pool.stats()))
+
+    def test_endpoint_failure_classification(self):
+        def http_error(code):
+            return error.HTTPError("http://a", code, "status", {}, None)
+
+        self.assertTrue(is_endpoint_failure(http_error(503)))
+        self.assertFalse(is_endpoint_failure(http_error(400)))
+        self.assertTrue(is_endpoint_failure(error.URLError("refused")))
+        self.assertTrue(is_endpoint_failure(TimeoutError()))
+        self.assertFalse(is_endpoint_failure(KeyError("choices")))
+
+    def test_health_check_restores_endpoint(self):
+        pool, _, failing = make_pool(["http://a", "http://b"], probe=lambda url, timeout: True)
+        provider = RoutedChatProvider(pool, name="local_small", model="tiny")
+        failing.add("http://a")
+        failing.add("http://b")
+        with self.assertRaises(RuntimeError):
+            provider.generate("q")
+
+        failing.clear()
+        pool.check_health()
+        self.assertTrue(all(ep["healthy"] for ep in pool.stats()))
+
+
+if __name__ == "__main__":
+    unittest.main()
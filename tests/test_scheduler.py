@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+
+from backend.cancellation import CancelToken
+from backend.config import AppConfig
+from backend.scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    PriorityScheduler,
+    SchedulerBusy,
+    generation_limit,
+)
+
+
+class PrioritySchedulerTests(unittest.TestCase):
+    def test_background_runs_on_spare_capacity(self):
+        scheduler = PriorityScheduler(max_concurrency=2, background_max_wait=0)
+        with scheduler.slot(INTERACTIVE):
+            with scheduler.slot(BACKGROUND):
+                self.assertEqual(scheduler.stats()["running"], 2)
+
+    def test_background_is_deferred_when_full(self):
+        scheduler = PriorityScheduler(max_concurrency=1, background_max_wait=0.05)
+        with scheduler.slot(INTERACTIVE):
+            with self.assertRaises(SchedulerBusy):
+                scheduler.acquire(BACKGROUND)
+        self.assertEqual(scheduler.stats()["deferred"], 1)
+
+    def test_interactive_preempts_running_background(self):
+        scheduler = PriorityScheduler(max_concurrency=1, background_max_wait=0)
+        token = CancelToken("prefetch")
+
+        def background_job():
+            with scheduler.slot(BACKGROUND, token):
+                # Stand-in for a provider call that aborts once its token is cancelled.
+                while not token.cancelled:
+                    time.sleep(0.005)
+
+        worker = threading.Thread(target=background_job)
+        worker.start()
+        while scheduler.stats()["running_background"] == 0:
+            time.sleep(0.005)
+
+        with scheduler.slot(INTERACTIVE):
+            self.assertTrue(token.cancelled)
+        worker.join()
+
+        stats = scheduler.stats()
+        self.assertEqual(stats["preempted"], 1)
+        self.assertEqual(stats["running"], 0)
+
+    def test_background_waits_behind_queued_interactive(self):
+        scheduler = PriorityScheduler(max_concurrency=1, background_max_wait=1)
+        order = []
+
+        scheduler.acquire(INTERACTIVE)
+        interactive = threading.Thread(
+            target=lambda: (scheduler.acquire(INTERACTIVE), order.append("interactive"))
+        )
+        interactive.start()
+        while scheduler.stats()["waiting_interactive"] == 0:
+            time.sleep(0.005)
+
+        background = threading.Thread(
+            target=lambda: (scheduler.acquire(BACKGROUND), order.append("background"))
+        )
+        background.start()
+        scheduler.release(INTERACTIVE)
+        interactive.join()
+        scheduler.release(INTERACTIVE)
+        background.join()
+        scheduler.release(BACKGROUND)
+
+        self.assertEqual(order, ["interactive", "background"])
+
+    def test_rejects_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            PriorityScheduler().acquire("urgent")
+
+
+class GenerationLimitTests(unittest.TestCase):
+    def test_local_endpoints_set_the_default_limit(self):
+        self.assertEqual(generation_limit(AppConfig(model_provider="local_small")), 2)
+        routed = AppConfig(
+            model_provider="local_small",
+            local_small_base_urls=("http://a/v1", "http://b/v1", "http://c/v1"),
+        )
+        self.assertEqual(generation_limit(routed), 6)
+        self.assertEqual(generation_limit(AppConfig(model_provider="cascade")), 2)
+
+    def test_remote_providers_are_unlimited_unless_configured(self):
+        self.assertIsNone(generation_limit(AppConfig(model_provider="openai")))
+        self.assertIsNone(generation_limit(AppConfig(model_provider="ollama")))
+        capped = AppConfig(model_provider="openai", generation_concurrency=8)
+        self.assertEqual(generation_limit(capped), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+LANGCHAIN_READY = all(
+    importlib.util.find_spec(name) is not None for name in ("langchain", "chromadb")
+)
+
+SAVE_PASSAGE = (
+    "To save the current buffer to its file press C-x C-s. To visit a file press "
+    "C-x C-f and type its name in the minibuffer. To switch between open buffers "
+    "press C-x b and choose one from the completion list shown below the prompt."
+)
+
+
+@unittest.skipUnless(LANGCHAIN_READY, "langchain/chromadb not installed")
+class ServiceTests(unittest.TestCase):
+    def setUp(self):
+        from backend.providers.base import ChatProvider, EmbeddingProvider
+
+        class KeywordEmbeddings(EmbeddingProvider):
+            name = "fake"
+            model = None
+            words = ("file", "buffer", "window")
+
+            def __init__(self, model):
+                self.model = model
+                self.calls = 0
+
+            def embed(self, texts):
+                self.calls += 1
+                vectors = []
+                for text in texts:
+                    counts = [text.lower().count(word) + 0.01 for word in self.words]
+                    norm = sum(c * c for c in counts) ** 0.5
+                    vectors.append([c / norm for c in counts])
+                return vectors
+
+        class FakeChat(ChatProvider):
+            name = "fake"
+            model = "fake-chat"
+
+            def __init__(self):
+                self.prompts = []
+                self.routed = []
+
+            def route(self, features):
+                self.routed.append(features)
+
+            def generate(self, prompt, system=None):
+                self.prompts.append(prompt)
+                return "Press C-x C-s."
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_dir = Path(self.tmp.name) / "db"
+        # Query batchers are shared per model name, so each test gets its own.
+        model = f"keywords-{self.id()}"
+        self.embeddings = KeywordEmbeddings(model)
+        self.chat = FakeChat()
+        self.env = {
+            "MODEL_PROVIDER": "ollama",
+            "CASCADE_SMALL_PROVIDER": "ollama",
+            "EMBEDDING_MODEL": model,
+            "VECTOR_DB_DIR": str(self.db_dir),
+            "RETRIEVAL_K": "4",
+            "INDEX_RELOAD_INTERVAL": "3600",
+            "ENABLE_RESULT_STORE": "true",
+            "RESULT_STORE_PATH": str(Path(self.tmp.name) / "results.sqlite3"),
+        }
+        for patcher in (
+            patch.dict(os.environ, self.env),
+            patch("prepare_data.get_embedding_provider", return_value=self.embeddings),
+            patch("backend.service.get_embedding_provider", return_value=self.embeddings),
+            patch("backend.service.get_chat_provider", return_value=self.chat),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _publish(self, chunks):
+        import prepare_data
+        from langchain_core.documents import Document
+
+        builder = prepare_data.SnapshotBuilder(self.db_dir)
+        builder.add_chunks(
+            [
+                Document(page_content=text, metadata={"resource_id": path, "resource_path": path})
+                for text, path in chunks
+            ]
+        )
+        return builder.publish([{"id": path} for _, path in chunks])["version"]
+
+    def _publish_manual(self):
+        return self._publish(
+            [
+                ("C-x C-f Visit a file in a new buffer (find-file).", "manual.pdf"),
+                ("Function: find-file filename &optional wildcards. Edit FILENAME.", "elisp.pdf"),
+                ("(defun find-file (filename &optional wildcards) (switch-to-buffer))", "files.el"),
+                (SAVE_PASSAGE, "manual.pdf"),
+                (SAVE_PASSAGE + " Done.", "guide.pdf"),
+                ("A window displays a buffer inside a frame.", "windows.txt"),
+            ]
+        )
+
+    def test_cached_answer_is_served_before_loading_the_index(self):
+        from backend import service
+
+        self._publish_manual()
+        first = service.ask_emacs("How do I save a buffer?", request_id="r1")
+        with patch("backend.service._active_index", side_effect=AssertionError), patch(
+            "backend.service.get_chat_provider", side_effect=AssertionError
+        ):
+            second = service.ask_emacs("How do I save a buffer?", request_id="r2")
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["answer"], first["answer"])
+        self.assertEqual(second["request_id"], "r2")
+
+    def test_miss_is_stored_under_the_loaded_index_version(self):
+        from backend import service
+        from backend.config import AppConfig
+        from backend.result_store import get_result_store
+
+        loaded = self._publish_manual()
+        service.ask_emacs("What is a window?")
+        # The new snapshot is published but not yet swapped in by the reloader.
+        published = self._publish([("A frame holds one or more windows.", "frames.txt")])
+        service.ask_emacs("How do I save a buffer?")
+        service.ask_emacs("How do I save a buffer?")
+
+        config = AppConfig.from_env()
+        key = service._ask_store_key(config, "How do I save a buffer?", "beginner")
+        self.assertEqual(service._published_version(config), published)
+        self.assertEqual(service._active_index(config).version, loaded)
+        # Answers from the old index are never served as if they came from the new one.
+        self.assertEqual(len(self.chat.prompts), 3)
+        self.assertIsNotNone(get_result_store(config.result_store_path).get(key, loaded))
+
+    def test_sources_include_alternates_of_merged_chunks(self):
+        from backend import service
+
+        self._publish_manual()
+        result = service.ask_emacs("What does C-x C-s do?")
+
+        self.assertEqual(result["sources"][:2], ["manual.pdf", "guide.pdf"])
+
+    def test_exact_hits_skip_similarity_search(self):
+        from backend import service
+        from backend.config import AppConfig
+
+        self._publish_manual()
+        config = AppConfig.from_env()
+        index = service._active_index(config)
+        calls = self.embeddings.calls
+        docs, scores = service._retrieve_docs("What does find-file do?", config, index)
+
+        self.assertEqual(len(docs), 2)
+        self.assertTrue(all("find-file" in doc.page_content for doc in docs))
+        self.assertEqual(scores, [])
+        self.assertEqual(self.embeddings.calls, calls)
+
+    def test_cascade_fills_after_exact_hits_and_routes_on_scores(self):
+        from backend import service
+        from backend.config import AppConfig
+
+        self._publish_manual()
+        with patch.dict(os.environ, {"MODEL_PROVIDER": "cascade"}):
+            config = AppConfig.from_env()
+            docs, scores = service._retrieve_docs(
+                "What does find-file do?", config, service._active_index(config)
+            )
+            service.ask_emacs("What does find-file do?")
+
+        self.assertEqual(len(docs), 4)
+        self.assertTrue(all("find-file" in doc.page_content for doc in docs[:2]))
+        self.assertEqual(len(scores), 4)
+        self.assertEqual(len({doc.page_content for doc in docs}), 4)
+        routed = self.chat.routed[-1]
+        self.assertEqual(routed.interaction, "ask")
+        self.assertIsNotNone(routed.score_spread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from backend.snapshots import (
+    SnapshotReloader,
+    current_snapshot,
+    list_snapshots,
+    prune_snapshots,
+    publish_snapshot,
+    resolve_index_dir,
+    rollback_snapshot,
+    snapshot_path,
+)
+
+
+def _make_snapshot(root: Path, version: str) -> Path:
+    path = snapshot_path(root, version)
+    path.mkdir(parents=True)
+    return path
+
+
+class SnapshotLayoutTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_legacy_layout_resolves_to_root(self):
+        self.assertEqual(resolve_index_dir(self.root), self.root)
+
+    def test_publish_flips_current_pointer(self):
+        _make_snapshot(self.root, "20260101000000-a")
+        newer = _make_snapshot(self.root, "20260102000000-b")
+
+        publish_snapshot(self.root, "20260102000000-b")
+
+        self.assertEqual(current_snapshot(self.root), "20260102000000-b")
+        self.assertEqual(resolve_index_dir(self.root), newer)
+
+    def test_publish_rejects_missing_snapshot(self):
+        with self.assertRaises(FileNotFoundError):
+            publish_snapshot(self.root, "missing")
+
+    def test_prune_keeps_newest_and_current(self):
+        for version in ("1-a", "2-b", "3-c", "4-d"):
+            _make_snapshot(self.root, version)
+        publish_snapshot(self.root, "1-a")
+
+        removed = prune_snapshots(self.root, keep=2)
+
+        self.assertEqual(removed, ["2-b"])
+        self.assertEqual(list_snapshots(self.root), ["1-a", "3-c", "4-d"])
+
+    def test_rollback_defaults_to_previous_snapshot(self):
+        for version in ("1-a", "2-b", "3-c"):
+            _make_snapshot(self.root, version)
+        publish_snapshot(self.root, "3-c")
+
+        self.assertEqual(rollback_snapshot(self.root), "2-b")
+        self.assertEqual(rollback_snapshot(self.root), "1-a")
+        with self.assertRaises(ValueError):
+            rollback_snapshot(self.root)
+
+
+class SnapshotReloaderTests(unittest.TestCase):
+    def test_new_snapshot_is_swapped_in_background(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _make_snapshot(root, "1-a")
+            _make_snapshot(root, "2-b")
+            publish_snapshot(root, "1-a")
+            release = threading.Event()
+
+            def loader(path):
+                if path.name == "2-b":
+                    release.wait(timeout=5)
+                return path.name
+
+            reloader = SnapshotReloader(root, loader, check_interval=0.0)
+            self.assertEqual(reloader.current(), "1-a")
+
+            publish_snapshot(root, "2-b")
+            # The old index keeps serving while the new one loads.
+            self.assertEqual(reloader.current(), "1-a")
+            release.set()
+
+            deadline = time.monotonic() + 5
+            while reloader.current() != "2-b" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(reloader.current(), "2-b")
+            self.assertEqual(reloader.stats()["reloads"], 1)
+
+    def test_failed_reload_keeps_active_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _make_snapshot(root, "1-a")
+            _make_snapshot(root, "2-b")
+            publish_snapshot(root, "1-a")
+
+            def loader(path):
+                if path.name == "2-b":
+                    raise RuntimeError("corrupt snapshot")
+                return path.name
+
+            reloader = SnapshotReloader(root, loader, check_interval=0.0)
+            reloader.current()
+            publish_snapshot(root, "2-b")
+            reloader.current()
+
+            deadline = time.monotonic() + 5
+            while reloader.stats()["failed_reloads"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(reloader.current(), "1-a")
+            self.assertEqual(reloader.stats()["last_error"], "corrupt snapshot")
+
+
+if __name__ == "__main__":
+    unittest.main()
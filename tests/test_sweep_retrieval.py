@@ -0,0 +1,162 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+LANGCHAIN_READY = all(
+    importlib.util.find_spec(name) is not None for name in ("langchain", "chromadb")
+)
+
+
+def _keyword_embeddings():
+    from backend.providers.base import EmbeddingProvider
+
+    class KeywordEmbeddings(EmbeddingProvider):
+        name = "fake"
+        model = "keywords"
+        words = ("buffer", "window", "frame")
+
+        def embed(self, texts):
+            vectors = []
+            for text in texts:
+                counts = [text.lower().count(word) + 0.01 for word in self.words]
+                norm = sum(c * c for c in counts) ** 0.5
+                vectors.append([c / norm for c in counts])
+            return vectors
+
+    return KeywordEmbeddings()
+
+
+def _row(recall: float, mrr: float, tokens: float, k: int = 4) -> dict:
+    return {
+        "chunk_size": 700,
+        "chunk_overlap": 120,
+        "k": k,
+        "recall_at_k": recall,
+        "mrr": mrr,
+        "context_tokens": tokens,
+        "retrieval_ms_p50": 1.0,
+    }
+
+
+@unittest.skipUnless(LANGCHAIN_READY, "langchain/chromadb not installed")
+class SweepRetrievalTests(unittest.TestCase):
+    def test_golden_set_shorthand_and_matching(self):
+        import sweep_retrieval
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "golden.jsonl"
+            path.write_text(
+                json.dumps({"question": "switch buffers", "expected": ["emacs-manual"]})
+                + "\n"
+                + json.dumps(
+                    {"question": "kill ring", "expected": [{"source": "guide", "contains": "yank"}]}
+                )
+                + "\n",
+                encoding="utf-8",
+            )
+            golden = sweep_retrieval.load_golden_set(path)
+
+        self.assertEqual(golden[0]["expected"], [{"source": "emacs-manual"}])
+        metadata = {"resource_id": "manual", "alternate_sources": "guide; other"}
+        self.assertTrue(sweep_retrieval.matches(golden[1]["expected"][0], metadata, "C-y yanks"))
+        self.assertFalse(sweep_retrieval.matches(golden[1]["expected"][0], metadata, "C-w"))
+
+    def test_score_ranking(self):
+        from langchain_core.documents import Document
+
+        import sweep_retrieval
+
+        docs = [
+            Document(page_content="windows", metadata={"resource_id": "a"}),
+            Document(page_content="buffers", metadata={"resource_id": "b"}),
+        ]
+        recall, rr = sweep_retrieval.score_ranking([{"source": "b"}, {"source": "c"}], docs)
+
+        self.assertEqual(recall, 0.5)
+        self.assertEqual(rr, 0.5)
+
+    def test_pareto_front_and_recommendation(self):
+        import sweep_retrieval
+
+        cheap = _row(0.8, 0.6, 300, k=2)
+        balanced = _row(0.95, 0.8, 600, k=4)
+        dominated = _row(0.9, 0.7, 900, k=6)
+        rows = [cheap, balanced, dominated]
+
+        self.assertEqual(sweep_retrieval.pareto_front(rows), [cheap, balanced])
+        self.assertIs(sweep_retrieval.recommend(rows, 0.9), balanced)
+        self.assertIsNone(sweep_retrieval.recommend(rows, 0.99))
+
+    def test_evaluate_setting_reuses_cached_embeddings(self):
+        from langchain_core.documents import Document
+
+        import sweep_retrieval
+
+        docs = [
+            Document(
+                page_content="A buffer holds text. " * 20,
+                metadata={"resource_id": "buffers", "resource_type": "text"},
+            ),
+            Document(
+                page_content="A window displays a buffer inside a frame. " * 20,
+                metadata={"resource_id": "windows", "resource_type": "text"},
+            ),
+        ]
+        golden = [{"question": "what is a window", "expected": [{"source": "windows"}]}]
+        embeddings = sweep_retrieval.CachedEmbeddings(_keyword_embeddings(), None)
+
+        rows = sweep_retrieval.evaluate_setting(
+            docs, golden, embeddings, 200, 20, [1, 2], None, use_symbols=False
+        )
+        misses = embeddings.misses
+        sweep_retrieval.evaluate_setting(
+            docs, golden, embeddings, 200, 20, [1], None, use_symbols=False
+        )
+
+        self.assertEqual([row["k"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["recall_at_k"], 1.0)
+        self.assertGreater(rows[1]["context_tokens"], rows[0]["context_tokens"])
+        self.assertEqual(embeddings.misses, misses)
+
+    def test_symbol_hits_skip_similarity_search_unless_cascade(self):
+        from langchain_core.documents import Document
+
+        import sweep_retrieval
+
+        docs = [
+            Document(
+                page_content="C-x C-f Visit a file (find-file). " * 5,
+                metadata={"resource_id": "files", "resource_type": "text"},
+            ),
+            Document(
+                page_content="A window displays a buffer inside a frame. " * 20,
+                metadata={"resource_id": "windows", "resource_type": "text"},
+            ),
+        ]
+        golden = [{"question": "What does find-file do?", "expected": [{"source": "files"}]}]
+        embeddings = sweep_retrieval.CachedEmbeddings(_keyword_embeddings(), None)
+
+        exact_only = sweep_retrieval.evaluate_setting(
+            docs, golden, embeddings, 1000, 20, [4], None, use_symbols=True
+        )
+        filled = sweep_retrieval.evaluate_setting(
+            docs,
+            golden,
+            embeddings,
+            1000,
+            20,
+            [4],
+            None,
+            use_symbols=True,
+            search_on_symbol_hit=True,
+        )
+
+        self.assertEqual(exact_only[0]["recall_at_k"], 1.0)
+        self.assertEqual(filled[0]["recall_at_k"], 1.0)
+        self.assertLess(exact_only[0]["context_tokens"], filled[0]["context_tokens"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.symbols import (
+    build_symbol_index,
+    extract_terms,
+    load_symbol_index,
+    lookup_chunk_ids,
+    write_symbol_index,
+)
+
+
+class ExtractTermsTests(unittest.TestCase):
+    def test_extracts_key_sequences_and_symbols(self):
+        terms = extract_terms("Type C-x C-f (find-file) to visit a file, or M-x and C-h k.")
+        self.assertIn("C-x C-f", terms)
+        self.assertIn("find-file", terms)
+        self.assertIn("M-x", terms)
+        self.assertIn("C-h k", terms)
+
+    def test_words_starting_like_keys_are_not_key_sequences(self):
+        terms = extract_terms("An s-expression, code written in C-language, or an A-list.")
+        self.assertNotIn("s-e", terms)
+        self.assertNotIn("C-l", terms)
+        self.assertNotIn("A-l", terms)
+        self.assertIn("C-M-f", extract_terms("Move over one s-expression with C-M-f."))
+
+    def test_extracts_quoted_symbols_and_skips_common_words(self):
+        terms = extract_terms("Explain what `setq` does; it is a built-in special form.")
+        self.assertIn("setq", terms)
+        self.assertNotIn("built-in", terms)
+
+    def test_trailing_punctuation_is_stripped(self):
+        terms = extract_terms("Is find-file user-friendly?")
+        self.assertIn("user-friendly", terms)
+        self.assertNotIn("user-friendly?", terms)
+
+
+class SymbolIndexTests(unittest.TestCase):
+    def test_undefined_hyphenated_words_are_not_indexed(self):
+        index = build_symbol_index(
+            [
+                ("prose", "Search is case-insensitive by default; see isearch-forward."),
+                ("definition", "C-s Incremental search forward (isearch-forward)."),
+                ("lisp", "(defvar my-search-limit 10)"),
+            ]
+        )
+        self.assertNotIn("case-insensitive", index)
+        self.assertEqual(index["isearch-forward"][0], "definition")
+        self.assertIn("C-s", index)
+        self.assertIn("my-search-limit", index)
+
+    def test_defining_chunk_ranks_first(self):
+        index = build_symbol_index(
+            [
+                ("mention", "You can also use find-file from a menu."),
+                ("definition", "C-x C-f Visit a file (find-file)."),
+            ]
+        )
+        self.assertEqual(index["find-file"][0], "definition")
+        self.assertEqual(index["C-x C-f"], ["definition"])
+
+    def test_lookup_interleaves_terms_and_limits(self):
+        index = {"find-file": ["a", "b", "c"], "C-x C-s": ["d", "e"]}
+        ids = lookup_chunk_ids("What do find-file and C-x C-s do?", index, limit=3)
+        self.assertEqual(ids, ["a", "d", "b"])
+
+    def test_lookup_without_terms_returns_nothing(self):
+        self.assertEqual(lookup_chunk_ids("How do I switch buffers?", {"find-file": ["a"]}, 4), [])
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_symbol_index({"setq": ["a", "b"], "M-x": ["c"]}, Path(tmpdir))
+            loaded = load_symbol_index(Path(tmpdir))
+            missing = load_symbol_index(Path(tmpdir) / "missing")
+
+        self.assertEqual(loaded, {"setq": ["a", "b"], "M-x": ["c"]})
+        self.assertEqual(missing, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
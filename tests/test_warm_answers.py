@@ -0,0 +1,103 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+LANGCHAIN_READY = importlib.util.find_spec("langchain") is not None
+
+
+@unittest.skipUnless(LANGCHAIN_READY, "langchain not installed")
+class WarmAnswersTests(unittest.TestCase):
+    def test_load_items_expands_symbols(self):
+        import warm_answers
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "warm.json"
+            path.write_text(
+                json.dumps(["How do I save?", {"symbol": "setq"}, {"code": "(setq x 1)"}]),
+                encoding="utf-8",
+            )
+            items = warm_answers.load_warm_items(path)
+
+        self.assertEqual(items[0], {"question": "How do I save?"})
+        self.assertEqual(
+            items[1]["question"], "Explain what `setq` does in Emacs Lisp and when to use it."
+        )
+        self.assertEqual(items[2], {"code": "(setq x 1)"})
+
+    def test_symbol_template_matches_emacs_client(self):
+        import warm_answers
+
+        elisp = (Path(__file__).parent.parent / "elisp" / "emacs-explained.el").read_text(
+            encoding="utf-8"
+        )
+        self.assertIn(warm_answers.SYMBOL_QUESTION_TEMPLATE.replace("{}", "%s"), elisp)
+
+    def test_mine_questions_counts_normalized_and_skips_warm_requests(self):
+        import warm_answers
+
+        events = [
+            {"interaction": "ask", "question": "How do I save?", "request_id": "a"},
+            {"interaction": "ask", "question": "how do  I save?", "request_id": "b"},
+            {"interaction": "ask", "question": "How do I quit?", "request_id": "c"},
+            {"interaction": "ask", "question": "How do I quit?", "request_id": "warm-1"},
+            {"interaction": "explain_region", "request_id": "d"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "requests.jsonl"
+            path.write_text("".join(json.dumps(e) + "\n" for e in events), encoding="utf-8")
+            mined = warm_answers.mine_questions([path], top=10, min_count=2)
+
+        self.assertEqual(mined, [{"question": "how do  I save?"}])
+
+    def test_warm_runs_each_item_per_skill_level(self):
+        import warm_answers
+
+        def fake_ask(question, skill_level, request_id):
+            if "fail" in question:
+                raise RuntimeError("provider down")
+            return {"answer": "x", "cached": skill_level == "advanced"}
+
+        items = [{"question": "q1"}, {"question": "fail"}, {"code": "(setq x 1)"}]
+        with patch("warm_answers.ask_emacs", side_effect=fake_ask), patch(
+            "warm_answers.explain_region", return_value={"answer": "y", "cached": False}
+        ) as explain:
+            summary = warm_answers.warm(items, ["beginner", "advanced"], concurrency=2)
+
+        self.assertEqual(summary["total"], 6)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(summary["cached"], 1)
+        self.assertEqual(summary["generated"], 3)
+        self.assertEqual(explain.call_count, 2)
+        self.assertTrue(explain.call_args.kwargs["request_id"].startswith("warm-"))
+
+    def test_warmed_answer_is_served_without_loading_the_index(self):
+        import os
+
+        from backend import service
+        from backend.config import AppConfig
+        from backend.result_store import get_result_store
+
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                "VECTOR_DB_DIR": str(Path(tmp) / "db"),
+                "RESULT_STORE_PATH": str(Path(tmp) / "results.sqlite3"),
+                "ENABLE_RESULT_STORE": "true",
+            }
+            with patch.dict(os.environ, env):
+                config = AppConfig.from_env()
+                key = service._ask_store_key(config, "How do I save?", "beginner")
+                get_result_store(config.result_store_path).put(
+                    key, "ask", "unversioned", {"answer": "C-x C-s", "sources": []}
+                )
+                with patch("backend.service._active_index", side_effect=AssertionError):
+                    result = service.ask_emacs("How do I save?", request_id="r1")
+
+        self.assertEqual(result["answer"], "C-x C-s")
+        self.assertTrue(result["cached"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import argparse
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from analyze_logs import find_logs, iter_events
+from backend.config import AppConfig
+from backend.scheduler import generation_limit
+from backend.service import ask_emacs, explain_region
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_WARM_FILE = BASE_DIR / "resources" / "warm_questions.json"
+WARM_REQUEST_PREFIX = "warm-"
+DEFAULT_CONCURRENCY = 2
+# Must match `emacs-explained--symbol-question' so warmed answers hit the same cache key.
+SYMBOL_QUESTION_TEMPLATE = "Explain what `{}` does in Emacs Lisp and when to use it."
+
+
+def load_warm_items(path: Path) -> List[Dict[str, Any]]:
+    if path.suffix != ".json":
+        with path.open("r", encoding="utf-8") as f:
+            return [{"question": line.strip()} for line in f if line.strip()]
+
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("Warm-up file must be a JSON array.")
+
+    items = []
+    for entry in data:
+        if isinstance(entry, str):
+            entry = {"question": entry}
+        if "symbol" in entry:
+            entry = {"question": SYMBOL_QUESTION_TEMPLATE.format(entry["symbol"])}
+        if not entry.get("question") and not entry.get("code"):
+            raise ValueError(f"Warm-up entry needs a question, symbol or code: {entry}")
+        items.append(entry)
+    return items
+
+
+def mine_questions(log_paths: List[Path], top: int, min_count: int) -> List[Dict[str, Any]]:
+    counts: Counter = Counter()
+    latest: Dict[str, str] = {}
+    for event in iter_events(log_paths):
+        if not event or event.get("interaction") != "ask" or not event.get("question"):
+            continue
+        if str(event.get("request_id") or "").startswith(WARM_REQUEST_PREFIX):
+            continue
+        # Same normalization as the result store key, so near-identical spellings count once.
+        key = " ".join(event["question"].split()).lower()
+        counts[key] += 1
+        latest[key] = event["question"]
+    return [
+        {"question": latest[key]}
+        for key, count in counts.most_common(top)
+        if count >= min_count
+    ]
+
+
+def dedupe_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = set()
+    unique = []
+    for item in items:
+        key = (
+            " ".join(str(item.get("question", "")).split()).lower(),
+            item.get("code"),
+            item.get("language"),
+            item.get("context"),
+        )
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def warm_item(item: Dict[str, Any], skill_level: str, request_id: str) -> Dict[str, Any]:
+    if item.get("code"):
+        return explain_region(
+            code=item["code"],
+            language=item.get("language", "elisp"),
+            context=item.get("context", ""),
+            skill_level=skill_level,
+            request_id=request_id,
+        )
+    return ask_emacs(item["question"], skill_level=skill_level, request_id=request_id)
+
+
+def warm(
+    items: List[Dict[str, Any]], skill_levels: List[str], concurrency: int
+) -> Dict[str, Any]:
+    jobs: List[Tuple[Dict[str, Any], str]] = [
+        (item, skill_level) for item in items for skill_level in skill_levels
+    ]
+    summary: Dict[str, Any] = {"total": len(jobs), "generated": 0, "cached": 0, "failed": 0}
+    started = time.perf_counter()
+    # The pool bounds how many generations are in flight; the service scheduler does the rest.
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        futures = {
+            pool.submit(warm_item, item, skill_level, f"{WARM_REQUEST_PREFIX}{idx}"): item
+            for idx, (item, skill_level) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            label = futures[future].get("question") or futures[future]["code"][:60]
+            try:
+                result = future.result()
+            except Exception as exc:
+                summary["failed"] += 1
+                print(f"FAILED  {label}: {exc}")
+                continue
+            status = "cached" if result.get("cached") else "generated"
+            summary[status] += 1
+            print(f"{status.upper():<9} {label}")
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute answers for frequent questions into the result store."
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Warm-up lists: JSON arrays of questions, {symbol} or {code, language} entries, "
+        "or text files with one question per line.",
+    )
+    parser.add_argument(
+        "--from-log",
+        nargs="*",
+        metavar="PATH",
+        help="Also mine frequent questions from request logs (default: LOCAL_LOG_PATH's folder).",
+    )
+    parser.add_argument("--top", type=int, default=50, help="Questions to take from the logs.")
+    parser.add_argument(
+        "--min-count", type=int, default=2, help="Minimum times a logged question was asked."
+    )
+    parser.add_argument(
+        "--skill-levels",
+        default="beginner",
+        help="Comma-separated skill levels to warm for each item.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=0,
+        help="Parallel requests (default: the API's generation limit, or 2 if unlimited).",
+    )
+    args = parser.parse_args()
+
+    config = AppConfig.from_env()
+    if not config.enable_result_store:
+        raise ValueError("ENABLE_RESULT_STORE is off; warmed answers would not be kept.")
+
+    items: List[Dict[str, Any]] = []
+    for path in args.files or ([] if args.from_log is not None else [str(DEFAULT_WARM_FILE)]):
+        items.extend(load_warm_items(Path(path)))
+    if args.from_log is not None:
+        log_paths = args.from_log or [str(Path(config.local_log_path).parent)]
+        mined = mine_questions(find_logs([Path(p) for p in log_paths]), args.top, args.min_count)
+        print(f"Mined {len(mined)} frequent questions from the request log.")
+        items.extend(mined)
+
+    items = dedupe_items(items)
+    if not items:
+        raise ValueError("Nothing to warm. Pass a warm-up file or --from-log.")
+
+    skill_levels = [level.strip() for level in args.skill_levels.split(",") if level.strip()]
+    concurrency = args.concurrency or generation_limit(config) or DEFAULT_CONCURRENCY
+    summary = warm(items, skill_levels, concurrency)
+    print(
+        f"Warmed {summary['total']} answers in {summary['seconds']}s: "
+        f"{summary['generated']} generated, {summary['cached']} already cached, "
+        f"{summary['failed']} failed."
+    )
+
+
+if __name__ == "__main__":
+    main()